@@ -0,0 +1,138 @@
+"""
+Local load generator for utils/quote_server.py.
+
+Opens `--concurrency` keep-alive connections and has each send quote requests back to back
+until `--requests` have been answered, then reports client-side throughput and latency
+percentiles alongside the server's /metrics. With --spawn the server is started in-process
+first, so one command measures the whole setup:
+
+    python -m benchmarks.quote_load --spawn --concurrency 256 --requests 50000
+    python -m benchmarks.quote_load --port 8600 --concurrency 64 --requests 10000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import numpy as np
+from utils.data_loader import load_synthetic_data
+from utils.quote_server import serve, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS
+
+SEED = 20250101
+
+def sample_requests(n_requests, seed=SEED):
+    """
+    Deterministic quote request bodies drawn from the synthetic factor tables.
+    """
+    data = load_synthetic_data()
+    rng = np.random.default_rng(seed)
+    occupations = list(data['occupations_data'])
+    choices = {
+        'occupation': occupations,
+        'education_level': list(data['education_data']),
+        'education_field': list(data['education_field_data']),
+        'school_tier': list(data['school_tier_data']),
+        'company_type': list(data['company_type_data']),
+    }
+    bodies = []
+    for _ in range(n_requests):
+        request = {field: names[rng.integers(len(names))] for field, names in choices.items()}
+        request.update({
+            'years_experience': int(rng.integers(0, 41)),
+            'p_gen': float(rng.random()),
+            'p_spec': float(rng.random()),
+            'target_occupation': occupations[rng.integers(len(occupations))],
+            'transition_month': int(rng.integers(0, 25)),
+        })
+        bodies.append(json.dumps(request).encode())
+    return bodies
+
+async def _http(reader, writer, method, path, body=b''):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def _client(host, port, bodies, next_index, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while next_index[0] < len(bodies):
+            body = bodies[next_index[0]]
+            next_index[0] += 1
+            start = time.perf_counter()
+            status, _ = await _http(reader, writer, 'POST', '/quote', body)
+            if status != 200:
+                raise RuntimeError(f"Quote request failed with HTTP {status}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+async def run_load(host, port, n_requests, concurrency):
+    """
+    Sends n_requests quotes over `concurrency` connections; returns the client and server metrics.
+    """
+    bodies = sample_requests(n_requests)
+    latencies = []
+    next_index = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, bodies, next_index, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_metrics = await _http(reader, writer, 'GET', '/metrics')
+    writer.close()
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': n_requests,
+        'concurrency': concurrency,
+        'elapsed_s': elapsed,
+        'quotes_per_s': n_requests / elapsed,
+        'latency_ms': {q: float(np.percentile(latencies, int(q[1:]))) for q in ('p50', 'p90', 'p99')},
+        'server': json.loads(server_metrics),
+    }
+
+async def _spawn_and_run(args):
+    ready = asyncio.Event()
+    server = asyncio.create_task(
+        serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, ready=ready)
+    )
+    await ready.wait()
+    try:
+        return await run_load(args.host, args.port, args.requests, args.concurrency)
+    finally:
+        server.cancel()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the local quote service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--requests', type=int, default=10_000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--spawn', action='store_true', help="Start the quote service in this process first.")
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    if args.spawn:
+        report = asyncio.run(_spawn_and_run(args))
+    else:
+        report = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    print(f"{report['quotes_per_s']:,.0f} quotes/s, p50 {report['latency_ms']['p50']:.2f} ms, "
+          f"p99 {report['latency_ms']['p99']:.2f} ms, mean batch {report['server']['mean_batch_size']:.1f}",
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
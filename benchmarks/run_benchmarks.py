@@ -0,0 +1,268 @@
+"""
+Reproducible benchmark suite for the pricing chain and the app render path.
+
+Covers every scalar function in utils/risk_calculator.py, the end-to-end premium chain
+(price_profiles and the fused kernel price_premiums_fused) at several book sizes, the
+transition and skill-progress curves drawn by app.py, and figure construction in
+utils/visualization_utils.py. Results are written as JSON with throughput, latency percentiles
+and peak memory; --compare flags regressions against a stored baseline and exits non-zero
+when any are found.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --quick --compare bench_baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from utils.data_loader import load_synthetic_data
+from utils import risk_calculator as rc
+from utils.batch_pricing import price_profiles
+from utils.fused_pricing import price_premiums_fused
+from utils.curves import transition_curve, skill_curve
+from utils.visualization_utils import plot_risk_over_transition, plot_idiosyncratic_risk_by_skills, plot_risk_breakdown
+
+CHAIN_SIZES = [1, 1_000, 1_000_000, 10_000_000]
+QUICK_CHAIN_SIZES = [1, 1_000, 1_000_000]
+
+# Relative slowdown (or memory growth) over the baseline that counts as a regression.
+DEFAULT_TOLERANCE = 0.20
+
+# Timed samples per benchmark unless --repeats is given; books of LARGE_BENCHMARK_ITEMS or more
+# get fewer, since each call already takes seconds.
+DEFAULT_REPEATS = 15
+LARGE_REPEATS = 3
+LARGE_BENCHMARK_ITEMS = 1_000_000
+
+SEED = 20250101
+
+# Representative arguments for each scalar function, taken from the app defaults.
+SCALAR_CASES = {
+    'calculate_fexp': (10,),
+    'calculate_fhc': (0.60, 1.00, 0.90, 1.00, 0.85),
+    'calculate_fcr': (0.7, 0.8, 0.75),
+    'calculate_fus': (0.5, 0.2, 0.7, 0.3),
+    'calculate_idiosyncratic_risk': (0.459, 0.7505, 0.59, 0.4, 0.6),
+    'calculate_h_base_ttv': (6, 12, 40, 35),
+    'calculate_systematic_risk': (40, 1.0, 1.0, 0.5, 0.5),
+    'calculate_payout_amount': (90000, 6, 0.25),
+    'calculate_p_systemic': (40.0, 0.10),
+    'calculate_p_individual_systemic': (15.0, 0.50),
+    'calculate_p_claim': (0.04, 0.075),
+    'calculate_expected_loss': (0.003, 11250.0),
+    'calculate_monthly_premium': (33.75, 1.5, 20.0),
+}
+
+def synthetic_profiles(n_rows, seed=SEED):
+    """
+    Deterministic profile columns for price_profiles, drawn from the synthetic factor tables.
+    """
+    data = load_synthetic_data()
+    rng = np.random.default_rng(seed)
+
+    def pick(table, factor):
+        values = np.array([row[factor] for row in data[table].values()], dtype=np.float64)
+        return values[rng.integers(len(values), size=n_rows)]
+
+    return {
+        'f_role': pick('occupations_data', 'f_role'),
+        'h_base': pick('occupations_data', 'H_base'),
+        'h_target': pick('occupations_data', 'H_base'),
+        'f_level': pick('education_data', 'f_level'),
+        'f_field': pick('education_field_data', 'f_field'),
+        'f_school': pick('school_tier_data', 'f_school'),
+        'f_cr': pick('company_type_data', 'F_CR'),
+        'years_experience': rng.integers(0, 41, size=n_rows).astype(np.float64),
+        'p_gen': rng.random(n_rows),
+        'p_spec': rng.random(n_rows),
+        'transition_month': rng.integers(0, 25, size=n_rows).astype(np.float64),
+    }
+
+def app_curve_inputs():
+    """
+    Arguments for the app's transition and skill curves at the default widget values.
+    """
+    params = load_synthetic_data()['actuarial_parameters']
+    premium_terms = (params['Beta Systemic'], params['Beta Individual'], 11250.0,
+                     params['Loading Factor'], params['Minimum Monthly Premium'])
+    transition_args = (params['TTV_DEFAULT'], 40, 35, 1.0, 1.0, params['W_ECON'], params['W_INNO'], 15.01, premium_terms)
+    skill_args = (0.459, 0.7505, 0.2, params['GAMMA_GEN'], params['GAMMA_SPEC'], params['W_CR'], params['W_US'],
+                  40.0, premium_terms)
+    return transition_args, skill_args
+
+def define_benchmarks(chain_sizes):
+    """
+    Returns {name: (setup, items)}; setup() returns the zero-argument callable to time,
+    and items is the number of results one call produces (used for throughput).
+    """
+    benchmarks = {}
+    for name, args in SCALAR_CASES.items():
+        function = getattr(rc, name)
+        benchmarks[f"scalar/{name}"] = (lambda function=function, args=args: lambda: function(*args), 1)
+
+    params = load_synthetic_data()['actuarial_parameters']
+    for size in chain_sizes:
+        def setup(size=size):
+            profiles = synthetic_profiles(size)
+            return lambda: price_profiles(profiles, params, 1.0, 1.0)
+        benchmarks[f"chain/price_profiles/{size}"] = (setup, size)
+
+        def setup_fused(size=size):
+            profiles = synthetic_profiles(size)
+            out = np.empty(size)
+            return lambda: price_premiums_fused(profiles, params, 1.0, 1.0, out=out)
+        benchmarks[f"chain/price_premiums_fused/{size}"] = (setup_fused, size)
+
+    transition_args, skill_args = app_curve_inputs()
+    benchmarks['app/transition_curve'] = (lambda: lambda: transition_curve(*transition_args), transition_args[0] + 1)
+    benchmarks['app/skill_curve'] = (lambda: lambda: skill_curve(*skill_args), 21)
+
+    df_transition = transition_curve(*transition_args)
+    df_skill = skill_curve(*skill_args)
+    scores = {'Idiosyncratic Risk': 15.01, 'Systematic Risk': 40.0, 'Monthly Premium': 20.0}
+    benchmarks['figure/plot_risk_over_transition'] = (lambda: lambda: plot_risk_over_transition(df_transition), 1)
+    benchmarks['figure/plot_idiosyncratic_risk_by_skills'] = (lambda: lambda: plot_idiosyncratic_risk_by_skills(df_skill), 1)
+    benchmarks['figure/plot_risk_breakdown'] = (lambda: lambda: plot_risk_breakdown(scores, scores), 1)
+    return benchmarks
+
+def _calibrate(function, min_batch_time):
+    """
+    Number of calls per timed sample so that one sample takes at least min_batch_time seconds.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        if time.perf_counter() - start >= min_batch_time or calls >= 1 << 20:
+            return calls
+        calls *= 2
+
+def measure(setup, items, repeats=DEFAULT_REPEATS, min_batch_time=0.01):
+    """
+    Times one benchmark: per-call latency percentiles over `repeats` samples, throughput in
+    items per second, and peak traced memory of a single call (measured in a separate run so
+    tracing overhead does not distort the timings).
+    """
+    function = setup()
+    function() # warm-up
+    calls = _calibrate(function, min_batch_time)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        latencies.append((time.perf_counter() - start) / calls)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    p50 = float(np.percentile(latencies, 50))
+    return {
+        'items': items,
+        'repeats': repeats,
+        'calls_per_sample': calls,
+        'latency_s': {
+            'mean': float(latencies.mean()),
+            'p50': p50,
+            'p90': float(np.percentile(latencies, 90)),
+            'p99': float(np.percentile(latencies, 99)),
+        },
+        'throughput_per_s': items / p50 if p50 > 0 else float('inf'),
+        'peak_memory_bytes': int(peak_memory),
+    }
+
+def run_benchmarks(chain_sizes=CHAIN_SIZES, select=None, repeats=None, log=sys.stderr):
+    """
+    Runs the suite (optionally only names containing `select`) and returns the JSON-ready report.
+    repeats is the number of timed samples per benchmark; by default 15, or 3 for benchmarks of
+    LARGE_BENCHMARK_ITEMS items or more.
+    """
+    results = {}
+    for name, (setup, items) in define_benchmarks(chain_sizes).items():
+        if select and select not in name:
+            continue
+        if repeats is None:
+            result = measure(setup, items, repeats=LARGE_REPEATS if items >= LARGE_BENCHMARK_ITEMS else DEFAULT_REPEATS)
+        else:
+            result = measure(setup, items, repeats=repeats)
+        results[name] = result
+        print(f"{name}: p50 {result['latency_s']['p50'] * 1e6:,.1f} us, "
+              f"{result['throughput_per_s']:,.0f} items/s, peak {result['peak_memory_bytes'] / 2**20:,.1f} MiB",
+              file=log)
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'results': results,
+    }
+
+def compare_reports(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares p50 latency and peak memory of every benchmark present in both reports.
+    Returns a list of regression dicts (empty when nothing regressed beyond the tolerance).
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        checks = [
+            ('latency_p50', result['latency_s']['p50'], reference['latency_s']['p50']),
+            ('peak_memory', result['peak_memory_bytes'], reference['peak_memory_bytes']),
+        ]
+        for metric, value, base in checks:
+            if base > 0 and value > base * (1 + tolerance):
+                regressions.append({'benchmark': name, 'metric': metric, 'baseline': base,
+                                    'current': value, 'ratio': value / base})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pricing chain and app render path.")
+    parser.add_argument('--output', help="Write the JSON report to this path (default: stdout).")
+    parser.add_argument('--compare', help="Baseline JSON report to check for regressions.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown/memory growth before flagging a regression.")
+    parser.add_argument('--quick', action='store_true', help="Skip the 10M-profile chain benchmark.")
+    parser.add_argument('--select', help="Only run benchmarks whose name contains this string.")
+    parser.add_argument('--repeats', type=int,
+                        help=f"Timed samples per benchmark (default: {DEFAULT_REPEATS}, or {LARGE_REPEATS} for "
+                             f"benchmarks of {LARGE_BENCHMARK_ITEMS:,}+ items).")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(QUICK_CHAIN_SIZES if args.quick else CHAIN_SIZES, args.select, args.repeats)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} (x{regression['ratio']:.2f})",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}.", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
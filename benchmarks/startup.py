@@ -0,0 +1,136 @@
+"""
+Cold-start and rerun-latency measurements for the app and the pure pricing path.
+
+Every measurement runs in a fresh interpreter, so imports are cold:
+  - pricing_import: importing utils.risk_calculator, and which heavy modules that pulls in
+    (it must not import pandas, plotly or streamlit);
+  - app_cold_start: importing Streamlit's test runner and rendering app.py once;
+  - app_rerun: reruns after moving the M_econ slider, with a different value each time.
+
+The app is measured with AI_RISK_FAST_STARTUP=1 (charts on demand) and without it. With
+--check the run fails when a fast-startup measurement misses STARTUP_TARGETS.
+
+Usage:
+    python -m benchmarks.startup --output startup.json --check
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+HEAVY_MODULES = ['pandas', 'plotly', 'streamlit']
+
+# Targets for the fast-startup mode, in seconds (p99 for reruns).
+STARTUP_TARGETS = {
+    'pricing_import_s': 0.25,
+    'app_cold_start_s': 1.25,
+    'app_rerun_p99_s': 0.15,
+}
+
+PRICING_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import utils.risk_calculator
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'heavy_modules': [m for m in %r if m in sys.modules]}))
+"""
+
+APP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(%r, default_timeout=120).run()
+cold_start = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(str(app.exception))
+reruns = []
+for i in range(%d):
+    app.slider[0].set_value(0.8 + 0.4 * (i + 1) / (%d + 1))
+    start = time.perf_counter()
+    app.run()
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({'cold_start': cold_start, 'reruns': reruns,
+                  'plotly_imported': 'plotly.express' in sys.modules}))
+"""
+
+def _run_python(code, env=None):
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(APP_PATH), env={**os.environ, **(env or {})}
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+def measure_startup(repeats=3, reruns=20):
+    """
+    Returns the best-of-`repeats` cold timings and pooled rerun percentiles for both app modes.
+    """
+    imports = [_run_python(PRICING_IMPORT_SCRIPT % (HEAVY_MODULES,)) for _ in range(repeats)]
+    report = {
+        'pricing_import_s': min(run['seconds'] for run in imports),
+        'pricing_import_heavy_modules': imports[0]['heavy_modules'],
+        'modes': {},
+    }
+    for mode, flag in (('fast_startup', '1'), ('default', '0')):
+        runs = [_run_python(APP_SCRIPT % (APP_PATH, reruns, reruns), {'AI_RISK_FAST_STARTUP': flag})
+                for _ in range(repeats)]
+        rerun_times = [t for run in runs for t in run['reruns']]
+        report['modes'][mode] = {
+            'app_cold_start_s': min(run['cold_start'] for run in runs),
+            'app_rerun_p50_s': _percentile(rerun_times, 50),
+            'app_rerun_p99_s': _percentile(rerun_times, 99),
+            'plotly_imported': runs[0]['plotly_imported'],
+        }
+    return report
+
+def check_targets(report, targets=STARTUP_TARGETS):
+    """
+    Returns the list of missed targets as (name, measured, target) tuples.
+    """
+    fast = report['modes']['fast_startup']
+    measured = {
+        'pricing_import_s': report['pricing_import_s'],
+        'app_cold_start_s': fast['app_cold_start_s'],
+        'app_rerun_p99_s': fast['app_rerun_p99_s'],
+    }
+    missed = [(name, measured[name], target) for name, target in targets.items() if measured[name] > target]
+    if report['pricing_import_heavy_modules']:
+        missed.append(('pricing_import_heavy_modules', report['pricing_import_heavy_modules'], []))
+    return missed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app cold start and rerun latency.")
+    parser.add_argument('--output', help="Write the JSON report to this path (default: stdout).")
+    parser.add_argument('--repeats', type=int, default=3, help="Fresh interpreters per measurement.")
+    parser.add_argument('--reruns', type=int, default=20, help="Timed reruns per app session.")
+    parser.add_argument('--check', action='store_true', help="Exit non-zero if a target is missed.")
+    args = parser.parse_args(argv)
+
+    report = measure_startup(args.repeats, args.reruns)
+    report['targets'] = STARTUP_TARGETS
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    for mode, result in report['modes'].items():
+        print(f"{mode}: cold start {result['app_cold_start_s']:.2f} s, rerun p50 {result['app_rerun_p50_s'] * 1000:.0f} ms, "
+              f"p99 {result['app_rerun_p99_s'] * 1000:.0f} ms", file=sys.stderr)
+    print(f"pricing import: {report['pricing_import_s'] * 1000:.0f} ms", file=sys.stderr)
+    if args.check:
+        missed = check_targets(report)
+        for name, measured, target in missed:
+            print(f"MISSED {name}: {measured} (target {target})", file=sys.stderr)
+        if missed:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
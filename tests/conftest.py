@@ -0,0 +1,6 @@
+import pytest
+from utils.data_loader import load_synthetic_data
+
+@pytest.fixture
+def params():
+    return dict(load_synthetic_data()['actuarial_parameters'])
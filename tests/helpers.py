@@ -0,0 +1,78 @@
+import numpy as np
+
+# Independent scalar reference for the premium chain: the original plain-Python formulas from
+# utils/risk_calculator.py (before the *_batch versions existed), so the batch code is never
+# checked against itself.
+
+def fexp(years_experience):
+    return 1 - (0.015 * min(years_experience, 20))
+
+def idiosyncratic_risk(fhc, fcr, fus, w_cr, w_us):
+    v_raw = fhc * (w_cr * fcr + w_us * fus)
+    return min(100.0, max(5.0, v_raw * 50.0))
+
+def h_base_ttv(k, ttv, h_current, h_target):
+    if ttv == 0:
+        return h_target
+    if k >= ttv:
+        return h_target
+    return (1 - k / ttv) * h_current + (k / ttv) * h_target
+
+def monthly_premium(expected_loss, loading_factor, min_premium):
+    return max((expected_loss * loading_factor) / 12, min_premium)
+
+def random_profiles(n_rows, seed=0, company_scores=False, transition=True, salary=False):
+    """
+    Random profile columns wide enough that some rows hit the V_i clamp at 5 and 100 and
+    some premiums sit on the P_min floor.
+    """
+    rng = np.random.default_rng(seed)
+    profiles = {
+        'f_role': rng.uniform(0.05, 3.0, n_rows),
+        'f_level': rng.uniform(0.5, 1.5, n_rows),
+        'f_field': rng.uniform(0.5, 1.5, n_rows),
+        'f_school': rng.uniform(0.5, 1.5, n_rows),
+        'years_experience': rng.integers(0, 41, n_rows).astype(np.float64),
+        'h_base': rng.uniform(0.5, 100.0, n_rows),
+        'p_gen': rng.random(n_rows),
+        'p_spec': rng.random(n_rows),
+    }
+    if company_scores:
+        profiles.update(s_senti=rng.random(n_rows), s_fin=rng.random(n_rows), s_growth=rng.random(n_rows))
+    else:
+        profiles['f_cr'] = rng.uniform(0.1, 1.5, n_rows)
+    if transition:
+        profiles['h_target'] = rng.uniform(0.5, 100.0, n_rows)
+        profiles['transition_month'] = rng.integers(0, 25, n_rows).astype(np.float64)
+    if salary:
+        profiles['annual_salary'] = rng.uniform(20000.0, 400000.0, n_rows)
+    return profiles
+
+def scalar_chain(profiles, params, mecon=1.0, iai=1.0):
+    """
+    The premium chain row by row in plain Python floats. Returns {'V_i', 'H_i', 'P_monthly'} arrays.
+    """
+    n_rows = len(profiles['h_base'])
+    mecon = np.broadcast_to(mecon, n_rows)
+    iai = np.broadcast_to(iai, n_rows)
+    v_i = np.empty(n_rows)
+    h_i = np.empty(n_rows)
+    premium = np.empty(n_rows)
+    for i in range(n_rows):
+        row = {name: float(values[i]) for name, values in profiles.items()}
+        fhc = row['f_role'] * row['f_level'] * row['f_field'] * row['f_school'] * fexp(row['years_experience'])
+        if 'f_cr' in row:
+            fcr = row['f_cr']
+        else:
+            fcr = 0.33 * row['s_senti'] + 0.33 * row['s_fin'] + 0.34 * row['s_growth']
+        fus = 1 - (params['GAMMA_GEN'] * row.get('p_gen', 0.0) + params['GAMMA_SPEC'] * row.get('p_spec', 0.0))
+        v_i[i] = idiosyncratic_risk(fhc, fcr, fus, params['W_CR'], params['W_US'])
+        h_base_t = row['h_base']
+        if 'h_target' in row:
+            h_base_t = h_base_ttv(row.get('transition_month', 0.0), params['TTV_DEFAULT'], row['h_base'], row['h_target'])
+        h_i[i] = h_base_t * (params['W_ECON'] * float(mecon[i]) + params['W_INNO'] * float(iai[i]))
+        salary = row.get('annual_salary', float(params['Annual Salary']))
+        payout = (salary / 12) * params['Coverage Duration'] * params['Coverage Percentage']
+        p_claim = ((h_i[i] / 100) * params['Beta Systemic']) * ((v_i[i] / 100) * params['Beta Individual'])
+        premium[i] = monthly_premium(p_claim * payout, params['Loading Factor'], params['Minimum Monthly Premium'])
+    return {'V_i': v_i, 'H_i': h_i, 'P_monthly': premium}
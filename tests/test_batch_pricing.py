@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from utils.batch_pricing import price_profiles
+from tests.helpers import random_profiles, scalar_chain
+
+@pytest.mark.parametrize('company_scores', [False, True])
+@pytest.mark.parametrize('transition', [False, True])
+def test_matches_scalar_chain(params, company_scores, transition):
+    profiles = random_profiles(2000, seed=1, company_scores=company_scores, transition=transition)
+    expected = scalar_chain(profiles, params, mecon=1.1, iai=0.9)
+    result = price_profiles(profiles, params, mecon=1.1, iai=0.9)
+    np.testing.assert_array_equal(result['V_i'], expected['V_i'])
+    np.testing.assert_array_equal(result['H_i'], expected['H_i'])
+    np.testing.assert_array_equal(result['P_monthly'], expected['P_monthly'])
+
+def test_clamp_and_floor_edges_are_exercised(params):
+    profiles = random_profiles(2000, seed=2)
+    result = price_profiles(profiles, params)
+    assert (result['V_i'] == 5.0).any()
+    assert (result['V_i'] == 100.0).any()
+    assert (result['P_monthly'] == params['Minimum Monthly Premium']).any()
+    assert result['V_i'].min() >= 5.0 and result['V_i'].max() <= 100.0
+    assert result['P_monthly'].min() >= params['Minimum Monthly Premium']
+
+def test_edge_rows(params):
+    # Tiny FHC -> V_i clamps to 5; huge FHC -> V_i clamps to 100; near-zero hazard -> P_min.
+    profiles = {
+        'f_role': np.array([0.01, 5.0, 1.0]),
+        'f_level': np.ones(3), 'f_field': np.ones(3), 'f_school': np.ones(3),
+        'years_experience': np.array([40.0, 0.0, 5.0]),
+        'h_base': np.array([60.0, 60.0, 0.01]),
+        'f_cr': np.array([0.5, 1.0, 0.5]),
+    }
+    result = price_profiles(profiles, params)
+    expected = scalar_chain(profiles, params)
+    np.testing.assert_array_equal(result['V_i'][:2], [5.0, 100.0])
+    assert result['P_monthly'][2] == params['Minimum Monthly Premium']
+    np.testing.assert_array_equal(result['P_monthly'], expected['P_monthly'])
+
+def test_array_macro_and_salary(params):
+    profiles = random_profiles(500, seed=3, salary=True)
+    mecon = np.random.default_rng(4).uniform(0.5, 1.5, 500)
+    result = price_profiles(profiles, params, mecon=mecon, iai=1.2)
+    np.testing.assert_array_equal(result['P_monthly'], scalar_chain(profiles, params, mecon, 1.2)['P_monthly'])
+
+def test_missing_required_column(params):
+    profiles = random_profiles(10)
+    del profiles['f_role']
+    with pytest.raises(KeyError, match='f_role'):
+        price_profiles(profiles, params)
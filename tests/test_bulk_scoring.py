@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader import load_synthetic_data
+from utils.factor_tables import build_factor_tables
+from utils.bulk_scoring import join_factor_tables, iter_chunks
+
+@pytest.fixture
+def tables():
+    return build_factor_tables(load_synthetic_data())
+
+def chunk(targets):
+    n_rows = len(targets)
+    return pd.DataFrame({
+        'occupation': ['Paralegal', 'Financial Analyst', 'Data Entry Clerk', 'Paralegal'][:n_rows],
+        'education_level': ['High School'] * n_rows,
+        'education_field': ['Business/Management'] * n_rows,
+        'school_tier': ['Tier 1 (Ivy League/Top Research)'] * n_rows,
+        'company_type': ['Large Established Firm (Non-Tech)'] * n_rows,
+        'years_experience': [5.0] * n_rows,
+        'target_occupation': targets,
+        'transition_month': [3.0] * n_rows,
+    })
+
+def test_missing_target_occupation_means_no_transition(tables):
+    profiles = join_factor_tables(chunk([np.nan, '', '  ', 'Data Entry Clerk']), tables)
+    np.testing.assert_array_equal(profiles['h_target'][:3], profiles['h_base'][:3])
+    occupations = load_synthetic_data()['occupations_data']
+    assert profiles['h_target'][3] == occupations['Data Entry Clerk']['H_base']
+
+def test_unknown_target_occupation_still_raises(tables):
+    with pytest.raises(ValueError, match='Unknown target_occupation'):
+        join_factor_tables(chunk(['Astronaut']), tables)
+
+def book(n_rows):
+    rng = np.random.default_rng(15)
+    occupations = np.array(['Paralegal', 'Financial Analyst', 'Data Entry Clerk'], dtype=object)
+    return pd.DataFrame({
+        'policy_id': np.arange(n_rows),
+        'occupation': occupations[rng.integers(3, size=n_rows)],
+        'years_experience': rng.integers(0, 41, n_rows).astype(np.float64),
+    })
+
+@pytest.mark.parametrize('suffix', ['csv', 'parquet'])
+def test_resume_yields_the_same_chunks(tmp_path, suffix):
+    frame = book(1000)
+    path = str(tmp_path / f'book.{suffix}')
+    if suffix == 'csv':
+        frame.to_csv(path, index=False)
+    else:
+        pytest.importorskip('pyarrow')
+        frame.to_parquet(path, index=False, row_group_size=170)
+    full = list(iter_chunks(path, 120))
+    assert [len(chunk) for _, chunk in full] == [120] * 8 + [40]
+    for start_chunk in (1, 3, 8, 9):
+        resumed = list(iter_chunks(path, 120, start_chunk))
+        assert [index for index, _ in resumed] == [index for index, _ in full[start_chunk:]]
+        for (_, chunk), (_, expected) in zip(resumed, full[start_chunk:]):
+            pd.testing.assert_frame_equal(chunk.reset_index(drop=True), expected.reset_index(drop=True))
+
+def test_categorical_parquet_targets_with_missing_values(tmp_path, tables):
+    pytest.importorskip('pyarrow')
+    frame = chunk(['Data Entry Clerk', None, 'Data Entry Clerk', None])
+    frame['target_occupation'] = frame['target_occupation'].astype('category')
+    path = str(tmp_path / 'book.parquet')
+    frame.to_parquet(path, index=False)
+    (_, read), = iter_chunks(path, 10)
+    assert isinstance(read['target_occupation'].dtype, pd.CategoricalDtype)
+    profiles = join_factor_tables(read, tables)
+    np.testing.assert_array_equal(profiles['h_target'][[1, 3]], profiles['h_base'][[1, 3]])
+    occupations = load_synthetic_data()['occupations_data']
+    assert profiles['h_target'][0] == occupations['Data Entry Clerk']['H_base']
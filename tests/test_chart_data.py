@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+import utils.chart_data as chart_data
+from utils.chart_data import (lttb_indices, minmax_indices, downsample_frame, binned_histogram,
+                              figure_json, clear_figure_cache)
+from utils.cohort_aggregation import MISSING_LABEL
+
+def lttb_reference(x, y, n_out):
+    """
+    Textbook LTTB, one point at a time, with the same bucket boundaries.
+    """
+    n = len(x)
+    bucket_size = (n - 2) / (n_out - 2)
+    selected = [0]
+    for bucket in range(n_out - 2):
+        start = int(bucket * bucket_size) + 1
+        stop = int((bucket + 1) * bucket_size) + 1
+        next_stop = min(int((bucket + 2) * bucket_size) + 1, n) if bucket < n_out - 3 else n
+        mean_x = sum(x[stop:next_stop]) / (next_stop - stop)
+        mean_y = sum(y[stop:next_stop]) / (next_stop - stop)
+        a = selected[-1]
+        areas = [abs((x[a] - mean_x) * (y[i] - y[a]) - (x[a] - x[i]) * (mean_y - y[a])) for i in range(start, stop)]
+        selected.append(start + areas.index(max(areas)))
+    return selected + [n - 1]
+
+def test_lttb_matches_reference_and_keeps_endpoints():
+    rng = np.random.default_rng(13)
+    x = np.sort(rng.uniform(0, 100, 2000))
+    y = np.cumsum(rng.normal(size=2000))
+    indices = lttb_indices(x, y, 101)
+    assert len(indices) == 101
+    assert indices[0] == 0 and indices[-1] == 1999
+    assert (np.diff(indices) > 0).all()
+    assert indices.tolist() == lttb_reference(x.tolist(), y.tolist(), 101)
+
+def test_lttb_keeps_a_spike_and_short_series():
+    y = np.zeros(1000)
+    y[537] = 50.0
+    assert 537 in lttb_indices(np.arange(1000), y, 20)
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), np.arange(10), 20), np.arange(10))
+
+def test_minmax_keeps_each_bucket_extreme():
+    rng = np.random.default_rng(14)
+    y = rng.normal(size=1003)
+    y[[100, 700]] = np.nan
+    indices = minmax_indices(y, 42)
+    assert indices[0] == 0 and indices[-1] == 1002 and len(indices) <= 42
+    size = -(-1003 // 20)
+    for start in range(0, 1003, size):
+        bucket = y[start:start + size]
+        assert start + np.nanargmin(bucket) in indices and start + np.nanargmax(bucket) in indices
+
+def test_downsample_frame_per_group():
+    x = np.tile(np.arange(1200.0), 2)
+    frame = pd.DataFrame({'Month': x, 'Premium': np.sin(x / 50), 'Risk': np.cos(x / 30),
+                          'Career': np.repeat(['A', 'B'], 1200)})
+    small = downsample_frame(frame, 'Month', ['Premium', 'Risk'], group_column='Career', max_points=100)
+    for career, rows in small.groupby('Career'):
+        assert 3 <= len(rows) <= 100
+        assert rows['Month'].iloc[0] == 0 and rows['Month'].iloc[-1] == 1199
+    assert len(downsample_frame(frame.iloc[:50], 'Month', ['Premium'])) == 50
+
+def test_histogram_matches_numpy_per_group():
+    rng = np.random.default_rng(15)
+    values = rng.gamma(2.0, 20.0, 5000)
+    groups = rng.choice(np.array(['Nurse', 'Teacher', None], dtype=object), 5000)
+    groups[::97] = np.nan
+    values[::101] = np.nan
+    values[5] = np.inf
+    frame = binned_histogram(values, bins=30, groups=groups)
+    finite = np.isfinite(values)
+    edges = np.histogram_bin_edges(values[finite], bins=30)
+    assert frame['Group'].unique().tolist() == ['Nurse', 'Teacher', MISSING_LABEL]
+    missing = np.array([label is None or label != label for label in groups])
+    for label, mask in (('Nurse', groups == 'Nurse'), ('Teacher', groups == 'Teacher'), (MISSING_LABEL, missing)):
+        expected, _ = np.histogram(values[finite & mask], bins=edges)
+        np.testing.assert_array_equal(frame.loc[frame['Group'] == label, 'Count'], expected)
+    np.testing.assert_allclose(frame['Bin Start'].iloc[:30], edges[:-1])
+    assert frame['Count'].sum() == finite.sum()
+
+def test_histogram_weights_and_range():
+    values = np.array([1.0, 2.0, 2.5, np.nan, 9.0, 11.0])
+    weights = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    frame = binned_histogram(values, bins=2, value_range=(0, 10), weights=weights)
+    assert frame['Count'].tolist() == [6.0, 5.0]
+    assert 'Group' not in frame
+
+@pytest.fixture
+def counting_builder():
+    clear_figure_cache()
+    calls = []
+
+    class Figure:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def to_json(self):
+            return repr(self.payload)
+
+    def build(frame, title=''):
+        calls.append(title)
+        return Figure((frame['y'].sum(), title))
+
+    yield build, calls
+    clear_figure_cache()
+
+def test_figure_json_is_cached_by_content(counting_builder, monkeypatch):
+    build, calls = counting_builder
+    frame = pd.DataFrame({'y': [1.0, 2.0]})
+    first = figure_json(build, frame, title='a')
+    assert figure_json(build, frame.copy(), title='a') == first
+    assert calls == ['a']
+    figure_json(build, pd.DataFrame({'y': [1.0, 3.0]}), title='a')
+    figure_json(build, frame, title='b')
+    assert calls == ['a', 'a', 'b']
+
+    monkeypatch.setattr(chart_data, 'FIGURE_CACHE_SIZE', 2)
+    figure_json(build, frame, title='c') # evicts the least recently used entry
+    figure_json(build, frame, title='a')
+    assert calls == ['a', 'a', 'b', 'c', 'a']
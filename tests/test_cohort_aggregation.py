@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+from utils.batch_pricing import price_profiles
+from utils.cohort_aggregation import encode_groups, aggregate_groups, MISSING_LABEL
+from tests.helpers import random_profiles
+
+def test_missing_labels_form_their_own_group(params):
+    profiles = random_profiles(1000, seed=5)
+    rng = np.random.default_rng(6)
+    company = rng.choice(np.array(['Big Tech', 'Mid-size Firm', None], dtype=object), 1000)
+    company[::97] = np.nan
+    result = price_profiles(profiles, params)
+    codes, labels = encode_groups({'Company Type': company})
+    assert list(labels) == ['Big Tech', 'Mid-size Firm', MISSING_LABEL]
+    table = aggregate_groups(result, codes, labels)
+    assert table['Members'].sum() == 1000
+    expected = pd.Series(result['P_monthly']).groupby(pd.Series(company).fillna(MISSING_LABEL)).sum()
+    np.testing.assert_allclose(table['Total Monthly Premium'].to_numpy(), expected[list(labels)].to_numpy())
+
+def test_missing_labels_in_multi_column_groups():
+    codes, labels = encode_groups({'a': ['x', None, 'x', 'y'], 'b': [1.0, 1.0, np.nan, 1.0]})
+    assert list(labels) == [('x', 1.0), ('x', MISSING_LABEL), ('y', 1.0), (MISSING_LABEL, 1.0)]
+    assert codes.tolist() == [0, 3, 1, 2]
@@ -0,0 +1,25 @@
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader import load_synthetic_data
+from utils.factor_tables import build_factor_tables, encode_categories, gather_factors
+
+@pytest.fixture
+def occupations():
+    return build_factor_tables(load_synthetic_data())['occupations_data']
+
+def test_encode_and_gather(occupations):
+    data = load_synthetic_data()['occupations_data']
+    names = pd.Series(['Paralegal', 'Data Entry Clerk', 'Paralegal'])
+    codes = encode_categories(occupations, names, 'occupation')
+    np.testing.assert_array_equal(gather_factors(occupations, 'H_base', codes),
+                                  [data[name]['H_base'] for name in names])
+
+@pytest.mark.parametrize('unknown', ['Astronaut', None, np.nan])
+def test_unknown_values_raise_without_warnings(occupations, unknown):
+    values = pd.Series(['Paralegal', unknown], dtype=object)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        with pytest.raises(ValueError, match='Unknown occupation'):
+            encode_categories(occupations, values, 'occupation')
@@ -0,0 +1,82 @@
+import inspect
+import numpy as np
+import pandas as pd
+import pytest
+from utils.batch_pricing import price_profiles
+from utils.risk_calculator import calculate_fcr
+from utils.fused_pricing import price_premiums_fused, kernel_constants, _columns, _premium_kernel
+from tests.helpers import random_profiles, scalar_chain
+
+CASES = [
+    {},
+    {'company_scores': True},
+    {'transition': False},
+    {'company_scores': True, 'salary': True},
+]
+
+def macro(n_rows, seed=8):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.5, 1.5, n_rows), rng.uniform(0.8, 1.6, n_rows)
+
+def reference_kernel(profiles, params, mecon, iai):
+    """
+    The un-jitted _premium_kernel, called the way the numba engine calls it.
+    """
+    n_rows = len(profiles['h_base'])
+    cols, has_fcr, has_transition = _columns(profiles, n_rows, params)
+    out = np.empty(n_rows)
+    _premium_kernel(*cols.values(), np.broadcast_to(np.float64(mecon), n_rows), np.broadcast_to(np.float64(iai), n_rows),
+                    kernel_constants(params), has_fcr, has_transition, out)
+    return out
+
+@pytest.mark.parametrize('case', CASES)
+def test_numpy_engine_matches_price_profiles(params, case):
+    profiles = random_profiles(5000, seed=9, **case)
+    mecon, iai = macro(5000)
+    for m, i in ((1.0, 1.0), (1.2, 0.9), (mecon, iai)):
+        expected = price_profiles(profiles, params, m, i)['P_monthly']
+        fused = price_premiums_fused(profiles, params, m, i, engine='numpy', block_size=1024)
+        np.testing.assert_array_equal(fused, expected)
+
+@pytest.mark.parametrize('case', CASES)
+def test_numpy_engine_matches_scalar_chain(params, case):
+    profiles = random_profiles(300, seed=10, **case)
+    mecon, _ = macro(300)
+    expected = scalar_chain(profiles, params, mecon, 1.3)['P_monthly']
+    np.testing.assert_array_equal(price_premiums_fused(profiles, params, mecon, 1.3, engine='numpy'), expected)
+
+@pytest.mark.parametrize('case', CASES)
+def test_reference_kernel_matches_scalar_chain(params, case):
+    profiles = random_profiles(200, seed=11, **case)
+    mecon, iai = macro(200)
+    expected = scalar_chain(profiles, params, mecon, iai)['P_monthly']
+    np.testing.assert_array_equal(reference_kernel(profiles, params, mecon, iai), expected)
+    np.testing.assert_array_equal(expected, price_profiles(profiles, params, mecon, iai)['P_monthly'])
+
+def test_zero_ttv_dataframe_and_out(params):
+    params['TTV_DEFAULT'] = 0
+    frame = pd.DataFrame(random_profiles(1000, seed=12, salary=True))
+    out = np.empty(1000)
+    result = price_premiums_fused(frame, params, 1.1, out=out, engine='numpy', block_size=300)
+    assert result is out
+    np.testing.assert_array_equal(out, price_profiles(frame, params, 1.1)['P_monthly'])
+    with pytest.raises(ValueError):
+        price_premiums_fused(frame, params, out=np.empty(999), engine='numpy')
+
+def test_missing_company_columns(params):
+    profiles = random_profiles(10, company_scores=True)
+    del profiles['s_fin']
+    with pytest.raises(KeyError, match='s_fin'):
+        price_premiums_fused(profiles, params, engine='numpy')
+
+@pytest.mark.parametrize('case', CASES)
+def test_numba_engine_matches_price_profiles(params, case):
+    pytest.importorskip('numba')
+    profiles = random_profiles(5000, seed=13, **case)
+    mecon, iai = macro(5000)
+    expected = price_profiles(profiles, params, mecon, iai)['P_monthly']
+    np.testing.assert_array_equal(price_premiums_fused(profiles, params, mecon, iai, engine='numba'), expected)
+
+def test_company_weights_are_calculate_fcr_defaults(params):
+    defaults = inspect.signature(calculate_fcr).parameters
+    assert tuple(kernel_constants(params)[-3:]) == tuple(defaults[w].default for w in ('w1', 'w2', 'w3'))
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from tests.helpers import h_base_ttv, idiosyncratic_risk, monthly_premium
+from utils.inverse_solver import required_skill_progress, required_transition_month
+
+N_CLIENTS = 400
+
+def forward_premium(params, fhc, fcr, h_base, p_gen, p_spec, mecon=1.0, iai=1.0):
+    fus = 1 - (params['GAMMA_GEN'] * p_gen + params['GAMMA_SPEC'] * p_spec)
+    v_i = idiosyncratic_risk(fhc, fcr, fus, params['W_CR'], params['W_US'])
+    h_i = h_base * (params['W_ECON'] * mecon + params['W_INNO'] * iai)
+    payout = params['Annual Salary'] / 12 * params['Coverage Duration'] * params['Coverage Percentage']
+    p_claim = (h_i / 100 * params['Beta Systemic']) * (v_i / 100 * params['Beta Individual'])
+    return monthly_premium(p_claim * payout, params['Loading Factor'], params['Minimum Monthly Premium'])
+
+@pytest.fixture
+def clients(params):
+    rng = np.random.default_rng(12)
+    clients = {
+        'fhc': rng.uniform(0.2, 2.5, N_CLIENTS),
+        'fcr': rng.uniform(0.2, 1.5, N_CLIENTS),
+        'h_base': rng.uniform(10.0, 95.0, N_CLIENTS),
+        'target_h_base': rng.uniform(5.0, 95.0, N_CLIENTS),
+        'p_gen': rng.uniform(0.0, 0.6, N_CLIENTS),
+        'p_spec': rng.uniform(0.0, 0.6, N_CLIENTS),
+    }
+    current = np.array([
+        forward_premium(params, *(clients[name][i] for name in ('fhc', 'fcr', 'h_base', 'p_gen', 'p_spec')), 1.2, 1.1)
+        for i in range(N_CLIENTS)
+    ])
+    clients['target'] = current * rng.uniform(0.3, 1.2, N_CLIENTS)
+    return clients
+
+@pytest.mark.parametrize('skill', ['general', 'firm_specific'])
+def test_skill_progress_prices_back_to_target(params, clients, skill):
+    c = clients
+    result = required_skill_progress(c['target'], c['fhc'], c['fcr'], c['h_base'], c['p_gen'], c['p_spec'],
+                                     params, mecon=1.2, iai=1.1, skill=skill)
+    status = result['status']
+    assert set(status) == {'met', 'solved', 'below_minimum_premium', 'unreachable'}
+    for i in range(N_CLIENTS):
+        def premium_at(progress):
+            p_gen, p_spec = (progress, c['p_spec'][i]) if skill == 'general' else (c['p_gen'][i], progress)
+            return forward_premium(params, c['fhc'][i], c['fcr'][i], c['h_base'][i], p_gen, p_spec, 1.2, 1.1)
+        current = c['p_gen'][i] if skill == 'general' else c['p_spec'][i]
+        assert result['premium'][i] == pytest.approx(premium_at(current), rel=1e-12)
+        if status[i] == 'met':
+            assert result['progress'][i] == current and premium_at(current) <= c['target'][i]
+        elif status[i] == 'solved':
+            assert current <= result['progress'][i] <= 1.0
+            assert premium_at(result['progress'][i]) == pytest.approx(c['target'][i], rel=1e-9)
+            assert premium_at(result['progress'][i] - 1e-6) > c['target'][i]
+        elif status[i] == 'unreachable':
+            assert np.isnan(result['progress'][i]) and premium_at(1.0) > c['target'][i] * (1 + 1e-12)
+        else:
+            assert np.isnan(result['progress'][i]) and c['target'][i] < params['Minimum Monthly Premium']
+
+def test_transition_month_prices_back_to_target(params, clients):
+    c = clients
+    result = required_transition_month(c['target'], c['fhc'], c['fcr'], c['h_base'], c['target_h_base'],
+                                       c['p_gen'], c['p_spec'], params, mecon=1.2, iai=1.1, ttv=18)
+    status = result['status']
+    assert set(status) == {'met', 'solved', 'below_minimum_premium', 'unreachable'}
+    for i in range(N_CLIENTS):
+        def premium_at(month):
+            h_base = h_base_ttv(month, 18, c['h_base'][i], c['target_h_base'][i])
+            return forward_premium(params, c['fhc'][i], c['fcr'][i], h_base, c['p_gen'][i], c['p_spec'][i], 1.2, 1.1)
+        if status[i] == 'met':
+            assert result['month'][i] == 0.0 and premium_at(0.0) <= c['target'][i]
+        elif status[i] == 'solved':
+            assert 0.0 <= result['month'][i] <= 18
+            assert premium_at(result['month'][i]) == pytest.approx(c['target'][i], rel=1e-9)
+            assert premium_at(result['month'][i] - 1e-6) > c['target'][i]
+        elif status[i] == 'unreachable':
+            assert np.isnan(result['month'][i]) and premium_at(18) > c['target'][i] * (1 + 1e-12)
+        else:
+            assert np.isnan(result['month'][i]) and c['target'][i] < params['Minimum Monthly Premium']
+
+def test_unknown_skill_is_rejected(params):
+    with pytest.raises(ValueError, match='skill'):
+        required_skill_progress(30.0, 1.0, 0.5, 50.0, 0.0, 0.0, params, skill='other')
@@ -0,0 +1,20 @@
+import numpy as np
+from utils.monte_carlo import simulate_portfolio_losses
+
+def portfolio(n_policies, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(10, 90, n_policies), rng.uniform(5, 100, n_policies), rng.integers(0, 5, n_policies)
+
+def test_policy_blocks_when_portfolio_exceeds_max_cells():
+    h_i, v_i, groups = portfolio(3000)
+    result = simulate_portfolio_losses(h_i, v_i, 11250.0, 0.10, 0.50, groups=groups, n_years=4000, max_cells=500)
+    again = simulate_portfolio_losses(h_i, v_i, 11250.0, 0.10, 0.50, groups=groups, n_years=4000, max_cells=500)
+    assert result['mean_loss'] == again['mean_loss']
+    assert abs(result['mean_loss'] - result['expected_loss']) < 4 * result['std_error']
+
+def test_chunking_matches_expected_loss():
+    h_i, v_i, groups = portfolio(200, seed=1)
+    result = simulate_portfolio_losses(h_i, v_i, 11250.0, 0.10, 0.50, groups=groups, n_years=20000,
+                                       max_cells=10_000)
+    assert abs(result['mean_loss'] - result['expected_loss']) < 4 * result['std_error']
+    assert result['var'][0.99] <= result['tvar'][0.99]
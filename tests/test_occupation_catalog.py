@@ -0,0 +1,92 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import utils.occupation_catalog as occupation_catalog
+from utils.data_loader import load_synthetic_data
+from utils.occupation_catalog import (
+    load_occupation_catalog, refresh_catalog, build_search_index, search_index, search_occupations
+)
+
+NAMES = ['Software Developer', 'Senior Software Developer', 'Data Analyst', 'Registered Nurse',
+         'Nurse Practitioner', 'Data Entry Clerk', 'Paralegal', 'Software Test Engineer']
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / 'occupations.csv'
+    frame = pd.DataFrame({'Occupation': NAMES, 'H_base': np.linspace(10, 80, len(NAMES)), 'f_role': 1.0})
+    frame.to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture
+def count_builds(monkeypatch):
+    builds = []
+    original = occupation_catalog.build_search_index
+
+    def counting(names):
+        builds.append(len(names))
+        return original(names)
+
+    monkeypatch.setattr(occupation_catalog, 'build_search_index', counting)
+    return builds
+
+def assert_same_index(index, expected):
+    np.testing.assert_array_equal(index['keys'], expected['keys'])
+    assert list(index['key_names']) == list(expected['key_names'])
+    assert index['trigrams'] == expected['trigrams']
+    assert index['trigram_counts'] == expected['trigram_counts']
+
+def test_cache_load_does_not_build_index(catalog_path, count_builds):
+    load_occupation_catalog(catalog_path)
+    catalog = load_occupation_catalog(catalog_path)
+    assert catalog['load_stats']['source'] == 'cache'
+    assert catalog['index'] is None and count_builds == []
+    assert search_occupations(catalog, 'nurse')[:2] == ['Nurse Practitioner', 'Registered Nurse']
+    assert count_builds == [len(NAMES)]
+    search_occupations(catalog, 'softw')
+    assert count_builds == [len(NAMES)]
+
+def test_one_row_edit_patches_index(catalog_path, count_builds):
+    catalog = load_occupation_catalog(catalog_path)
+    index = search_index(catalog)
+    frame = pd.read_csv(catalog_path)
+    frame.loc[2, 'Occupation'] = 'Data Scientist'
+    refreshed, stats = refresh_catalog(catalog, frame)
+    assert stats == {'added': 1, 'removed': 1, 'changed': 0, 'unchanged': len(NAMES) - 1}
+    assert count_builds == [len(NAMES)]
+    assert refreshed['index'] is index
+    assert_same_index(index, build_search_index(refreshed['names']))
+    assert search_occupations(refreshed, 'data')[:2] == ['Data Entry Clerk', 'Data Scientist']
+    assert count_builds == [len(NAMES)]
+
+def test_refresh_of_unsearched_catalog_leaves_index_unbuilt(catalog_path, count_builds):
+    load_occupation_catalog(catalog_path)
+    frame = pd.read_csv(catalog_path)
+    frame.loc[0, 'H_base'] = 55.0
+    frame.to_csv(catalog_path, index=False)
+    catalog = load_occupation_catalog(catalog_path)
+    assert catalog['load_stats']['source'] == 'incremental'
+    assert catalog['load_stats']['changed'] == 1
+    assert catalog['index'] is None and count_builds == []
+
+def test_reload_refreshes_live_catalog(catalog_path, count_builds):
+    data = load_synthetic_data(catalog_path)
+    live = data['occupation_catalog']
+    index = search_index(live)
+    assert load_synthetic_data(catalog_path, live_catalog=live)['occupation_catalog'] is live
+    assert live['load_stats']['source'] == 'memory'
+
+    frame = pd.read_csv(catalog_path)
+    frame.loc[2, 'Occupation'] = 'Data Scientist'
+    frame.to_csv(catalog_path, index=False)
+    stat = os.stat(catalog_path)
+    os.utime(catalog_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = load_synthetic_data(catalog_path, live_catalog=live)
+    catalog = reloaded['occupation_catalog']
+    assert catalog['load_stats'] == {'added': 1, 'removed': 1, 'changed': 0, 'unchanged': len(NAMES) - 1,
+                                     'source': 'incremental', 'rows': len(NAMES)}
+    assert catalog['index'] is index and count_builds == [len(NAMES)]
+    assert 'Data Scientist' in reloaded['occupations_data'] and 'Data Analyst' not in reloaded['occupations_data']
+    assert search_occupations(catalog, 'data')[:2] == ['Data Entry Clerk', 'Data Scientist']
+    assert count_builds == [len(NAMES)]
+    assert load_occupation_catalog(catalog_path)['load_stats']['source'] == 'cache'
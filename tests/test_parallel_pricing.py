@@ -0,0 +1,46 @@
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pytest
+from utils.batch_pricing import price_profiles, RESULT_COLUMNS
+from utils.parallel_pricing import price_profiles_parallel, _attach
+from tests.helpers import random_profiles
+
+SCENARIOS = [(1.0, 1.0), (1.2, 0.9), (0.8, 1.5)]
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_matches_price_profiles(params, workers):
+    profiles = random_profiles(3000, seed=16, company_scores=True, salary=True)
+    result = price_profiles_parallel(profiles, params, SCENARIOS, workers=workers, shard_size=700)
+    for s, (mecon, iai) in enumerate(SCENARIOS):
+        expected = price_profiles(profiles, params, mecon, iai)
+        for column in RESULT_COLUMNS:
+            np.testing.assert_array_equal(result[column][s], expected[column])
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_empty_book(params, workers):
+    profiles = {name: values[:0] for name, values in random_profiles(10).items()}
+    result = price_profiles_parallel(profiles, params, SCENARIOS, workers=workers)
+    assert all(result[column].shape == (len(SCENARIOS), 0) for column in RESULT_COLUMNS)
+
+def test_no_profile_columns(params):
+    with pytest.raises(ValueError, match='No profile columns'):
+        price_profiles_parallel({}, params)
+
+def test_attach_leaves_block_to_the_owner(monkeypatch):
+    # A worker that stays registered with the resource tracker may unlink the block (and warn
+    # about a leak) when it exits, although only the parent owns it.
+    calls = []
+    record = lambda action: lambda name, rtype: calls.append((action, name))
+    register = record('register')
+    monkeypatch.setattr(resource_tracker, 'register', register)
+    monkeypatch.setattr(resource_tracker, 'unregister', record('unregister'))
+    owner = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        del calls[:]
+        attached = _attach(owner.name)
+        attached.close()
+        assert calls == []
+        assert resource_tracker.register is register
+    finally:
+        owner.close()
+        owner.unlink()
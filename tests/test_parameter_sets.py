@@ -0,0 +1,42 @@
+import json
+import os
+import numpy as np
+import utils.parameter_sets as parameter_sets
+from utils.batch_pricing import price_profiles
+from utils.parameter_sets import ParameterStore, COMPILED_DIR
+from tests.helpers import random_profiles
+
+def test_compiled_premiums_match_price_profiles(params):
+    store = ParameterStore()
+    store.register('filed', params)
+    profiles = random_profiles(2000, seed=14, company_scores=True, salary=True)
+    expected = price_profiles(profiles, params, 1.1, 0.9)['P_monthly']
+    np.testing.assert_allclose(store.price(profiles, 'filed', 1.1, 0.9), expected, rtol=1e-12)
+
+def test_compiled_files_are_reused_within_a_compile_version(params, tmp_path, monkeypatch):
+    store = ParameterStore(str(tmp_path))
+    version = store.register('filed', params)
+    store.compiled('filed')
+    assert store.compile_count == 1
+    reopened = ParameterStore(str(tmp_path))
+    reopened.compiled('filed')
+    assert reopened.compile_count == 0
+
+    monkeypatch.setattr(parameter_sets, 'COMPILE_VERSION', parameter_sets.COMPILE_VERSION + 1)
+    upgraded = ParameterStore(str(tmp_path))
+    compiled = upgraded.compiled('filed')
+    assert upgraded.compile_count == 1
+    assert compiled['compile_version'] == parameter_sets.COMPILE_VERSION
+    with open(os.path.join(tmp_path, COMPILED_DIR, f"{version}.json")) as f:
+        assert json.load(f)['compile_version'] == parameter_sets.COMPILE_VERSION
+
+def test_compiled_files_without_version_are_recompiled(params, tmp_path):
+    store = ParameterStore(str(tmp_path))
+    version = store.register('filed', params)
+    path = os.path.join(tmp_path, COMPILED_DIR, f"{version}.json")
+    legacy = dict(parameter_sets.compile_parameter_set(params))
+    del legacy['compile_version']
+    with open(path, 'w') as f:
+        json.dump(legacy, f)
+    store.compiled('filed')
+    assert store.compile_count == 1
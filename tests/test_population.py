@@ -0,0 +1,81 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from utils.bulk_scoring import part_path, score_file
+from utils.population import (POPULATION_COLUMNS, compile_population_config, generate_chunk,
+                              generate_population)
+
+N_ROWS, CHUNK_SIZE = 2500, 1000
+
+@pytest.fixture(scope='module')
+def compiled():
+    return compile_population_config()
+
+def read_parts(output_dir, output_format, n_chunks):
+    read = pd.read_parquet if output_format == 'parquet' else pd.read_csv
+    return pd.concat([read(part_path(str(output_dir), index, output_format)) for index in range(n_chunks)],
+                     ignore_index=True)
+
+def as_plain(frame):
+    return frame.astype({column: object for column in frame.select_dtypes('category').columns})
+
+def test_chunks_depend_only_on_seed_and_index(compiled):
+    first = generate_chunk(compiled, 1, CHUNK_SIZE, N_ROWS, seed=5)
+    pd.testing.assert_frame_equal(first, generate_chunk(compiled, 1, CHUNK_SIZE, N_ROWS, seed=5))
+    assert not first.equals(generate_chunk(compiled, 1, CHUNK_SIZE, N_ROWS, seed=6))
+    last = generate_chunk(compiled, 2, CHUNK_SIZE, N_ROWS, seed=5)
+    assert list(last.columns) == POPULATION_COLUMNS
+    assert last['policy_id'].tolist() == list(range(2000, 2500))
+
+@pytest.mark.parametrize('output_format', ['csv', 'parquet'])
+def test_parts_round_trip(compiled, tmp_path, output_format):
+    if output_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    assert generate_population(tmp_path, N_ROWS, CHUNK_SIZE, output_format, seed=3, log=io.StringIO()) == N_ROWS
+    written = read_parts(tmp_path, output_format, 3)
+    expected = pd.concat([as_plain(generate_chunk(compiled, index, CHUNK_SIZE, N_ROWS, seed=3)) for index in range(3)],
+                         ignore_index=True)
+    pd.testing.assert_frame_equal(as_plain(written), expected, check_dtype=False)
+
+def test_workers_and_resume_write_the_same_files(tmp_path):
+    log = io.StringIO()
+    generate_population(tmp_path / 'serial', N_ROWS, CHUNK_SIZE, 'csv', seed=4, log=log)
+    generate_population(tmp_path / 'parallel', N_ROWS, CHUNK_SIZE, 'csv', seed=4, workers=2, log=log)
+    generate_population(tmp_path / 'resumed', N_ROWS, CHUNK_SIZE, 'csv', seed=4, log=log)
+    (tmp_path / 'resumed' / 'part-000001.csv').unlink()
+    assert generate_population(tmp_path / 'resumed', N_ROWS, CHUNK_SIZE, 'csv', seed=4, resume=True, log=log) == CHUNK_SIZE
+    for index in range(3):
+        serial = (tmp_path / 'serial' / f'part-{index:06d}.csv').read_bytes()
+        assert (tmp_path / 'parallel' / f'part-{index:06d}.csv').read_bytes() == serial
+        assert (tmp_path / 'resumed' / f'part-{index:06d}.csv').read_bytes() == serial
+
+def test_marginals_follow_the_config():
+    compiled = compile_population_config({
+        'category_weights': {'school_tier': {'Tier 1 (Ivy League/Top Research)': 1.0}},
+        'transition_share': 0.5,
+    })
+    frame = generate_chunk(compiled, 0, 50_000, 50_000, seed=1)
+    assert (frame['school_tier'] == 'Tier 1 (Ivy League/Top Research)').all()
+    moving = frame['target_occupation'].astype(object) != frame['occupation'].astype(object)
+    assert moving.mean() == pytest.approx(0.5, abs=0.01)
+    assert (frame.loc[~moving, 'transition_month'] == 0).all()
+    assert frame['years_experience'].between(0, 45).all()
+    assert frame[['s_senti', 's_fin', 'p_gen', 'p_spec']].apply(lambda column: column.between(0, 1).all()).all()
+    assert np.corrcoef(frame['years_experience'], np.log(frame['annual_salary']))[0, 1] > 0.3
+
+def test_invalid_configs_are_rejected():
+    with pytest.raises(ValueError, match='occupation'):
+        compile_population_config({'category_weights': {'occupation': {'Astronaut': 1.0}}})
+    with pytest.raises(ValueError, match='correlation'):
+        compile_population_config({'correlations': {('s_senti', 's_fin'): 0.99, ('s_senti', 's_growth'): 0.99,
+                                                    ('s_fin', 's_growth'): -0.99}})
+
+def test_parts_can_be_scored(tmp_path):
+    generate_population(tmp_path / 'population', 300, 300, 'csv', seed=2, log=io.StringIO())
+    scored = score_file(str(tmp_path / 'population' / 'part-000000.csv'), str(tmp_path / 'scored'),
+                        chunk_size=128, log=io.StringIO())
+    assert scored == 300
+    result = read_parts(tmp_path / 'scored', 'csv', 3)
+    assert result['policy_id'].tolist() == list(range(300))
+    assert np.isfinite(result['P_monthly']).all()
@@ -0,0 +1,66 @@
+import itertools
+import numpy as np
+import pytest
+from utils.batch_pricing import price_profiles
+from utils.data_loader import load_synthetic_data
+from utils.premium_lattice import build_premium_lattice, quote_premium, lattice_nbytes, CATEGORY_AXES
+
+@pytest.fixture(scope='module')
+def data():
+    return load_synthetic_data()
+
+@pytest.fixture(scope='module')
+def lattice(data):
+    return build_premium_lattice(data, dtype=np.float64)
+
+def grid_quotes(data, rng, n_quotes):
+    names = {axis: list(data[table]) for axis, table in CATEGORY_AXES}
+    for _ in range(n_quotes):
+        profile = {axis: values[rng.integers(len(values))] for axis, values in names.items()}
+        step = rng.integers(21) / 20 # p_gen = p_spec puts FUS on the grid (GAMMA_GEN + GAMMA_SPEC = 1)
+        yield dict(profile, years_experience=float(rng.integers(0, 21)), p_gen=step, p_spec=step,
+                   target_occupation=names['occupation'][rng.integers(len(names['occupation']))],
+                   transition_month=float(rng.integers(0, 16)), mecon=1.1, iai=0.9)
+
+def exact(data, quote, params):
+    occupations = data['occupations_data']
+    return price_profiles({
+        'f_role': [occupations[quote['occupation']]['f_role']],
+        'f_level': [data['education_data'][quote['education_level']]['f_level']],
+        'f_field': [data['education_field_data'][quote['education_field']]['f_field']],
+        'f_school': [data['school_tier_data'][quote['school_tier']]['f_school']],
+        'f_cr': [data['company_type_data'][quote['company_type']]['F_CR']],
+        'years_experience': [quote['years_experience']], 'p_gen': [quote['p_gen']], 'p_spec': [quote['p_spec']],
+        'h_base': [occupations[quote['occupation']]['H_base']],
+        'h_target': [occupations[quote['target_occupation']]['H_base']],
+        'transition_month': [quote['transition_month']],
+    }, params, quote['mecon'], quote['iai'])
+
+@pytest.mark.parametrize('interpolate', [True, False])
+def test_grid_points_match_price_profiles(data, lattice, interpolate):
+    rng = np.random.default_rng(17)
+    for quote in grid_quotes(data, rng, 300):
+        quoted = quote_premium(lattice, interpolate=interpolate, **quote)
+        expected = exact(data, quote, lattice['params'])
+        for column in ('V_i', 'H_i', 'P_monthly'):
+            assert quoted[column] == pytest.approx(expected[column][0], rel=1e-12)
+
+def test_float32_lattice_is_close(data):
+    lattice = build_premium_lattice(data)
+    rng = np.random.default_rng(18)
+    for quote in grid_quotes(data, rng, 100):
+        assert quote_premium(lattice, **quote)['P_monthly'] == pytest.approx(
+            exact(data, quote, lattice['params'])['P_monthly'][0], rel=1e-6)
+
+def test_size_guard(data):
+    assert lattice_nbytes(data) == build_premium_lattice(data)['v_table'].nbytes
+    with pytest.raises(ValueError, match='max_bytes'):
+        build_premium_lattice(data, max_bytes=lattice_nbytes(data) - 1)
+
+def test_occupations_sharing_f_role_share_a_row(data):
+    data = dict(data, occupations_data=dict(data['occupations_data']))
+    for name in itertools.islice(list(data['occupations_data']), 3):
+        data['occupations_data'][f"{name} II"] = dict(data['occupations_data'][name])
+    lattice = build_premium_lattice(data)
+    assert lattice['v_table'].shape[0] == len({row['f_role'] for row in data['occupations_data'].values()})
+    assert lattice_nbytes(data) == lattice['v_table'].nbytes
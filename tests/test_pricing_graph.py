@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from tests.helpers import random_profiles, scalar_chain
+from utils.pricing_graph import PricingGraph
+
+def test_full_evaluation_matches_scalar_chain(params):
+    profiles = random_profiles(300, seed=8, company_scores=True, salary=True)
+    graph = PricingGraph.from_profiles(profiles, params, mecon=1.1, iai=1.3)
+    result = graph.evaluate()
+    expected = scalar_chain(profiles, params, 1.1, 1.3)
+    for column in ('V_i', 'H_i', 'P_monthly'):
+        np.testing.assert_allclose(result[column], expected[column], rtol=1e-12)
+
+def test_scenario_change_reruns_only_downstream_nodes(params):
+    profiles = random_profiles(200, seed=9)
+    graph = PricingGraph.from_profiles(profiles, params)
+    graph.evaluate()
+    graph.set(M_econ=1.15)
+    result = graph.evaluate()
+    assert graph.last_recomputed == ['H_i', 'P_systemic', 'P_claim', 'E_loss', 'P_monthly']
+    np.testing.assert_allclose(result['P_monthly'], scalar_chain(profiles, params, 1.15)['P_monthly'], rtol=1e-12)
+    graph.set(M_econ=1.15)
+    graph.evaluate()
+    assert graph.last_recomputed == []
+
+def test_skill_change_skips_systematic_branch(params):
+    profiles = random_profiles(200, seed=10)
+    graph = PricingGraph.from_profiles(profiles, params)
+    graph.evaluate()
+    profiles['p_gen'] = np.clip(profiles['p_gen'] + 0.2, 0.0, 1.0)
+    graph.set(p_gen=profiles['p_gen'])
+    result = graph.evaluate()
+    assert set(graph.last_recomputed) == {'FUS', 'V_i', 'P_individual', 'P_claim', 'E_loss', 'P_monthly'}
+    np.testing.assert_allclose(result['P_monthly'], scalar_chain(profiles, params)['P_monthly'], rtol=1e-12)
+
+def test_pinned_node_until_unpinned(params):
+    profiles = random_profiles(100, seed=11, company_scores=True)
+    graph = PricingGraph.from_profiles(profiles, params)
+    graph.evaluate()
+    graph.set(FCR=np.full(100, 0.5))
+    graph.set(s_senti=np.zeros(100)) # ignored while FCR is pinned
+    pinned = graph.evaluate()
+    expected = scalar_chain({**{k: v for k, v in profiles.items() if not k.startswith('s_')},
+                             'f_cr': np.full(100, 0.5)}, params)
+    np.testing.assert_allclose(pinned['P_monthly'], expected['P_monthly'], rtol=1e-12)
+    graph.unpin('FCR')
+    unpinned = graph.evaluate()
+    assert 'FCR' in graph.last_recomputed
+    profiles['s_senti'] = np.zeros(100)
+    np.testing.assert_allclose(unpinned['P_monthly'], scalar_chain(profiles, params)['P_monthly'], rtol=1e-12)
+
+def test_missing_inputs_are_reported(params):
+    graph = PricingGraph()
+    graph.set(**params)
+    with pytest.raises(KeyError, match='years_experience'):
+        graph.evaluate()
@@ -0,0 +1,20 @@
+import numpy as np
+from utils.batch_pricing import price_profiles
+from utils.projection import simulate_macro_paths, project_premiums
+from tests.helpers import random_profiles
+
+def test_drift_sets_the_long_run_trend():
+    paths = simulate_macro_paths(1, 400, start=1.0, reversion=1.0, volatility=0.0, drift=0.01)
+    np.testing.assert_allclose(np.log(paths[0, 1:]), 0.01 * np.arange(399), atol=1e-12)
+
+def test_months_match_price_profiles(params):
+    profiles = random_profiles(300, seed=7, company_scores=True, salary=True)
+    profiles['p_gen_rate'] = np.full(300, 0.02)
+    mecon = simulate_macro_paths(1, 24, seed=1)[0]
+    projection = project_premiums(profiles, params, mecon, 1.1, per_profile=True, max_cells=1000)
+    for t in (0, 5, 23):
+        advanced = dict(profiles, p_gen=np.minimum(profiles['p_gen'] + 0.02 * t, 1.0),
+                        transition_month=profiles['transition_month'] + t)
+        expected = price_profiles(advanced, params, mecon[t], 1.1)['P_monthly']
+        np.testing.assert_allclose(projection['profile_premium'][:, t], expected, rtol=1e-12)
+        np.testing.assert_allclose(projection['premium'][0, t], expected.sum(), rtol=1e-12)
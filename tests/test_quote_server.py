@@ -0,0 +1,70 @@
+import asyncio
+import json
+import numpy as np
+import pytest
+from utils.quote_server import QuoteService, _respond
+
+REQUEST = {
+    'occupation': 'Paralegal',
+    'education_level': 'High School',
+    'education_field': 'Business/Management',
+    'school_tier': 'Tier 1 (Ivy League/Top Research)',
+    'company_type': 'Large Established Firm (Non-Tech)',
+    'years_experience': 5,
+}
+
+@pytest.fixture
+def service():
+    return QuoteService(max_batch_size=4)
+
+def respond(service, path, payload):
+    return asyncio.run(_respond(service, 'POST', path, payload.encode()))
+
+@pytest.mark.parametrize('literal', ['NaN', 'Infinity', '-Infinity'])
+def test_non_finite_numbers_are_rejected(service, literal):
+    status, payload = respond(service, '/quotes', f'[{json.dumps(REQUEST)[:-1]}, "p_gen": {literal}}}]')
+    assert status == 400
+    assert 'p_gen' in payload['error']
+    with pytest.raises(ValueError, match='finite'):
+        service.encode({**REQUEST, 'mecon': float('inf')})
+
+def test_quotes_are_split_by_max_batch_size(service):
+    requests = [{**REQUEST, 'years_experience': years} for years in range(10)]
+    status, results = respond(service, '/quotes', json.dumps(requests))
+    assert status == 200
+    assert len(results) == 10
+    assert list(service.batch_sizes) == [4, 4, 2]
+    single = service.price_rows([service.encode(REQUEST)])[0]
+    assert results[5] == single
+    assert all(np.isfinite(result['P_monthly']) for result in results)
+
+def test_invalid_request_rejects_whole_list(service):
+    status, _ = respond(service, '/quotes', json.dumps([REQUEST, {**REQUEST, 'occupation': 'Astronaut'}]))
+    assert status == 400
+    assert service.quotes == 0
+
+@pytest.mark.parametrize('value', [['Paralegal'], {'name': 'Paralegal'}, 3])
+def test_non_string_categories_are_rejected(service, value):
+    status, payload = respond(service, '/quotes', json.dumps([{**REQUEST, 'occupation': value}]))
+    assert status == 400
+    assert 'occupation' in payload['error']
+
+def test_concurrent_quotes_are_micro_batched():
+    service = QuoteService(max_batch_size=4, max_wait_ms=50)
+    requests = [{**REQUEST, 'years_experience': years} for years in range(10)]
+
+    async def run():
+        batcher = asyncio.create_task(service.run_batcher())
+        try:
+            return await asyncio.gather(
+                *(_respond(service, 'POST', '/quote', json.dumps(request).encode()) for request in requests)
+            )
+        finally:
+            batcher.cancel()
+
+    responses = asyncio.run(run())
+    assert [status for status, _ in responses] == [200] * 10
+    assert list(service.batch_sizes) == [4, 4, 2]
+    assert service.quotes == 10
+    expected = service.price_rows([service.encode(request) for request in requests])
+    assert [result for _, result in responses] == expected
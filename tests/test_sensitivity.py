@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from tests.helpers import random_profiles, scalar_chain
+from utils.sensitivity import (SENSITIVITY_PARAMETERS, premium_sensitivities,
+                               finite_difference_sensitivities, tornado_data)
+
+def scalar_forward_difference(profiles, params, mecon, iai, parameter, step):
+    """
+    (P(θ + step) - P(θ)) / step through the independent scalar chain.
+    """
+    bumped_profiles, bumped_params = dict(profiles), dict(params)
+    bumped_mecon, bumped_iai = mecon, iai
+    if parameter == 'M_econ':
+        bumped_mecon = mecon + step
+    elif parameter == 'I_AI':
+        bumped_iai = iai + step
+    elif parameter in ('p_gen', 'p_spec'):
+        bumped_profiles[parameter] = profiles[parameter] + step
+    else:
+        bumped_params[parameter] = params[parameter] + step
+    base = scalar_chain(profiles, params, mecon, iai)['P_monthly']
+    return (scalar_chain(bumped_profiles, bumped_params, bumped_mecon, bumped_iai)['P_monthly'] - base) / step
+
+@pytest.mark.parametrize('parameter', SENSITIVITY_PARAMETERS)
+def test_analytic_matches_finite_differences(params, parameter):
+    profiles = random_profiles(400, seed=3)
+    analytic = premium_sensitivities(profiles, params, mecon=1.2, iai=1.4)[parameter]
+    numeric = scalar_forward_difference(profiles, params, 1.2, 1.4, parameter, 1e-7)
+    np.testing.assert_allclose(analytic, numeric, rtol=1e-5, atol=1e-5)
+
+def test_clamped_rows_have_zero_sensitivity(params):
+    profiles = random_profiles(400, seed=4)
+    chain = scalar_chain(profiles, params)
+    sensitivities = premium_sensitivities(profiles, params)
+    floored = chain['P_monthly'] == params['Minimum Monthly Premium']
+    clamped = (chain['V_i'] == 5.0) | (chain['V_i'] == 100.0)
+    assert floored.any() and (clamped & ~floored).any()
+    for parameter in SENSITIVITY_PARAMETERS:
+        assert (sensitivities[parameter][floored] == 0).all()
+    for parameter in ('W_CR', 'W_US', 'GAMMA_GEN', 'GAMMA_SPEC', 'p_gen', 'p_spec'):
+        assert (sensitivities[parameter][clamped & ~floored] == 0).all()
+
+def test_batched_finite_differences_match_analytic(params):
+    profiles = random_profiles(300, seed=5)
+    analytic = premium_sensitivities(profiles, params, mecon=1.1)
+    numeric = finite_difference_sensitivities(profiles, params, mecon=1.1, step=1e-7)
+    assert set(numeric) == set(SENSITIVITY_PARAMETERS)
+    for parameter in SENSITIVITY_PARAMETERS:
+        np.testing.assert_allclose(analytic[parameter], numeric[parameter], rtol=1e-5, atol=1e-5)
+
+def test_tornado_data_bumps_each_parameter(params):
+    profiles = random_profiles(200, seed=6)
+    tornado = tornado_data(profiles, params, bump=0.1, parameters=['Loading Factor', 'M_econ'])
+    base = scalar_chain(profiles, params)['P_monthly'].mean()
+    assert list(tornado.columns) == ['Parameter', 'Low', 'High', 'Base', 'Swing']
+    assert tornado['Base'].tolist() == pytest.approx([base, base], rel=1e-12)
+    assert (np.diff(tornado['Swing']) <= 0).all()
+    row = tornado.set_index('Parameter').loc['Loading Factor']
+    high = scalar_chain(profiles, dict(params, **{'Loading Factor': params['Loading Factor'] * 1.1}))['P_monthly']
+    low = scalar_chain(profiles, dict(params, **{'Loading Factor': params['Loading Factor'] * 0.9}))['P_monthly']
+    assert row['High'] == pytest.approx(high.mean(), rel=1e-12)
+    assert row['Low'] == pytest.approx(low.mean(), rel=1e-12)
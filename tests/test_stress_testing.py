@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from tests.helpers import random_profiles, scalar_chain
+from utils.batch_pricing import price_profiles
+from utils.cohort_aggregation import MISSING_LABEL
+from utils.stress_testing import (scenario_grid, run_stress_test, open_stress_results,
+                                  scenario_index, group_summary)
+
+MECON = [0.8, 1.0, 1.3]
+IAI = [0.9, 1.2]
+LOADING = [1.3, 1.7]
+
+@pytest.fixture
+def stress_run(params, tmp_path):
+    profiles = random_profiles(500, seed=7)
+    occupations = np.array(['Nurse', 'Analyst', None, 'Teacher', np.nan], dtype=object)[np.arange(500) % 5]
+    grid = scenario_grid(MECON, IAI, LOADING)
+    run_stress_test(profiles, params, grid, tmp_path, metrics=('H_i', 'P_monthly'),
+                    groups={'occupation': occupations}, dtype=np.float64, chunk_size=128)
+    return profiles, occupations, open_stress_results(tmp_path)
+
+def test_scenarios_match_scalar_chain(params, stress_run):
+    profiles, _, results = stress_run
+    assert results['cubes']['P_monthly'].shape == (len(MECON) * len(IAI) * len(LOADING), 500)
+    for mecon in MECON:
+        for iai in IAI:
+            for loading in LOADING:
+                k = scenario_index(results, mecon, iai, loading)
+                expected = scalar_chain(profiles, dict(params, **{'Loading Factor': loading}), mecon, iai)
+                np.testing.assert_allclose(results['cubes']['P_monthly'][k], expected['P_monthly'], rtol=1e-12)
+                np.testing.assert_allclose(results['cubes']['H_i'][k], expected['H_i'], rtol=1e-12)
+
+def test_group_summary_matches_pandas(params, stress_run):
+    profiles, occupations, results = stress_run
+    k = scenario_index(results, 1.3, 1.2, 1.7)
+    summary = group_summary(results, 'P_monthly', k, 'occupation')
+    premiums = price_profiles(profiles, dict(params, **{'Loading Factor': 1.7}), 1.3, 1.2)['P_monthly']
+    assert list(summary.index) == ['Analyst', 'Nurse', 'Teacher', MISSING_LABEL]
+    labels = np.array([MISSING_LABEL if label is None or label != label else label for label in occupations])
+    for label, row in summary.iterrows():
+        values = premiums[labels == label]
+        assert row['Count'] == len(values)
+        assert row['Mean'] == pytest.approx(values.mean(), rel=1e-12)
+        assert row['Min'] == values.min() and row['Max'] == values.max()
+    assert summary.loc[MISSING_LABEL, 'Count'] == 200
+
+def test_unknown_metric_and_missing_scenario(params, tmp_path, stress_run):
+    with pytest.raises(ValueError):
+        run_stress_test(random_profiles(10), params, scenario_grid([1.0], [1.0], [1.5]), tmp_path / 'x',
+                        metrics=('V_i',))
+    with pytest.raises(KeyError):
+        scenario_index(stress_run[2], 2.0, 1.0, 1.5)
+
+def test_incomplete_run_is_rejected(params, tmp_path):
+    profiles = random_profiles(10)
+    metadata = run_stress_test(profiles, params, scenario_grid([1.0], [1.0], [1.5]), tmp_path)
+    assert metadata['complete']
+    (tmp_path / 'metadata.json').write_text((tmp_path / 'metadata.json').read_text()
+                                            .replace('"complete": true', '"complete": false'))
+    with pytest.raises(ValueError, match='incomplete'):
+        open_stress_results(tmp_path)
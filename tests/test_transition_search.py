@@ -0,0 +1,60 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader import load_synthetic_data
+from tests.helpers import h_base_ttv, idiosyncratic_risk, monthly_premium
+from utils.transition_search import search_transitions
+
+FHC, FCR, CURRENT_H_BASE = 1.6, 0.6, 70.0
+
+def plan_premium(params, h_base_t, p_gen, p_spec, mecon, iai, payout):
+    fus = 1 - (params['GAMMA_GEN'] * p_gen + params['GAMMA_SPEC'] * p_spec)
+    v_i = idiosyncratic_risk(FHC, FCR, fus, params['W_CR'], params['W_US'])
+    h_i = h_base_t * (params['W_ECON'] * mecon + params['W_INNO'] * iai)
+    p_claim = (h_i / 100 * params['Beta Systemic']) * (v_i / 100 * params['Beta Individual'])
+    return monthly_premium(p_claim * payout, params['Loading Factor'], params['Minimum Monthly Premium'])
+
+def brute_force_frontier(params, targets, ttv, p_gen, p_spec, skill_step, skill_budget, months_per_skill_unit,
+                         max_months, mecon, iai):
+    """
+    Best premium for each whole-month time budget over every (target, month, skill mix) plan,
+    reduced to the budgets that strictly beat all shorter ones.
+    """
+    payout = params['Annual Salary'] / 12 * params['Coverage Duration'] * params['Coverage Percentage']
+    n_steps = int(round(1 / skill_step))
+    gen_levels = sorted({min(p_gen + i * skill_step, 1.0) for i in range(n_steps + 1)})
+    spec_levels = sorted({min(p_spec + i * skill_step, 1.0) for i in range(n_steps + 1)})
+    plans = []
+    for name, month, gen, spec in itertools.product(targets, range(max_months + 1), gen_levels, spec_levels):
+        if (gen - p_gen) + (spec - p_spec) > skill_budget + 1e-12:
+            continue
+        h_base_t = h_base_ttv(month, ttv, CURRENT_H_BASE, targets[name])
+        skill_time = (gen - p_gen) * months_per_skill_unit[0] + (spec - p_spec) * months_per_skill_unit[1]
+        plans.append((max(month, skill_time), plan_premium(params, h_base_t, gen, spec, mecon, iai, payout)))
+    best = [min(premium for time, premium in plans if time <= budget + 1e-9) for budget in range(max_months + 1)]
+    return [premium for budget, premium in enumerate(best) if budget == 0 or premium < min(best[:budget])]
+
+@pytest.mark.parametrize('months_per_skill_unit', [(0.0, 0.0), (12.0, 30.0)])
+def test_frontier_matches_brute_force(params, months_per_skill_unit):
+    targets = {name: row['H_base'] for name, row in load_synthetic_data()['occupations_data'].items()}
+    frontier = search_transitions(FHC, FCR, CURRENT_H_BASE, targets, 0.2, 0.1, params, mecon=1.1, iai=1.2,
+                                  max_months=18, skill_budget=0.6, skill_step=0.1,
+                                  months_per_skill_unit=months_per_skill_unit)
+    expected = brute_force_frontier(params, targets, params['TTV_DEFAULT'], 0.2, 0.1, 0.1, 0.6,
+                                    months_per_skill_unit, 18, 1.1, 1.2)
+    np.testing.assert_allclose(frontier['Monthly Premium'].to_numpy(), expected, rtol=1e-12)
+    assert (np.diff(frontier['Monthly Premium'].to_numpy()) < 0).all()
+    assert (np.diff(frontier['Transition Time (Months)'].to_numpy()) >= 0).all()
+
+def test_frontier_rows_price_back(params):
+    targets = {name: row['H_base'] for name, row in load_synthetic_data()['occupations_data'].items()}
+    frontier = search_transitions(FHC, FCR, CURRENT_H_BASE, targets, 0.0, 0.0, params, skill_budget=0.5,
+                                  months_per_skill_unit=(10.0, 20.0))
+    payout = params['Annual Salary'] / 12 * params['Coverage Duration'] * params['Coverage Percentage']
+    for row in frontier.itertuples(index=False):
+        h_target = CURRENT_H_BASE if pd.isna(row[1]) else targets[row[1]]
+        h_base_t = h_base_ttv(row[2], params['TTV_DEFAULT'], CURRENT_H_BASE, h_target)
+        assert row[7] == pytest.approx(plan_premium(params, h_base_t, row[3], row[4], 1.0, 1.0, payout), rel=1e-12)
+    current = plan_premium(params, CURRENT_H_BASE, 0.0, 0.0, 1.0, 1.0, payout)
+    np.testing.assert_allclose(frontier['Premium Reduction'], current - frontier['Monthly Premium'], rtol=1e-12)
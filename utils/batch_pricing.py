@@ -0,0 +1,107 @@
+import numpy as np
+from utils.risk_calculator import (
+    calculate_fexp_batch, calculate_fhc, calculate_fcr, calculate_fus,
+    calculate_idiosyncratic_risk_batch, calculate_h_base_ttv_batch, calculate_systematic_risk,
+    calculate_payout_amount, calculate_p_systemic, calculate_p_individual_systemic,
+    calculate_p_claim, calculate_expected_loss, calculate_monthly_premium_batch
+)
+
+# Numeric profile columns read by price_profiles (see its docstring for which are optional).
+PROFILE_COLUMNS = [
+    'f_role', 'f_level', 'f_field', 'f_school', 'years_experience', 'h_base',
+    'f_cr', 's_senti', 's_fin', 's_growth', 'p_gen', 'p_spec',
+    'h_target', 'transition_month', 'annual_salary',
+]
+
+# Output columns produced by price_profiles, in pipeline order.
+RESULT_COLUMNS = ['V_i', 'H_i', 'P_claim', 'E_loss', 'P_monthly']
+
+# Additional stage values returned by price_profiles(..., intermediates=True).
+INTERMEDIATE_COLUMNS = ['FHC', 'FCR', 'FUS', 'H_base_t', 'P_systemic', 'P_individual', 'L_payout']
+
+def _column(profiles, name, default=None):
+    """
+    Returns a profile column as a float64 array, or the default when the column is absent.
+    """
+    if name in profiles:
+        return np.asarray(profiles[name], dtype=np.float64)
+    if default is None:
+        raise KeyError(f"Profile column '{name}' is required for batch pricing.")
+    return default
+
+def price_profiles(profiles, actuarial_params, mecon=1.0, iai=1.0, intermediates=False):
+    """
+    Prices a batch of policyholder profiles through the full premium chain in one vectorized pass.
+    profiles is a pandas DataFrame or any mapping of column name -> array with columns:
+      required: 'f_role', 'f_level', 'f_field', 'f_school', 'years_experience', 'h_base'
+      company risk: 'f_cr', or 's_senti', 's_fin' and 's_growth' (combined with calculate_fcr)
+      optional: 'p_gen', 'p_spec' (default 0), 'h_target' and 'transition_month' (no transition),
+                'annual_salary' (defaults to actuarial_params['Annual Salary'])
+    actuarial_params uses the keys of load_synthetic_data()['actuarial_parameters'].
+    mecon and iai may be scalars or arrays broadcastable against the rows.
+    Returns a dict of arrays keyed by RESULT_COLUMNS (plus INTERMEDIATE_COLUMNS when intermediates
+    is True); results match the scalar functions exactly.
+    """
+    fexp = calculate_fexp_batch(_column(profiles, 'years_experience'))
+    fhc = calculate_fhc(
+        _column(profiles, 'f_role'),
+        _column(profiles, 'f_level'),
+        _column(profiles, 'f_field'),
+        _column(profiles, 'f_school'),
+        fexp
+    )
+    if 'f_cr' in profiles:
+        fcr = _column(profiles, 'f_cr')
+    else:
+        fcr = calculate_fcr(_column(profiles, 's_senti'), _column(profiles, 's_fin'), _column(profiles, 's_growth'))
+    fus = calculate_fus(
+        _column(profiles, 'p_gen', 0.0),
+        _column(profiles, 'p_spec', 0.0),
+        actuarial_params['GAMMA_GEN'],
+        actuarial_params['GAMMA_SPEC']
+    )
+    v_i = calculate_idiosyncratic_risk_batch(fhc, fcr, fus, actuarial_params['W_CR'], actuarial_params['W_US'])
+
+    h_current = _column(profiles, 'h_base')
+    if 'h_target' in profiles:
+        h_base_t = calculate_h_base_ttv_batch(
+            _column(profiles, 'transition_month', 0.0),
+            actuarial_params['TTV_DEFAULT'],
+            h_current,
+            _column(profiles, 'h_target')
+        )
+    else:
+        h_base_t = h_current
+    h_i = calculate_systematic_risk(h_base_t, mecon, iai, actuarial_params['W_ECON'], actuarial_params['W_INNO'])
+
+    payout = calculate_payout_amount(
+        _column(profiles, 'annual_salary', float(actuarial_params['Annual Salary'])),
+        actuarial_params['Coverage Duration'],
+        actuarial_params['Coverage Percentage']
+    )
+    p_systemic = calculate_p_systemic(h_i, actuarial_params['Beta Systemic'])
+    p_individual = calculate_p_individual_systemic(v_i, actuarial_params['Beta Individual'])
+    p_claim = calculate_p_claim(p_systemic, p_individual)
+    expected_loss = calculate_expected_loss(p_claim, payout)
+    premium = calculate_monthly_premium_batch(
+        expected_loss, actuarial_params['Loading Factor'], actuarial_params['Minimum Monthly Premium']
+    )
+
+    result = {
+        'V_i': v_i,
+        'H_i': h_i,
+        'P_claim': p_claim,
+        'E_loss': expected_loss,
+        'P_monthly': premium,
+    }
+    if intermediates:
+        result.update({
+            'FHC': fhc,
+            'FCR': fcr,
+            'FUS': fus,
+            'H_base_t': h_base_t,
+            'P_systemic': p_systemic,
+            'P_individual': p_individual,
+            'L_payout': payout,
+        })
+    return result
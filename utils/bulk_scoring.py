@@ -0,0 +1,236 @@
+"""
+Headless bulk scorer for policyholder files.
+
+Reads a CSV or Parquet file in fixed-size chunks, joins each chunk against the factor
+tables from load_synthetic_data(), prices it with price_profiles and writes one output
+part file per chunk. Memory stays bounded by the chunk size, and a crashed run can be
+resumed from any chunk offset.
+
+Usage:
+    python -m utils.bulk_scoring book.csv out_dir --format parquet --chunk-size 500000
+    python -m utils.bulk_scoring book.csv out_dir --format arrow
+    python -m utils.bulk_scoring book.csv out_dir --resume
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils.data_loader import load_synthetic_data
+from utils.batch_pricing import price_profiles, RESULT_COLUMNS
+from utils.factor_tables import build_factor_tables, encode_categories, gather_factors
+
+# (input column, factor table, factor key, profile column) joins applied to each chunk.
+FACTOR_JOINS = [
+    ('occupation', 'occupations_data', 'f_role', 'f_role'),
+    ('occupation', 'occupations_data', 'H_base', 'h_base'),
+    ('education_level', 'education_data', 'f_level', 'f_level'),
+    ('education_field', 'education_field_data', 'f_field', 'f_field'),
+    ('school_tier', 'school_tier_data', 'f_school', 'f_school'),
+    ('company_type', 'company_type_data', 'F_CR', 'f_cr'),
+    ('target_occupation', 'occupations_data', 'H_base', 'h_target'),
+]
+
+# Numeric input columns passed straight through to price_profiles when present.
+NUMERIC_COLUMNS = [
+    'years_experience', 's_senti', 's_fin', 's_growth',
+    'p_gen', 'p_spec', 'transition_month', 'annual_salary',
+]
+
+COMPANY_SCORE_COLUMNS = ('s_senti', 's_fin', 's_growth')
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+# 'arrow' parts are Arrow IPC files (Feather v2), readable memory-mapped with
+# utils.arrow_output.read_arrow_results.
+OUTPUT_FORMATS = ['csv', 'parquet', 'arrow']
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow).") from exc
+    return pq
+
+def _fill_missing(values, fallback):
+    """
+    Replaces missing (NaN / None) or blank entries of a category column with fallback's.
+    """
+    missing = values.isna() | values.astype(str).str.strip().eq('')
+    if not missing.any():
+        return values
+    # object dtype on both sides: a categorical column may not have the fallback among its categories.
+    return values.astype(object).where(~missing, fallback.astype(object))
+
+def join_factor_tables(chunk, tables):
+    """
+    Joins one DataFrame chunk of policyholders against the integer-coded factor tables.
+    Each category column is encoded once and every factor is gathered by code.
+    Company scores (s_senti, s_fin, s_growth) take precedence over the company_type F_CR table.
+    A missing or blank target_occupation means no transition: the row's own occupation is used.
+    Returns a dict of float64 arrays ready for price_profiles.
+    """
+    profiles = {}
+    codes = {}
+    has_company_scores = all(column in chunk for column in COMPANY_SCORE_COLUMNS)
+    for column, table, factor, target in FACTOR_JOINS:
+        if column not in chunk or (target == 'f_cr' and has_company_scores):
+            continue
+        if column not in codes:
+            values = chunk[column]
+            if column == 'target_occupation' and 'occupation' in chunk:
+                values = _fill_missing(values, chunk['occupation'])
+            codes[column] = encode_categories(tables[table], values, column)
+        profiles[target] = gather_factors(tables[table], factor, codes[column])
+    for column in NUMERIC_COLUMNS:
+        if column in chunk:
+            profiles[column] = chunk[column].to_numpy(dtype=np.float64)
+    return profiles
+
+def _parquet_chunks(input_path, chunk_size, start_row):
+    """
+    Arrow tables of chunk_size rows from a Parquet file, starting at start_row. Row groups before
+    the one holding start_row are skipped via the file metadata without being decoded.
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(input_path)
+    metadata = parquet_file.metadata
+    group_starts = np.cumsum([0] + [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)])
+    first_group = int(np.searchsorted(group_starts, start_row, side='right')) - 1
+    skip = start_row - int(group_starts[first_group])
+    pending, pending_rows = [], 0
+    row_groups = range(first_group, metadata.num_row_groups)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, row_groups=row_groups):
+        if skip:
+            cut = min(skip, batch.num_rows)
+            batch, skip = batch.slice(cut), skip - cut
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunk_size)
+            rest = table.slice(chunk_size)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+def iter_chunks(input_path, chunk_size, start_chunk=0):
+    """
+    Yields (chunk index, DataFrame) pairs from a CSV or Parquet file, starting at start_chunk.
+    Chunk boundaries depend only on the file and chunk_size, so offsets are stable across runs.
+    Resuming does not hold the skipped rows in memory: CSV lines are skipped by a predicate and
+    Parquet row groups before start_chunk are not read.
+    """
+    if input_path.endswith('.parquet'):
+        tables = _parquet_chunks(input_path, chunk_size, start_chunk * chunk_size)
+        for index, table in enumerate(tables, start=start_chunk):
+            yield index, table.to_pandas()
+    else:
+        # Skip already-scored rows (row 0 is the header) with a predicate; a range would be
+        # turned into a set of every skipped row number.
+        skipped_rows = start_chunk * chunk_size
+        skipped = (lambda row: 0 < row <= skipped_rows) if start_chunk else None
+        reader = pd.read_csv(input_path, chunksize=chunk_size, skiprows=skipped)
+        for index, chunk in enumerate(reader, start=start_chunk):
+            if len(chunk): # resuming past the end leaves one empty frame
+                yield index, chunk
+
+def part_path(output_dir, index, output_format):
+    return os.path.join(output_dir, f"part-{index:06d}.{output_format}")
+
+def completed_chunks(output_dir, output_format):
+    """
+    Returns the number of consecutive part files already written, i.e. the chunk to resume from.
+    """
+    index = 0
+    while os.path.exists(part_path(output_dir, index, output_format)):
+        index += 1
+    return index
+
+def write_part(result, output_dir, index, output_format):
+    """
+    Writes one chunk of results atomically, so a part file only exists once it is complete.
+    """
+    path = part_path(output_dir, index, output_format)
+    tmp_path = path + '.tmp'
+    if output_format == 'parquet':
+        _require_pyarrow()
+        result.to_parquet(tmp_path, index=False)
+    elif output_format == 'arrow':
+        from utils.arrow_output import write_record_batches, frame_to_record_batch
+        write_record_batches([frame_to_record_batch(result)], tmp_path)
+    else:
+        result.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def score_file(input_path, output_dir, output_format='csv', chunk_size=DEFAULT_CHUNK_SIZE,
+               mecon=1.0, iai=1.0, start_chunk=0, resume=False, id_column='policy_id',
+               actuarial_params=None, data=None, log=sys.stderr):
+    """
+    Scores a policyholder file chunk by chunk and writes part-NNNNNN files into output_dir.
+    With resume=True, scoring restarts after the last complete part file.
+    Returns the number of rows scored in this run.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}'; use one of {OUTPUT_FORMATS}.")
+    data = data or load_synthetic_data()
+    params = dict(data['actuarial_parameters'])
+    params.update(actuarial_params or {})
+    tables = build_factor_tables(data)
+    os.makedirs(output_dir, exist_ok=True)
+    if resume:
+        start_chunk = completed_chunks(output_dir, output_format)
+
+    total_rows = 0
+    run_start = time.perf_counter()
+    for index, chunk in iter_chunks(input_path, chunk_size, start_chunk):
+        chunk_start = time.perf_counter()
+        priced = price_profiles(join_factor_tables(chunk, tables), params, mecon, iai)
+        result = pd.DataFrame({column: priced[column] for column in RESULT_COLUMNS})
+        if id_column in chunk:
+            result.insert(0, id_column, chunk[id_column].to_numpy())
+        write_part(result, output_dir, index, output_format)
+
+        total_rows += len(chunk)
+        elapsed = time.perf_counter() - chunk_start
+        print(f"chunk {index}: {len(chunk)} rows in {elapsed:.2f}s "
+              f"({len(chunk) / max(elapsed, 1e-9):,.0f} rows/s)", file=log)
+
+    elapsed = time.perf_counter() - run_start
+    print(f"scored {total_rows} rows in {elapsed:.2f}s "
+          f"({total_rows / max(elapsed, 1e-9):,.0f} rows/s)", file=log)
+    return total_rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-score a policyholder file through the premium chain.")
+    parser.add_argument('input', help="Input policyholder file (.csv or .parquet).")
+    parser.add_argument('output_dir', help="Directory receiving one part file per chunk.")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help="Output file format.")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk.")
+    parser.add_argument('--mecon', type=float, default=1.0, help="Economic Climate Modifier (M_econ).")
+    parser.add_argument('--iai', type=float, default=1.0, help="AI Innovation Index (I_AI).")
+    parser.add_argument('--loading-factor', type=float, help="Override the insurance loading factor.")
+    parser.add_argument('--min-premium', type=float, help="Override the minimum monthly premium.")
+    parser.add_argument('--id-column', default='policy_id', help="Input column copied to the output.")
+    resume_group = parser.add_mutually_exclusive_group()
+    resume_group.add_argument('--start-chunk', type=int, default=0, help="Chunk offset to start from.")
+    resume_group.add_argument('--resume', action='store_true', help="Continue after the last complete part file.")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    if args.loading_factor is not None:
+        overrides['Loading Factor'] = args.loading_factor
+    if args.min_premium is not None:
+        overrides['Minimum Monthly Premium'] = args.min_premium
+
+    score_file(
+        args.input, args.output_dir, output_format=args.format, chunk_size=args.chunk_size,
+        mecon=args.mecon, iai=args.iai, start_chunk=args.start_chunk, resume=args.resume,
+        id_column=args.id_column, actuarial_params=overrides
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Server-side chart data reduction: shape-preserving downsampling of line data, WebGL selection
+for large traces, pre-binned histograms, and a cache of serialized figure JSON.
+
+Only numpy is imported at module level; pandas and plotly are imported where they are used.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Longest trace sent to the browser; longer curves are downsampled to this many points.
+MAX_POINTS_PER_TRACE = 500
+
+# Figures with more points than this in total are drawn with WebGL (scattergl) instead of SVG.
+WEBGL_THRESHOLD = 2000
+
+DEFAULT_HISTOGRAM_BINS = 50
+
+FIGURE_CACHE_SIZE = 128
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of n_out points of (x, y), x sorted,
+    that keep the visual shape of the curve. The first and last points are always kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # n_out - 2 buckets between the fixed end points.
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        mean_x = x[stop:next_stop].mean()
+        mean_y = y[stop:next_stop].mean()
+        # Twice the triangle area between the last selected point, each candidate and the next bucket's mean.
+        area = np.abs((x[selected] - mean_x) * (y[start:stop] - y[selected])
+                      - (x[selected] - x[start:stop]) * (mean_y - y[selected]))
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+def minmax_indices(y, n_out):
+    """
+    Min/max bucket downsampling: the indices of the minimum and maximum of y in each of
+    n_out // 2 equal buckets (plus the end points), in order. Fully vectorized, and keeps
+    every local extreme of a bucket, e.g. spikes in noisy series.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(buckets), axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    low = offsets + np.nanargmin(buckets[valid], axis=1)
+    high = offsets + np.nanargmax(buckets[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], low, high]))
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError("method must be 'lttb' or 'minmax'.")
+
+def downsample_frame(df, x_column, y_columns, group_column=None, max_points=MAX_POINTS_PER_TRACE, method='lttb'):
+    """
+    Reduces a wide DataFrame of curves to at most about max_points rows per curve (per group
+    when group_column is given; rows must be sorted by x within each group). The kept rows are
+    the union of the points selected for each y column, so every metric keeps its shape.
+    Frames already within the limit are returned unchanged.
+    """
+    groups = [np.arange(len(df))] if group_column is None else list(df.groupby(group_column, sort=False).indices.values())
+    if all(len(rows) <= max_points for rows in groups):
+        return df
+    x = df[x_column].to_numpy(dtype=np.float64)
+    keep = []
+    for rows in groups:
+        if len(rows) <= max_points:
+            keep.append(rows)
+            continue
+        # Split the point budget across metrics; their union is at most max_points rows.
+        n_out = max(max_points // len(y_columns), 3)
+        selected = [downsample_indices(x[rows], df[column].to_numpy(dtype=np.float64)[rows], n_out, method)
+                    for column in y_columns]
+        keep.append(rows[np.unique(np.concatenate(selected))])
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+def render_mode(n_points, threshold=WEBGL_THRESHOLD):
+    """
+    The plotly.express render_mode for a line/scatter figure with n_points points in total.
+    """
+    return 'webgl' if n_points > threshold else 'svg'
+
+def binned_histogram(values, bins=DEFAULT_HISTOGRAM_BINS, value_range=None, groups=None, weights=None):
+    """
+    Pre-binned histogram so only bin counts reach the browser. With groups (an array of labels
+    per value) all groups share the same bin edges and are counted in one bincount; missing
+    labels are grouped as in cohort_aggregation.encode_groups. Non-finite values are dropped.
+    Returns a DataFrame with 'Bin Start', 'Bin End', 'Bin Center', 'Count' (and 'Group').
+    """
+    import pandas as pd
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    values = values[finite]
+    edges = np.histogram_bin_edges(values, bins=bins, range=value_range)
+    n_bins = len(edges) - 1
+    bin_index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, n_bins - 1)
+    inside = (values >= edges[0]) & (values <= edges[-1])
+    if groups is None:
+        codes, labels = np.zeros(len(values), dtype=np.int64), None
+    else:
+        from utils.cohort_aggregation import encode_groups
+        codes, labels = encode_groups({'Group': np.asarray(groups, dtype=object)[finite]})
+    n_groups = 1 if labels is None else len(labels)
+    counts = np.bincount(
+        codes[inside] * n_bins + bin_index[inside],
+        weights=None if weights is None else np.asarray(weights, dtype=np.float64)[finite][inside],
+        minlength=n_groups * n_bins
+    ).reshape(n_groups, n_bins)
+    frame = pd.DataFrame({
+        'Bin Start': np.tile(edges[:-1], n_groups),
+        'Bin End': np.tile(edges[1:], n_groups),
+        'Bin Center': np.tile((edges[:-1] + edges[1:]) / 2, n_groups),
+        'Count': counts.ravel(),
+    })
+    if labels is not None:
+        frame.insert(0, 'Group', np.repeat(np.asarray(labels, dtype=object), n_bins))
+    return frame
+
+def data_hash(*objects):
+    """
+    Content hash of figure inputs: DataFrames/Series by their values, index and column names,
+    arrays by dtype, shape and bytes, containers recursively, anything else by repr().
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    def update(obj):
+        if hasattr(obj, 'to_numpy') and hasattr(obj, 'index'):
+            import pandas as pd
+            digest.update(repr(getattr(obj, 'columns', getattr(obj, 'name', None))).encode())
+            digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        elif isinstance(obj, np.ndarray):
+            digest.update(f"{obj.dtype}{obj.shape}".encode())
+            digest.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else repr(obj.tolist()).encode())
+        elif isinstance(obj, dict):
+            for key in sorted(obj, key=repr):
+                digest.update(repr(key).encode())
+                update(obj[key])
+        elif isinstance(obj, (list, tuple)):
+            digest.update(f"{type(obj).__name__}{len(obj)}".encode())
+            for item in obj:
+                update(item)
+        else:
+            digest.update(repr(obj).encode())
+
+    for obj in objects:
+        update(obj)
+    return digest.hexdigest()
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+def figure_json(builder, *args, **kwargs):
+    """
+    Serialized JSON of builder(*args, **kwargs), cached by the builder and a hash of its inputs
+    (least recently used entries are dropped beyond FIGURE_CACHE_SIZE). For serving figures
+    outside Streamlit, where the same chart would otherwise be rebuilt and re-serialized.
+    """
+    key = (builder.__module__, builder.__qualname__, data_hash(args, kwargs))
+    with _figure_cache_lock:
+        if key in _figure_cache:
+            _figure_cache.move_to_end(key)
+            return _figure_cache[key]
+    text = builder(*args, **kwargs).to_json()
+    with _figure_cache_lock:
+        _figure_cache[key] = text
+        while len(_figure_cache) > FIGURE_CACHE_SIZE:
+            _figure_cache.popitem(last=False)
+    return text
+
+def clear_figure_cache():
+    with _figure_cache_lock:
+        _figure_cache.clear()
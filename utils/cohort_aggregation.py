@@ -0,0 +1,140 @@
+"""
+Grouped aggregation of priced books for employer-group and cohort reporting.
+
+Rows are mapped to integer group codes once; every statistic is then a np.bincount over those
+codes, and premium percentiles come from one sort by (group, premium), so there is no
+per-group Python loop or pandas apply:
+
+    result = price_profiles(profiles, params, mecon, iai)
+    codes, labels = encode_groups({'Company Type': company_types, 'Occupation': occupations})
+    table = aggregate_groups(result, codes, labels)
+    plot_risk_breakdown(group_scores(table, ('Mid-size Firm', 'Nurse')), group_scores(table, ...))
+"""
+import numpy as np
+import pandas as pd
+from utils.batch_pricing import price_profiles
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# Multi-column groupings with at most this many label combinations are remapped densely.
+MAX_DENSE_COMBINATIONS = 1 << 24
+
+# Label of the group of rows whose label is missing (None / NaN); it sorts after every other label.
+MISSING_LABEL = '(missing)'
+
+def encode_groups(groups):
+    """
+    Integer codes for rows grouped by one or more label columns.
+    groups is {name: array of labels}; rows with the same labels in every column share a code.
+    Returns (codes, labels) where labels is a pandas Index (MultiIndex for several columns)
+    holding the label(s) of each code; only combinations that occur get a code.
+    Missing labels (None / NaN) form their own group, labelled MISSING_LABEL.
+    """
+    names = list(groups)
+    column_codes, column_labels = [], []
+    for name in names:
+        codes, labels = pd.factorize(np.asarray(groups[name], dtype=object), sort=True)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = len(labels)
+            labels = np.append(labels, np.array([MISSING_LABEL], dtype=object))
+        column_codes.append(codes)
+        column_labels.append(labels)
+    if len(names) == 1:
+        return column_codes[0], pd.Index(column_labels[0], name=names[0])
+    shape = [len(labels) for labels in column_labels]
+    combined = np.ravel_multi_index(column_codes, shape)
+    if np.prod(shape, dtype=np.float64) <= MAX_DENSE_COMBINATIONS:
+        # Dense remap of the combinations that occur: O(rows), no sort.
+        present = np.flatnonzero(np.bincount(combined, minlength=int(np.prod(shape))))
+        remap = np.zeros(int(np.prod(shape)), dtype=np.int64)
+        remap[present] = np.arange(len(present))
+        codes = remap[combined]
+    else:
+        present, codes = np.unique(combined, return_inverse=True)
+    parts = np.unravel_index(present, shape)
+    labels = pd.MultiIndex.from_arrays(
+        [column_labels[i][parts[i]] for i in range(len(names))], names=names
+    )
+    return codes, labels
+
+def grouped_percentiles(values, codes, n_groups, percentiles=DEFAULT_PERCENTILES):
+    """
+    Per-group percentiles (linear interpolation, as np.percentile) from a single sort by
+    (group, value). Returns an array (len(percentiles), n_groups); NaN for empty groups.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    # Sort by value, then stably by code; with narrow integer codes numpy uses a radix sort
+    # for the second pass, about 3x faster than np.lexsort.
+    by_value = np.argsort(values)
+    code_dtype = np.uint16 if n_groups <= np.iinfo(np.uint16).max else np.int64
+    order = by_value[np.argsort(codes[by_value].astype(code_dtype), kind='stable')]
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    result = np.full((len(percentiles), n_groups), np.nan)
+    filled = counts > 0
+    for row, q in enumerate(percentiles):
+        position = starts[filled] + q / 100 * (counts[filled] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, starts[filled] + counts[filled] - 1)
+        weight = position - lower
+        result[row, filled] = sorted_values[lower] + weight * (sorted_values[upper] - sorted_values[lower])
+    return result
+
+def aggregate_groups(result, codes, labels, percentiles=DEFAULT_PERCENTILES):
+    """
+    Aggregates price_profiles output by group code in one pass of bincounts plus one sort.
+    Columns: 'Members', 'Total Expected Loss', 'Total Monthly Premium', 'Mean Monthly Premium',
+    'P<q> Monthly Premium' per percentile, 'Claim Probability' (the group's mixture: the chance
+    that a randomly chosen member claims), 'Expected Claims', 'Loss Ratio' (annual expected
+    loss over annual premium), and 'Idiosyncratic Risk' / 'Systematic Risk' (member means).
+    Returns a DataFrame indexed by `labels`.
+    """
+    n_groups = len(labels)
+    members = np.bincount(codes, minlength=n_groups)
+
+    def total(column):
+        return np.bincount(codes, weights=result[column], minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected_loss = total('E_loss')
+        premium = total('P_monthly')
+        expected_claims = total('P_claim')
+        table = {
+            'Members': members,
+            'Total Expected Loss': expected_loss,
+            'Total Monthly Premium': premium,
+            'Mean Monthly Premium': premium / members,
+        }
+        for q, values in zip(percentiles, grouped_percentiles(result['P_monthly'], codes, n_groups, percentiles)):
+            table[f"P{q:g} Monthly Premium"] = values
+        table.update({
+            'Claim Probability': expected_claims / members,
+            'Expected Claims': expected_claims,
+            'Loss Ratio': expected_loss / (12 * premium),
+            'Idiosyncratic Risk': total('V_i') / members,
+            'Systematic Risk': total('H_i') / members,
+        })
+    return pd.DataFrame(table, index=labels)
+
+def aggregate_book(profiles, actuarial_params, groups, mecon=1.0, iai=1.0, percentiles=DEFAULT_PERCENTILES):
+    """
+    Prices a book with price_profiles and aggregates it by the label columns in `groups`
+    ({name: array of labels per row}). Returns the aggregate_groups DataFrame.
+    """
+    result = price_profiles(profiles, actuarial_params, mecon, iai)
+    codes, labels = encode_groups(groups)
+    return aggregate_groups(result, codes, labels, percentiles)
+
+def group_scores(table, group):
+    """
+    One group's member-mean scores in the format plot_risk_breakdown expects:
+    {'Idiosyncratic Risk', 'Systematic Risk', 'Monthly Premium'}.
+    """
+    row = table.loc[group]
+    return {
+        'Idiosyncratic Risk': float(row['Idiosyncratic Risk']),
+        'Systematic Risk': float(row['Systematic Risk']),
+        'Monthly Premium': float(row['Mean Monthly Premium']),
+    }
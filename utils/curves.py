@@ -0,0 +1,95 @@
+import numpy as np
+from utils.profiling import profile_stage
+from utils.risk_calculator import (
+    calculate_fus, calculate_idiosyncratic_risk_batch, calculate_h_base_ttv_batch, calculate_systematic_risk,
+    calculate_p_systemic, calculate_p_individual_systemic, calculate_p_claim,
+    calculate_expected_loss, calculate_monthly_premium_batch
+)
+
+# Column identifying each curve when several are generated in one call.
+TARGET_COLUMN = 'Target Career'
+SKILL_MIX_COLUMN = 'Firm-Specific Skill Progress'
+
+def premium_from_risks(systematic_risk, idiosyncratic_risk, premium_terms):
+    """
+    Calculates the Monthly Premium from H_i and V_i(t); accepts scalars or arrays.
+    premium_terms is (beta_systemic, beta_individual, payout, loading_factor, min_premium).
+    """
+    beta_systemic, beta_individual, payout, loading_factor, min_premium = premium_terms
+    p_systemic = calculate_p_systemic(systematic_risk, beta_systemic)
+    p_individual_systemic = calculate_p_individual_systemic(idiosyncratic_risk, beta_individual)
+    p_claim = calculate_p_claim(p_systemic, p_individual_systemic)
+    expected_loss = calculate_expected_loss(p_claim, payout)
+    return calculate_monthly_premium_batch(expected_loss, loading_factor, min_premium)
+
+def _grid(stop, step):
+    """
+    Evenly spaced points from 0 to stop inclusive, with the step rounded so the grid ends exactly at stop.
+    Points are computed as i * stop / n, so integer grids are exact.
+    """
+    n_steps = max(int(round(stop / step)), 1) if stop else 0
+    if n_steps == 0:
+        return np.zeros(1)
+    return np.arange(n_steps + 1) * stop / n_steps
+
+def _tidy_frame(x_column, x, columns, group_column=None, groups=None):
+    """
+    Builds a tidy DataFrame from (n_groups, n_points) result arrays; one row per (group, point).
+    """
+    import pandas as pd # deferred so the pricing helpers above import without pandas
+    with profile_stage('DataFrame construction'):
+        if group_column is None:
+            return pd.DataFrame({x_column: x, **{name: values[0] for name, values in columns.items()}})
+        return pd.DataFrame({
+            group_column: np.repeat(np.asarray(groups, dtype=object), len(x)),
+            x_column: np.tile(x, len(groups)),
+            **{name: values.ravel() for name, values in columns.items()},
+        })
+
+def transition_curve(ttv, current_h_base, target_h_base, mecon, iai, w_econ, w_inno,
+                     idiosyncratic_risk, premium_terms, step=1.0):
+    """
+    Systematic Risk and Monthly Premium over the TTV period, computed for all points in one pass.
+    target_h_base is a single H_base, or a dict {target career: H_base} to generate one curve per
+    target. step is the month resolution (e.g. 1/30 for daily points).
+    Returns a DataFrame with columns 'Months Elapsed', 'Systematic Risk', 'Monthly Premium',
+    plus 'Target Career' when several targets are given.
+    """
+    months = _grid(ttv, step)
+    multiple = isinstance(target_h_base, dict)
+    targets = np.asarray(list(target_h_base.values()) if multiple else [target_h_base], dtype=np.float64)
+
+    h_base_at_k = calculate_h_base_ttv_batch(months[None, :], ttv, current_h_base, targets[:, None])
+    sys_risk = calculate_systematic_risk(h_base_at_k, mecon, iai, w_econ, w_inno)
+
+    # Assuming Idiosyncratic Risk remains constant or changes due to fixed skill gain for this plot
+    # For a dynamic Idiosyncratic Risk over transition, we'd need more complex skill progression modeling
+    monthly_premium = premium_from_risks(sys_risk, idiosyncratic_risk, premium_terms)
+
+    columns = {'Systematic Risk': sys_risk, 'Monthly Premium': monthly_premium}
+    if multiple:
+        return _tidy_frame('Months Elapsed', months, columns, TARGET_COLUMN, list(target_h_base))
+    return _tidy_frame('Months Elapsed', months, columns)
+
+def skill_curve(fhc, fcr, spec_skill_progress, gamma_gen, gamma_spec, w_cr, w_us,
+                systematic_risk, premium_terms, step=0.05):
+    """
+    Idiosyncratic Risk and Monthly Premium as general skill progress goes from 0% to 100%,
+    holding firm-specific skill progress constant, computed for all points in one pass.
+    spec_skill_progress is a single value or a sequence of values to generate one curve per skill mix.
+    step is the general-progress resolution (e.g. 0.001 for 0.1% steps).
+    Returns a DataFrame with columns 'Skill Progress', 'Idiosyncratic Risk', 'Monthly Premium',
+    plus 'Firm-Specific Skill Progress' when several skill mixes are given.
+    """
+    progress = _grid(1.0, step)
+    multiple = np.ndim(spec_skill_progress) > 0
+    spec = np.atleast_1d(np.asarray(spec_skill_progress, dtype=np.float64))
+
+    fus = calculate_fus(progress[None, :], spec[:, None], gamma_gen, gamma_spec)
+    idiosyncratic_risk = calculate_idiosyncratic_risk_batch(fhc, fcr, fus, w_cr, w_us)
+    monthly_premium = premium_from_risks(systematic_risk, idiosyncratic_risk, premium_terms)
+
+    columns = {'Idiosyncratic Risk': idiosyncratic_risk, 'Monthly Premium': monthly_premium}
+    if multiple:
+        return _tidy_frame('Skill Progress', progress, columns, SKILL_MIX_COLUMN, list(spec))
+    return _tidy_frame('Skill Progress', progress, columns)
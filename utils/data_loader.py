@@ -1,9 +1,11 @@
-
-import pandas as pd
-
-def load_synthetic_data():
+def load_synthetic_data(occupation_catalog=None, cache_dir=None, live_catalog=None):
     """
     Loads all pre-defined synthetic datasets into appropriate Python data structures.
+    If occupation_catalog is a CSV/Parquet path, occupations_data is loaded from that catalog
+    instead (see utils.occupation_catalog; the binary cache goes to cache_dir or next to the
+    file), and the loaded catalog (its search index is built on the first search) is returned
+    under 'occupation_catalog'. live_catalog is a catalog from an earlier call with the same
+    path; it is reused if the file is unchanged and refreshed incrementally otherwise.
     """
     occupations_data = {
         'Data Entry Clerk': {'H_base': 65, 'f_role': 1.35},
@@ -70,7 +72,13 @@ def load_synthetic_data():
         'TTV_DEFAULT': 12, # Default Time-to-Value period in months
     }
 
-    return {
+    catalog = None
+    if occupation_catalog is not None:
+        from utils.occupation_catalog import load_occupation_catalog, catalog_to_dict # needs pandas
+        catalog = load_occupation_catalog(occupation_catalog, cache_dir, catalog=live_catalog)
+        occupations_data = catalog_to_dict(catalog)
+
+    data = {
         'occupations_data': occupations_data,
         'education_data': education_data,
         'education_field_data': education_field_data,
@@ -78,3 +86,6 @@ def load_synthetic_data():
         'company_type_data': company_type_data,
         'actuarial_parameters': actuarial_parameters
     }
+    if catalog is not None:
+        data['occupation_catalog'] = catalog
+    return data
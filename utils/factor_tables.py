@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+# Factor columns held by each table of load_synthetic_data().
+FACTOR_TABLES = {
+    'occupations_data': ['H_base', 'f_role'],
+    'education_data': ['f_level'],
+    'education_field_data': ['f_field'],
+    'school_tier_data': ['f_school'],
+    'company_type_data': ['F_CR'],
+}
+
+def build_factor_tables(data):
+    """
+    Converts the nested dict factor tables from load_synthetic_data() into integer-coded tables.
+    Each table maps category names to contiguous codes 0..n-1 (in dict order) and holds one
+    float64 array per factor, so joining a profile column is a single gather by code:
+      {'names': array of names, 'codes': {name: code}, 'factors': {factor: float64 array}}
+    """
+    tables = {}
+    for table, factors in FACTOR_TABLES.items():
+        names = list(data[table])
+        tables[table] = {
+            'names': np.array(names, dtype=object),
+            'codes': {name: code for code, name in enumerate(names)},
+            'factors': {
+                factor: np.array([data[table][name][factor] for name in names], dtype=np.float64)
+                for factor in factors
+            },
+        }
+    return tables
+
+def factor_tables_to_dict(tables):
+    """
+    Converts integer-coded tables back into the nested dict format of load_synthetic_data().
+    Factor values come back as floats.
+    """
+    return {
+        table: {
+            name: {factor: float(values[code]) for factor, values in encoded['factors'].items()}
+            for code, name in enumerate(encoded['names'])
+        }
+        for table, encoded in tables.items()
+    }
+
+def encode_categories(table, values, column='value'):
+    """
+    Vectorized name -> code encoding of an array-like of category names against one table.
+    Raises ValueError listing (up to five of) the names the table does not contain.
+    """
+    # Look up each distinct value once; missing values (label -1) pick the appended -1.
+    labels, uniques = pd.factorize(values)
+    codes = np.append(pd.Index(table['names']).get_indexer(uniques), -1)[labels]
+    if (codes < 0).any():
+        unknown = sorted({str(value) for value in np.asarray(values, dtype=object)[codes < 0]})
+        raise ValueError(f"Unknown {column} values in input: {unknown[:5]}")
+    return codes
+
+def gather_factors(table, factor, codes):
+    """
+    Vectorized gather of one factor by category code.
+    """
+    return np.take(table['factors'][factor], codes)
@@ -0,0 +1,235 @@
+"""
+Fused premium kernel: P_monthly for a batch of profiles without a full-size temporary per stage.
+
+price_profiles allocates one array per formula (f_exp, FHC, FUS, V_raw, the clamp, H_base(k),
+H_i, P_systemic, P_individual, P_claim, E[Loss], P_monthly), so at 10M+ rows it is bound by
+memory traffic rather than arithmetic. price_premiums_fused computes the same chain
+  - with numba (optional) in one compiled pass per row, in parallel, or
+  - with NumPy in cache-sized blocks of rows through three reusable scratch buffers and out=
+    ufuncs, so each input column is read once and only the premium column is written.
+Both evaluate every formula in the same order as utils/risk_calculator.py, so results are
+bit-for-bit identical to price_profiles(...)['P_monthly'].
+
+    premiums = price_premiums_fused(profiles, params, mecon=1.1, iai=1.2)
+    price_premiums_fused(profiles, params, out=premiums)            # reuse the output buffer
+"""
+import numpy as np
+from utils.batch_pricing import _column
+from utils.risk_calculator import FCR_WEIGHTS
+
+# Rows per NumPy block: three float64 scratch buffers of this length stay in L2 cache.
+DEFAULT_BLOCK_SIZE = 1 << 15
+
+ENGINES = ['auto', 'numba', 'numpy']
+
+def _make_premium_kernel(row_range):
+    """
+    The per-row kernel looping with row_range: range for the plain-Python reference, numba.prange
+    for the compiled kernel (see _load_jit_kernel).
+    """
+    def premium_kernel(f_role, f_level, f_field, f_school, years, f_cr, s_senti, s_fin, s_growth, p_gen, p_spec,
+                       h_base, h_target, months, salary, mecon, iai, constants, has_fcr, has_transition, out):
+        gamma_gen, gamma_spec, w_cr, w_us = constants[0], constants[1], constants[2], constants[3]
+        ttv, w_econ, w_inno, duration, coverage = constants[4], constants[5], constants[6], constants[7], constants[8]
+        beta_systemic, beta_individual, loading, min_premium = constants[9], constants[10], constants[11], constants[12]
+        w_senti, w_fin, w_growth = constants[13], constants[14], constants[15]
+        for i in row_range(len(out)):
+            fexp = 1 - (0.015 * min(years[i], 20.0))
+            fhc = f_role[i] * f_level[i] * f_field[i] * f_school[i] * fexp
+            if has_fcr:
+                fcr = f_cr[i]
+            else:
+                fcr = w_senti * s_senti[i] + w_fin * s_fin[i] + w_growth * s_growth[i]
+            fus = 1 - (gamma_gen * p_gen[i] + gamma_spec * p_spec[i])
+            v_i = min(100.0, max(5.0, fhc * (w_cr * fcr + w_us * fus) * 50.0))
+            h_base_t = h_base[i]
+            if has_transition:
+                if ttv == 0 or months[i] >= ttv:
+                    h_base_t = h_target[i]
+                else:
+                    ratio = months[i] / ttv
+                    h_base_t = (1 - ratio) * h_base[i] + ratio * h_target[i]
+            h_i = h_base_t * (w_econ * mecon[i] + w_inno * iai[i])
+            payout = (salary[i] / 12) * duration * coverage
+            expected_loss = ((h_i / 100) * beta_systemic) * ((v_i / 100) * beta_individual) * payout
+            out[i] = max((expected_loss * loading) / 12, min_premium)
+    return premium_kernel
+
+# One pass per row over the whole chain. Plain Python (slow, but usable as a reference);
+# _load_jit_kernel compiles the same source with numba.
+_premium_kernel = _make_premium_kernel(range)
+
+_jit_state = {}
+
+def _load_jit_kernel():
+    """
+    Compiles the premium kernel with numba (parallel over rows) on first use; returns None when
+    numba is not installed.
+    """
+    if 'kernel' in _jit_state:
+        return _jit_state['kernel']
+    try:
+        import numba
+    except ImportError:
+        _jit_state['kernel'] = None
+        return None
+    _jit_state['kernel'] = numba.njit(parallel=True, cache=True)(_make_premium_kernel(numba.prange))
+    return _jit_state['kernel']
+
+def jit_available():
+    return _load_jit_kernel() is not None
+
+def _columns(profiles, n_rows, actuarial_params):
+    """
+    Kernel inputs as float64 arrays of n_rows; absent optional columns become zero-stride views.
+    """
+    def column(name, default=None):
+        return np.broadcast_to(_column(profiles, name, default), n_rows)
+
+    has_fcr = 'f_cr' in profiles
+    has_transition = 'h_target' in profiles
+    return {
+        'f_role': column('f_role'),
+        'f_level': column('f_level'),
+        'f_field': column('f_field'),
+        'f_school': column('f_school'),
+        'years': column('years_experience'),
+        'f_cr': column('f_cr', 0.0),
+        's_senti': column('s_senti', 0.0 if has_fcr else None),
+        's_fin': column('s_fin', 0.0 if has_fcr else None),
+        's_growth': column('s_growth', 0.0 if has_fcr else None),
+        'p_gen': column('p_gen', 0.0),
+        'p_spec': column('p_spec', 0.0),
+        'h_base': column('h_base'),
+        'h_target': column('h_target', 0.0),
+        'months': column('transition_month', 0.0),
+        'salary': column('annual_salary', float(actuarial_params['Annual Salary'])),
+    }, has_fcr, has_transition
+
+def _numpy_blocks(cols, params, mecon, iai, has_fcr, has_transition, out, block_size):
+    """
+    Blocked NumPy evaluation of the chain; a, b and c are the only scratch buffers.
+    """
+    block_size = max(1, min(block_size, len(out)))
+    a = np.empty(block_size)
+    b = np.empty(block_size)
+    c = np.empty(block_size)
+    ttv = float(params['TTV_DEFAULT'])
+    for start in range(0, len(out), block_size):
+        stop = min(start + block_size, len(out))
+        n = stop - start
+        a_, b_, c_ = a[:n], b[:n], c[:n]
+        col = {name: values[start:stop] for name, values in cols.items()}
+
+        # FHC = f_role * f_level * f_field * f_school * f_exp  ->  b
+        np.minimum(col['years'], 20, out=a_)
+        np.multiply(0.015, a_, out=a_)
+        np.subtract(1, a_, out=a_)
+        np.multiply(col['f_role'], col['f_level'], out=b_)
+        b_ *= col['f_field']
+        b_ *= col['f_school']
+        b_ *= a_
+        # w_CR * FCR  ->  c
+        if has_fcr:
+            np.multiply(params['W_CR'], col['f_cr'], out=c_)
+        else:
+            np.multiply(FCR_WEIGHTS[0], col['s_senti'], out=c_)
+            np.multiply(FCR_WEIGHTS[1], col['s_fin'], out=a_)
+            c_ += a_
+            np.multiply(FCR_WEIGHTS[2], col['s_growth'], out=a_)
+            c_ += a_
+            np.multiply(params['W_CR'], c_, out=c_)
+        # w_US * FUS  ->  a
+        np.multiply(params['GAMMA_GEN'], col['p_gen'], out=a_)
+        np.multiply(params['GAMMA_SPEC'], col['p_spec'], out=out[start:stop])
+        a_ += out[start:stop]
+        np.subtract(1, a_, out=a_)
+        np.multiply(params['W_US'], a_, out=a_)
+        # V_i = clamp(FHC * (w_CR * FCR + w_US * FUS) * 50)  ->  b; P_individual  ->  b
+        c_ += a_
+        b_ *= c_
+        b_ *= 50.0
+        np.maximum(5.0, b_, out=b_)
+        np.minimum(100.0, b_, out=b_)
+        b_ /= 100
+        b_ *= params['Beta Individual']
+
+        # H_base(k)  ->  a
+        if has_transition:
+            if ttv == 0:
+                a_[:] = col['h_target']
+            else:
+                np.divide(col['months'], ttv, out=c_)
+                np.subtract(1, c_, out=a_)
+                a_ *= col['h_base']
+                c_ *= col['h_target']
+                a_ += c_
+                np.copyto(a_, col['h_target'], where=col['months'] >= ttv)
+        else:
+            a_[:] = col['h_base']
+        # H_i = H_base(k) * (w_econ * M_econ + w_inno * I_AI); P_systemic  ->  a
+        if np.ndim(mecon) == 0 and np.ndim(iai) == 0:
+            a_ *= params['W_ECON'] * mecon + params['W_INNO'] * iai
+        else:
+            m = np.broadcast_to(mecon, len(out))[start:stop]
+            i = np.broadcast_to(iai, len(out))[start:stop]
+            np.multiply(params['W_ECON'], m, out=c_)
+            np.multiply(params['W_INNO'], i, out=out[start:stop])
+            c_ += out[start:stop]
+            a_ *= c_
+        a_ /= 100
+        a_ *= params['Beta Systemic']
+
+        # E[Loss] = P_claim * L_payout; P_monthly = max(E[Loss] * lambda / 12, P_min)
+        a_ *= b_
+        np.divide(col['salary'], 12, out=c_)
+        c_ *= params['Coverage Duration']
+        c_ *= params['Coverage Percentage']
+        a_ *= c_
+        a_ *= params['Loading Factor']
+        a_ /= 12
+        np.maximum(a_, params['Minimum Monthly Premium'], out=out[start:stop])
+    return out
+
+def price_premiums_fused(profiles, actuarial_params, mecon=1.0, iai=1.0, out=None, engine='auto',
+                         block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Monthly premiums of a batch of profiles (same columns and parameters as price_profiles),
+    identical to price_profiles(profiles, actuarial_params, mecon, iai)['P_monthly'].
+    mecon and iai may be scalars or arrays broadcastable against the rows. out is an optional
+    float64 array of n_rows to write into. engine is 'numba' (raises ImportError when numba is
+    missing), 'numpy', or 'auto' (numba when installed).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}.")
+    params = actuarial_params
+    n_rows = len(profiles['h_base'])
+    cols, has_fcr, has_transition = _columns(profiles, n_rows, params)
+    if out is None:
+        out = np.empty(n_rows)
+    elif out.shape != (n_rows,) or out.dtype != np.float64:
+        raise ValueError(f"out must be a float64 array of shape ({n_rows},).")
+
+    kernel = None if engine == 'numpy' else _load_jit_kernel()
+    if kernel is None:
+        if engine == 'numba':
+            raise ImportError("The JIT engine requires numba (pip install numba).")
+        return _numpy_blocks(cols, params, mecon, iai, has_fcr, has_transition, out, block_size)
+
+    kernel(*cols.values(),
+           np.broadcast_to(np.asarray(mecon, dtype=np.float64), n_rows),
+           np.broadcast_to(np.asarray(iai, dtype=np.float64), n_rows),
+           kernel_constants(params), has_fcr, has_transition, out)
+    return out
+
+def kernel_constants(actuarial_params):
+    """
+    The actuarial parameters in the order _premium_kernel reads them, then the F_CR weights.
+    """
+    params = actuarial_params
+    return np.array([
+        params['GAMMA_GEN'], params['GAMMA_SPEC'], params['W_CR'], params['W_US'], params['TTV_DEFAULT'],
+        params['W_ECON'], params['W_INNO'], params['Coverage Duration'], params['Coverage Percentage'],
+        params['Beta Systemic'], params['Beta Individual'], params['Loading Factor'],
+        params['Minimum Monthly Premium'], *FCR_WEIGHTS,
+    ], dtype=np.float64)
@@ -0,0 +1,115 @@
+"""
+Inverse pricing: the skill progress or transition month that brings a client's monthly premium
+down to a target, for arrays of clients at once.
+
+Above the minimum premium the premium is c * H_i * V_i, linear in each risk, so the required
+V_i (or H_base) is the current value scaled by target / current premium. That is then inverted
+in closed form through the V_i clamp to [5, 100] and calculate_fus, or through the linear
+H_base(k) interpolation of calculate_h_base_ttv.
+
+Every solver returns a dict of arrays with a 'status' per client (see SOLVER_STATUS):
+  'met'                    the current premium is already at or under the target;
+  'solved'                 the returned value reaches the target exactly;
+  'below_minimum_premium'  the target is under P_min, which no plan can reach;
+  'unreachable'            even full progress (or completing the transition) is not enough.
+"""
+import numpy as np
+from utils.risk_calculator import (
+    calculate_fus, calculate_idiosyncratic_risk_batch, calculate_systematic_risk,
+    calculate_payout_amount, calculate_p_systemic, calculate_p_individual_systemic,
+    calculate_p_claim, calculate_expected_loss, calculate_monthly_premium_batch
+)
+
+SOLVER_STATUS = ['met', 'solved', 'below_minimum_premium', 'unreachable']
+
+# Bounds of the V_i(t) clamp in calculate_idiosyncratic_risk.
+V_MIN, V_MAX = 5.0, 100.0
+
+def _unfloored_premium(h_i, v_i, params, annual_salary):
+    """
+    E[Loss] * loading / 12, i.e. the premium before the P_min floor.
+    """
+    salary = params['Annual Salary'] if annual_salary is None else annual_salary
+    payout = calculate_payout_amount(salary, params['Coverage Duration'], params['Coverage Percentage'])
+    p_claim = calculate_p_claim(
+        calculate_p_systemic(h_i, params['Beta Systemic']),
+        calculate_p_individual_systemic(v_i, params['Beta Individual'])
+    )
+    return calculate_monthly_premium_batch(calculate_expected_loss(p_claim, payout), params['Loading Factor'], 0.0)
+
+def _status(met, below_floor, reachable):
+    codes = np.where(below_floor, 2, np.where(met, 0, np.where(reachable, 1, 3)))
+    return np.array(SOLVER_STATUS, dtype=object)[codes]
+
+def required_skill_progress(target_premium, fhc, fcr, h_base, p_gen, p_spec, actuarial_params,
+                            mecon=1.0, iai=1.0, annual_salary=None, skill='general'):
+    """
+    Smallest progress in one skill ('general' or 'firm_specific'), holding the other fixed, at
+    which the monthly premium is at most target_premium. h_base is the client's current
+    H_base(k). All inputs broadcast against each other.
+    Returns {'progress': required P_gen or P_spec (current value when 'met', NaN when not
+    solvable), 'premium': current premium, 'status': SOLVER_STATUS labels}.
+    """
+    params = actuarial_params
+    if skill not in ('general', 'firm_specific'):
+        raise ValueError("skill must be 'general' or 'firm_specific'.")
+    target = np.asarray(target_premium, dtype=np.float64)
+    p_gen = np.asarray(p_gen, dtype=np.float64)
+    p_spec = np.asarray(p_spec, dtype=np.float64)
+    h_i = calculate_systematic_risk(h_base, mecon, iai, params['W_ECON'], params['W_INNO'])
+    fus = calculate_fus(p_gen, p_spec, params['GAMMA_GEN'], params['GAMMA_SPEC'])
+    v_i = calculate_idiosyncratic_risk_batch(fhc, fcr, fus, params['W_CR'], params['W_US'])
+    unfloored = _unfloored_premium(h_i, v_i, params, annual_salary)
+    min_premium = params['Minimum Monthly Premium']
+
+    # Required V_i, then the FUS that yields it: 50 * FHC * (W_CR * FCR + W_US * FUS) = V.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_required = v_i * target / unfloored
+        fus_required = (v_required / (50.0 * fhc) - params['W_CR'] * fcr) / params['W_US']
+        if skill == 'general':
+            current = p_gen
+            progress = (1 - fus_required - params['GAMMA_SPEC'] * p_spec) / params['GAMMA_GEN']
+        else:
+            current = p_spec
+            progress = (1 - fus_required - params['GAMMA_GEN'] * p_gen) / params['GAMMA_SPEC']
+
+    below_floor = target < min_premium
+    met = ~below_floor & (unfloored <= target)
+    # Inside the clamp, lowering V_i below 5 is impossible; above 100 the linear inverse still
+    # applies because any required V_i < 100 lies in the linear region.
+    reachable = (v_required >= V_MIN) & (progress <= 1.0)
+    status = _status(met, below_floor, reachable)
+    progress = np.where(met, current, np.where(status == 'solved', np.maximum(progress, current), np.nan))
+    return {'progress': progress, 'premium': np.maximum(unfloored, min_premium), 'status': status}
+
+def required_transition_month(target_premium, fhc, fcr, current_h_base, target_h_base, p_gen, p_spec,
+                              actuarial_params, mecon=1.0, iai=1.0, annual_salary=None, ttv=None):
+    """
+    Earliest (fractional) month k of a transition from current_h_base to target_h_base at which
+    the monthly premium is at most target_premium; round up for whole months. ttv defaults to
+    actuarial_params['TTV_DEFAULT']. All inputs broadcast against each other.
+    Returns {'month': k (0 when 'met', NaN when not solvable), 'premium': current premium,
+    'status': SOLVER_STATUS labels}.
+    """
+    params = actuarial_params
+    ttv = params['TTV_DEFAULT'] if ttv is None else ttv
+    target = np.asarray(target_premium, dtype=np.float64)
+    current_h_base = np.asarray(current_h_base, dtype=np.float64)
+    target_h_base = np.asarray(target_h_base, dtype=np.float64)
+    fus = calculate_fus(p_gen, p_spec, params['GAMMA_GEN'], params['GAMMA_SPEC'])
+    v_i = calculate_idiosyncratic_risk_batch(fhc, fcr, fus, params['W_CR'], params['W_US'])
+    h_i = calculate_systematic_risk(current_h_base, mecon, iai, params['W_ECON'], params['W_INNO'])
+    unfloored = _unfloored_premium(h_i, v_i, params, annual_salary)
+    min_premium = params['Minimum Monthly Premium']
+
+    # Required H_base(k), then k from H_base(k) = H_current + (H_target - H_current) * k / TTV.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h_required = current_h_base * target / unfloored
+        month = ttv * (current_h_base - h_required) / (current_h_base - target_h_base)
+
+    below_floor = target < min_premium
+    met = ~below_floor & (unfloored <= target)
+    reachable = (target_h_base < current_h_base) & (h_required >= target_h_base)
+    status = _status(met, below_floor, reachable)
+    month = np.where(met, 0.0, np.where(status == 'solved', np.clip(month, 0.0, ttv), np.nan))
+    return {'month': month, 'premium': np.maximum(unfloored, min_premium), 'status': status}
@@ -0,0 +1,89 @@
+import numpy as np
+from utils.risk_calculator import (
+    calculate_p_systemic, calculate_p_individual_systemic, calculate_p_claim, calculate_expected_loss
+)
+
+# Upper bound on simulated (portfolio-year x policy) cells held in memory per chunk.
+DEFAULT_MAX_CELLS = 1 << 24
+
+DEFAULT_CONFIDENCE_LEVELS = (0.95, 0.99, 0.995)
+
+def _simulate_chunk(rng, n_years, group_blocks, p_systemic, p_individual, payout):
+    """
+    Simulates the annual portfolio loss for n_years portfolio-years.
+    Every systemic-shock group draws one uniform per year; a policy is hit by the shock when that
+    uniform falls below its P_systemic, so policies in a group share shocks while keeping their own
+    marginal probability. Only shocked years draw the conditional individual job losses, one block
+    of the group's policies (a slice in group_blocks[g]) at a time.
+    """
+    losses = np.zeros(n_years)
+    shocks = rng.random((n_years, len(group_blocks)))
+    for g, blocks in enumerate(group_blocks):
+        for rows in blocks:
+            p_sys = p_systemic[rows]
+            shocked_years = np.nonzero(shocks[:, g] < p_sys.max())[0]
+            if len(shocked_years) == 0:
+                continue
+            hit = shocks[shocked_years, g][:, None] < p_sys[None, :]
+            hit &= rng.random((len(shocked_years), len(p_sys))) < p_individual[rows][None, :]
+            losses[shocked_years] += hit @ payout[rows]
+    return losses
+
+def simulate_portfolio_losses(h_i, v_i, payout, beta_systemic, beta_individual, groups=None,
+                              n_years=1_000_000, seed=0, confidence_levels=DEFAULT_CONFIDENCE_LEVELS,
+                              bins=100, max_cells=DEFAULT_MAX_CELLS):
+    """
+    Monte Carlo simulation of the annual loss distribution of a whole portfolio.
+    h_i, v_i and payout are per-policy arrays (e.g. the 'H_i' and 'V_i' outputs of price_profiles and
+    calculate_payout_amount); P_systemic and P_individual|systemic come from the risk_calculator functions.
+    groups assigns each policy to a systemic-shock group (e.g. occupation codes); None means one
+    market-wide shock. Portfolio-years are simulated in chunks of at most max_cells policy draws,
+    each seeded from (seed, chunk index), so results are reproducible for a given seed and max_cells;
+    a portfolio of more than max_cells policies is simulated one year at a time in policy blocks.
+    Returns a dict with the mean loss, its standard error, the analytic E[Loss] for comparison,
+    VaR/TVaR per confidence level and a loss histogram.
+    """
+    h_i = np.asarray(h_i, dtype=np.float64)
+    v_i = np.asarray(v_i, dtype=np.float64)
+    n_policies = len(h_i)
+    payout = np.broadcast_to(np.asarray(payout, dtype=np.float64), n_policies)
+    p_systemic = calculate_p_systemic(h_i, beta_systemic)
+    p_individual = calculate_p_individual_systemic(v_i, beta_individual)
+
+    # Sort policies by group once so each group is a contiguous slice.
+    groups = np.zeros(n_policies, dtype=np.int64) if groups is None else np.asarray(groups)
+    order = np.argsort(groups, kind='stable')
+    p_systemic, p_individual, payout = p_systemic[order], p_individual[order], payout[order]
+    _, starts = np.unique(groups[order], return_index=True)
+    bounds = np.append(starts, n_policies)
+
+    chunk_years = max(1, max_cells // max(n_policies, 1))
+    block = max(1, max_cells // chunk_years)
+    group_blocks = [
+        [slice(start, min(start + block, bounds[g + 1])) for start in range(bounds[g], bounds[g + 1], block)]
+        for g in range(len(starts))
+    ]
+    losses = np.empty(n_years)
+    for chunk_index, start in enumerate(range(0, n_years, chunk_years)):
+        stop = min(start + chunk_years, n_years)
+        rng = np.random.default_rng([seed, chunk_index])
+        losses[start:stop] = _simulate_chunk(
+            rng, stop - start, group_blocks, p_systemic, p_individual, payout
+        )
+
+    var = {}
+    tvar = {}
+    for level in confidence_levels:
+        var[level] = float(np.quantile(losses, level))
+        tvar[level] = float(losses[losses >= var[level]].mean())
+    counts, edges = np.histogram(losses, bins=bins)
+
+    return {
+        'n_years': n_years,
+        'mean_loss': float(losses.mean()),
+        'std_error': float(losses.std(ddof=1) / np.sqrt(n_years)) if n_years > 1 else float('nan'),
+        'expected_loss': float(calculate_expected_loss(calculate_p_claim(p_systemic, p_individual), payout).sum()),
+        'var': var,
+        'tvar': tvar,
+        'histogram': {'counts': counts, 'bin_edges': edges},
+    }
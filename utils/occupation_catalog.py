@@ -0,0 +1,333 @@
+"""
+Occupation catalog ingestion: load, validate and cache a CSV/Parquet catalog of occupations
+with their hazard factors, and search it by prefix or approximate name.
+
+The catalog file needs the columns 'Occupation', 'H_base' and 'f_role'. It is cached next to
+the source (or in cache_dir) as an uncompressed .npz of the validated columns; the cache is
+reused as long as the source file's size and modification time match. When the source has
+changed, only rows whose content hash differs from the cached rows are revalidated. The search
+index is built on the first search (loading from the cache never builds it), and a refresh
+patches an existing index for added and removed names only; pass the live catalog back in to
+keep its index across a reload of a changed file.
+
+    catalog = load_occupation_catalog('occupations.csv')
+    catalog = load_occupation_catalog('occupations.csv', catalog=catalog) # after the file changed
+    search_occupations(catalog, 'softw dev')   # ['Software Developer', ...]
+    occupations_data = catalog_to_dict(catalog) # same format as load_synthetic_data()
+"""
+import os
+import numpy as np
+import pandas as pd
+
+CATALOG_COLUMNS = ['Occupation', 'H_base', 'f_role']
+
+CACHE_VERSION = 1
+
+# Smallest trigram similarity (Dice coefficient) for a fuzzy match.
+DEFAULT_MIN_SIMILARITY = 0.3
+
+def _read_source(path):
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow # noqa: F401 (pandas needs it for Parquet)
+        except ImportError as exc:
+            raise ImportError("Parquet catalogs require pyarrow (pip install pyarrow).") from exc
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path)
+    missing = [column for column in CATALOG_COLUMNS if column not in frame]
+    if missing:
+        raise ValueError(f"Occupation catalog {path} is missing columns: {missing}")
+    return frame[CATALOG_COLUMNS]
+
+def _row_hashes(frame):
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+def validate_catalog_rows(frame, row_numbers=None):
+    """
+    Checks catalog rows: non-empty unique names without control characters, numeric H_base in
+    [0, 100] and positive f_role. Raises ValueError listing (up to five of) the offending rows.
+    row_numbers are the positions reported in the message (defaults to the frame index).
+    """
+    row_numbers = frame.index.to_numpy() if row_numbers is None else np.asarray(row_numbers)
+    names = frame['Occupation']
+    h_base = pd.to_numeric(frame['H_base'], errors='coerce').to_numpy(dtype=np.float64)
+    f_role = pd.to_numeric(frame['f_role'], errors='coerce').to_numpy(dtype=np.float64)
+    text = names.astype(str)
+    problems = {
+        'missing or blank Occupation': (names.isna() | (text.str.strip() == '')).to_numpy(),
+        'control characters in Occupation': text.str.contains(r'[\x00-\x1f]', regex=True).to_numpy(),
+        'H_base not a number in [0, 100]': ~((h_base >= 0) & (h_base <= 100)),
+        'f_role not a positive number': ~(f_role > 0),
+    }
+    messages = [
+        f"{problem} (rows {row_numbers[mask][:5].tolist()})" for problem, mask in problems.items() if mask.any()
+    ]
+    if messages:
+        raise ValueError("Invalid occupation catalog: " + "; ".join(messages))
+
+def _check_unique(names):
+    values, counts = np.unique(np.asarray(names, dtype=str), return_counts=True)
+    if (counts > 1).any():
+        raise ValueError(f"Invalid occupation catalog: duplicate Occupation names {values[counts > 1][:5].tolist()}")
+
+def _trigrams(name):
+    padded = f"  {name.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_search_index(names):
+    """
+    Search index over occupation names:
+      'keys'/'key_names': sorted lowercase full names and words, for prefix lookup by bisection;
+      'trigrams': {trigram: set of names} and 'trigram_counts': {name: n trigrams}, for fuzzy lookup.
+    """
+    index = {'keys': np.array([], dtype=str), 'key_names': np.array([], dtype=object),
+             'trigrams': {}, 'trigram_counts': {}}
+    _add_to_index(index, names)
+    return index
+
+def _index_pairs(names):
+    """
+    Sorted (key, name) pairs of names: the lowercase full name and every later word.
+    """
+    pairs = []
+    for name in names:
+        words = name.lower().split()
+        pairs.append((name.lower(), name))
+        pairs.extend((word, name) for word in words[1:])
+    pairs.sort()
+    return pairs
+
+def _add_to_index(index, names):
+    """
+    Adds names to an index in place. New (key, name) pairs are sorted among themselves and
+    inserted at their np.searchsorted positions, so existing keys are not re-sorted.
+    """
+    for name in names:
+        grams = _trigrams(name)
+        index['trigram_counts'][name] = len(grams)
+        for gram in grams:
+            index['trigrams'].setdefault(gram, set()).add(name)
+    pairs = _index_pairs(names)
+    if not pairs:
+        return
+    keys, key_names = index['keys'], index['key_names']
+    new_keys = np.array([key for key, _ in pairs], dtype=str)
+    new_names = np.array([name for _, name in pairs], dtype=object)
+    positions = np.searchsorted(keys, new_keys, side='left')
+    # Equal keys are ordered by name, as in a full sort of the pairs.
+    ends = np.searchsorted(keys, new_keys, side='right')
+    for i in np.nonzero(ends > positions)[0]:
+        positions[i] += np.searchsorted(key_names[positions[i]:ends[i]], new_names[i])
+    index['keys'] = np.insert(keys.astype(np.promote_types(keys.dtype, new_keys.dtype)), positions, new_keys)
+    index['key_names'] = np.insert(key_names, positions, new_names)
+
+def _remove_from_index(index, names):
+    """
+    Removes names from an index in place, locating their keys with np.searchsorted.
+    """
+    if not names:
+        return
+    keys, key_names = index['keys'], index['key_names']
+    drop = []
+    for key, name in _index_pairs(names):
+        start = np.searchsorted(keys, key, side='left')
+        stop = np.searchsorted(keys, key, side='right')
+        drop.extend(start + np.nonzero(key_names[start:stop] == name)[0])
+    index['keys'] = np.delete(keys, drop)
+    index['key_names'] = np.delete(key_names, drop)
+    for name in names:
+        del index['trigram_counts'][name]
+        for gram in _trigrams(name):
+            postings = index['trigrams'][gram]
+            postings.discard(name)
+            if not postings:
+                del index['trigrams'][gram]
+
+def search_index(catalog):
+    """
+    The catalog's search index, built on first use.
+    """
+    if catalog['index'] is None:
+        catalog['index'] = build_search_index(catalog['names'])
+    return catalog['index']
+
+def _make_catalog(names, h_base, f_role, row_hash, index=None):
+    names = list(names)
+    return {
+        'names': names,
+        'codes': {name: code for code, name in enumerate(names)},
+        'H_base': np.asarray(h_base, dtype=np.float64),
+        'f_role': np.asarray(f_role, dtype=np.float64),
+        'row_hash': np.asarray(row_hash, dtype=np.uint64),
+        'index': index,
+    }
+
+def cache_path(path, cache_dir=None):
+    directory = cache_dir or os.path.dirname(os.path.abspath(path))
+    return os.path.join(directory, os.path.basename(path) + '.catalog.npz')
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+def save_catalog_cache(catalog, path, stamp):
+    """
+    Writes the catalog columns to `path` as an uncompressed .npz. Names are stored as one
+    NUL-separated UTF-8 blob, which is both compact and fast to split back.
+    """
+    blob = np.frombuffer('\x00'.join(catalog['names']).encode('utf-8'), dtype=np.uint8)
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, stamp=stamp, names=blob, H_base=catalog['H_base'], f_role=catalog['f_role'],
+             row_hash=catalog['row_hash'])
+    os.replace(tmp_path, path)
+
+def load_catalog_cache(path):
+    """
+    Reads a cache written by save_catalog_cache; returns (catalog, stamp).
+    """
+    with np.load(path) as cached:
+        text = cached['names'].tobytes().decode('utf-8')
+        names = text.split('\x00') if text else []
+        return _make_catalog(names, cached['H_base'], cached['f_role'], cached['row_hash']), cached['stamp']
+
+def refresh_catalog(catalog, frame):
+    """
+    Applies a re-read catalog frame to an existing catalog incrementally. Rows whose content hash
+    is unchanged are reused without revalidation; changed and new rows are validated, and an
+    already built search index is patched for added and removed names (an unbuilt one stays
+    unbuilt). Row order follows the new frame.
+    Returns (catalog, stats) with stats counting 'added', 'removed', 'changed' and 'unchanged' rows.
+    """
+    hashes = _row_hashes(frame)
+    names = frame['Occupation']
+    previous_code = pd.Index(catalog['names']).get_indexer(names)
+    known = previous_code >= 0
+    same = known.copy()
+    same[known] = catalog['row_hash'][previous_code[known]] == hashes[known]
+    validate_catalog_rows(frame[~same], np.nonzero(~same)[0])
+    _check_unique(names)
+
+    new_names = names.astype(str).tolist()
+    added = names[~known].astype(str).tolist()
+    removed = sorted(set(catalog['names']) - set(new_names))
+    index = catalog['index']
+    if index is not None:
+        _remove_from_index(index, removed)
+        _add_to_index(index, added)
+    refreshed = _make_catalog(
+        new_names,
+        pd.to_numeric(frame['H_base']).to_numpy(dtype=np.float64),
+        pd.to_numeric(frame['f_role']).to_numpy(dtype=np.float64),
+        hashes, index
+    )
+    stats = {
+        'added': len(added),
+        'removed': len(removed),
+        'changed': int((known & ~same).sum()),
+        'unchanged': int(same.sum()),
+    }
+    return refreshed, stats
+
+def load_occupation_catalog(path, cache_dir=None, use_cache=True, catalog=None):
+    """
+    Loads and validates an occupation catalog (CSV, or Parquet with pyarrow) through its binary
+    cache: an up-to-date cache is read without parsing the source; a stale one is refreshed
+    incrementally (see refresh_catalog) and rewritten. The returned catalog dict holds 'names'
+    (file order), 'codes' {name: position}, float64 'H_base' and 'f_role' arrays, 'row_hash',
+    the search 'index' (None until the first search; see search_index), the source 'stamp' and
+    'load_stats' describing what was rebuilt.
+    catalog is an optional live catalog previously loaded from the same path (e.g. held by the
+    app): it is returned unchanged if the file has not changed, and otherwise refreshed from it
+    rather than from the disk cache, so a search index it has built is patched, not rebuilt.
+    """
+    stamp = _source_stamp(path)
+    cached_path = cache_path(path, cache_dir)
+    if catalog is not None and np.array_equal(catalog['stamp'], stamp):
+        catalog['load_stats'] = {'source': 'memory', 'rows': len(catalog['names'])}
+        return catalog
+    if catalog is None and use_cache and os.path.exists(cached_path):
+        catalog, cached_stamp = load_catalog_cache(cached_path)
+        if np.array_equal(cached_stamp, stamp):
+            catalog['stamp'] = stamp
+            catalog['load_stats'] = {'source': 'cache', 'rows': len(catalog['names'])}
+            return catalog
+        if cached_stamp[0] != CACHE_VERSION:
+            catalog = None
+
+    frame = _read_source(path)
+    if catalog is None:
+        validate_catalog_rows(frame)
+        _check_unique(frame['Occupation'])
+        catalog = _make_catalog(
+            [str(name) for name in frame['Occupation']],
+            pd.to_numeric(frame['H_base']).to_numpy(dtype=np.float64),
+            pd.to_numeric(frame['f_role']).to_numpy(dtype=np.float64),
+            _row_hashes(frame)
+        )
+        stats = {'source': 'full', 'rows': len(catalog['names'])}
+    else:
+        catalog, stats = refresh_catalog(catalog, frame)
+        stats.update(source='incremental', rows=len(catalog['names']))
+    if use_cache:
+        save_catalog_cache(catalog, cached_path, stamp)
+    catalog['stamp'] = stamp
+    catalog['load_stats'] = stats
+    return catalog
+
+def catalog_to_dict(catalog):
+    """
+    The catalog as an occupations_data dict: {name: {'H_base': float, 'f_role': float}}.
+    """
+    return {
+        name: {'H_base': h_base, 'f_role': f_role}
+        for name, h_base, f_role in zip(catalog['names'], catalog['H_base'].tolist(), catalog['f_role'].tolist())
+    }
+
+def search_occupations(catalog, query, limit=20, min_similarity=DEFAULT_MIN_SIMILARITY):
+    """
+    Occupation names matching `query`, best first: exact (case-insensitive) matches, then names
+    starting with the query, then names with a later word starting with it, then approximate
+    matches ranked by trigram similarity. An empty query returns the first `limit` names.
+    """
+    query = query.strip().lower()
+    if not query:
+        return catalog['names'][:limit]
+    index = search_index(catalog)
+    keys = index['keys']
+    start = np.searchsorted(keys, query, side='left')
+    stop = np.searchsorted(keys, query + '\U0010ffff', side='left')
+    results = []
+    seen = set()
+
+    def add(name):
+        if name not in seen:
+            seen.add(name)
+            results.append(name)
+
+    prefix_names = index['key_names'][start:stop]
+    full_name = np.array([name.lower() == key for name, key in zip(prefix_names, keys[start:stop])], dtype=bool)
+    for name in prefix_names[full_name]:
+        if name.lower() == query:
+            add(name)
+    for name in prefix_names[full_name]:
+        add(name)
+    for name in prefix_names[~full_name]:
+        add(name)
+    if len(results) >= limit:
+        return results[:limit]
+
+    query_grams = _trigrams(query)
+    shared = {}
+    for gram in query_grams:
+        for name in index['trigrams'].get(gram, ()):
+            shared[name] = shared.get(name, 0) + 1
+    scored = sorted(
+        ((2 * count / (len(query_grams) + index['trigram_counts'][name]), name) for name, count in shared.items()),
+        key=lambda item: (-item[0], item[1])
+    )
+    for score, name in scored:
+        if score < min_similarity or len(results) >= limit:
+            break
+        add(name)
+    return results[:limit]
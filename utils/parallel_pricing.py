@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from utils.batch_pricing import price_profiles, PROFILE_COLUMNS, RESULT_COLUMNS
+
+# Rows priced per task; large enough to amortize task dispatch, small enough to balance load.
+DEFAULT_SHARD_SIZE = 200_000
+
+# Workers start from a fork server rather than a fork of the caller: forking a process whose
+# native thread pools are running (e.g. numba's after a fused_pricing call) can deadlock.
+START_METHOD = 'forkserver'
+
+# Worker-side state, populated once per process by _init_worker.
+_worker_state = {}
+
+def _attach(name):
+    """
+    Attaches to an existing shared memory block without taking ownership of it.
+    Only the parent process unlinks the blocks, so workers must not register them for cleanup.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 has no track argument and always registers the block with the resource
+    # tracker, which can then unlink it (and report a leak) when the worker exits. Unregistering
+    # afterwards is no better: workers share the parent's tracker, so that would drop the parent's
+    # own registration. Skip the registration instead.
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def _init_worker(input_name, output_name, columns, n_rows, n_scenarios, actuarial_params):
+    """
+    Maps the shared input columns and output cube into this worker, once per process.
+    """
+    input_shm = _attach(input_name)
+    output_shm = _attach(output_name)
+    _worker_state.update(
+        input_shm=input_shm,
+        output_shm=output_shm,
+        inputs=np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=input_shm.buf),
+        outputs=np.ndarray((len(RESULT_COLUMNS), n_scenarios, n_rows), dtype=np.float64, buffer=output_shm.buf),
+        columns=columns,
+        actuarial_params=actuarial_params,
+    )
+
+def _price_shard(scenario_index, mecon, iai, start, stop):
+    """
+    Prices rows [start, stop) under one scenario and writes them into the shared output cube.
+    Each task owns a disjoint slice, so the merged result is independent of completion order.
+    """
+    inputs = _worker_state['inputs']
+    outputs = _worker_state['outputs']
+    profiles = {column: inputs[i, start:stop] for i, column in enumerate(_worker_state['columns'])}
+    priced = price_profiles(profiles, _worker_state['actuarial_params'], mecon, iai)
+    for i, column in enumerate(RESULT_COLUMNS):
+        outputs[i, scenario_index, start:stop] = priced[column]
+    return stop - start
+
+def price_profiles_parallel(profiles, actuarial_params, scenarios=((1.0, 1.0),),
+                            workers=None, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Prices a batch of profiles under several (M_econ, I_AI) scenarios on a process pool.
+    profiles takes the same columns as price_profiles. The profile columns are copied once into
+    shared memory and every worker maps them at start-up, so tasks only carry row offsets.
+    Returns a dict keyed by RESULT_COLUMNS of arrays shaped (len(scenarios), n_rows), in input order.
+    Workers are started with START_METHOD, so scripts calling this with several workers need the
+    usual `if __name__ == '__main__':` guard.
+    """
+    columns = [column for column in PROFILE_COLUMNS if column in profiles]
+    if not columns:
+        raise ValueError(f"No profile columns to price; expected columns of {PROFILE_COLUMNS}.")
+    n_rows = len(profiles[columns[0]])
+    n_scenarios = len(scenarios)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        results = [price_profiles(profiles, actuarial_params, mecon, iai) for mecon, iai in scenarios]
+        return {column: np.stack([r[column] for r in results]) for column in RESULT_COLUMNS}
+
+    itemsize = np.dtype(np.float64).itemsize
+    input_shm = shared_memory.SharedMemory(create=True, size=max(len(columns) * n_rows * itemsize, 1))
+    output_shm = shared_memory.SharedMemory(
+        create=True, size=max(len(RESULT_COLUMNS) * n_scenarios * n_rows * itemsize, 1)
+    )
+    inputs = outputs = None
+    try:
+        inputs = np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=input_shm.buf)
+        for i, column in enumerate(columns):
+            inputs[i] = profiles[column]
+        outputs = np.ndarray((len(RESULT_COLUMNS), n_scenarios, n_rows), dtype=np.float64, buffer=output_shm.buf)
+
+        init_args = (input_shm.name, output_shm.name, columns, n_rows, n_scenarios, dict(actuarial_params))
+        context = multiprocessing.get_context(START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=init_args) as pool:
+            futures = [
+                pool.submit(_price_shard, scenario_index, mecon, iai, start, min(start + shard_size, n_rows))
+                for scenario_index, (mecon, iai) in enumerate(scenarios)
+                for start in range(0, n_rows, shard_size)
+            ]
+            for future in futures:
+                future.result()
+
+        return {column: outputs[i].copy() for i, column in enumerate(RESULT_COLUMNS)}
+    finally:
+        inputs = outputs = None # Release the buffer views before closing the blocks
+        input_shm.close()
+        input_shm.unlink()
+        output_shm.close()
+        output_shm.unlink()
@@ -0,0 +1,272 @@
+"""
+Versioned actuarial parameter sets (e.g. filed, proposed and stress rates), identified by a
+content hash, with the parameter-only parts of the premium chain compiled once per version.
+
+Every formula step that involves parameters only is folded into constants (see
+compile_parameter_set):
+  V_i       = clamp(FHC * (a * FCR + b - c * P_gen - d * P_spec))   a, b, c, d from W_CR, W_US, gammas
+  H_i       = H_base(k) * (w_econ * M_econ + w_inno * I_AI)
+  P_monthly = max(H_i * V_i * L_payout * premium_scale, P_min)      scale = beta_s * beta_i * lambda / 120000
+  L_payout  = salary * payout_per_salary   (the default-salary payout precomputed)
+Compiled versions sit in an in-memory LRU cache and are persisted as JSON next to the registry,
+so switching versions or restarting a worker reads them back instead of recompiling.
+
+    store = ParameterStore('rates')
+    store.register('filed', load_synthetic_data()['actuarial_parameters'])
+    store.register('proposed', {'Loading Factor': 1.6}, base='filed')
+    diff = store.diff(profiles, 'filed', 'proposed', mecon=1.1)
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from utils.data_loader import load_synthetic_data
+from utils.batch_pricing import _column
+from utils.risk_calculator import (
+    calculate_fexp_batch, calculate_fhc, calculate_fcr, calculate_payout_amount, calculate_h_base_ttv_batch
+)
+
+# Parameters every version must define (the keys of load_synthetic_data()['actuarial_parameters']).
+PARAMETER_KEYS = list(load_synthetic_data()['actuarial_parameters'])
+
+REGISTRY_FILE = 'parameter_sets.json'
+COMPILED_DIR = 'compiled'
+
+# Layout of compile_parameter_set's output; bump it when the folded constants change so compiled
+# files written by older code are recompiled instead of read.
+COMPILE_VERSION = 1
+
+DEFAULT_CACHE_SIZE = 32
+
+def parameter_set_hash(actuarial_params):
+    """
+    Content hash of a parameter set: blake2b over the sorted keys and values as floats, so
+    90000 and 90000.0 hash alike. Returns 16 hex characters.
+    """
+    canonical = json.dumps({key: float(value) for key, value in actuarial_params.items()}, sort_keys=True)
+    return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
+def compile_parameter_set(actuarial_params):
+    """
+    Constant-folds the parameter-only parts of the chain into a flat dict of floats (see the
+    module docstring), with the parameter set's 'hash' and the 'compile_version'.
+    """
+    params = actuarial_params
+    missing = [key for key in PARAMETER_KEYS if key not in params]
+    if missing:
+        raise ValueError(f"Parameter set is missing {missing}")
+    w_us_50 = 50.0 * params['W_US']
+    return {
+        'hash': parameter_set_hash(params),
+        'compile_version': COMPILE_VERSION,
+        'v_fcr': 50.0 * params['W_CR'],
+        'v_base': w_us_50,
+        'v_gen': w_us_50 * params['GAMMA_GEN'],
+        'v_spec': w_us_50 * params['GAMMA_SPEC'],
+        'w_econ': float(params['W_ECON']),
+        'w_inno': float(params['W_INNO']),
+        'ttv': float(params['TTV_DEFAULT']),
+        'payout': float(calculate_payout_amount(
+            params['Annual Salary'], params['Coverage Duration'], params['Coverage Percentage'])),
+        'payout_per_salary': params['Coverage Duration'] * params['Coverage Percentage'] / 12,
+        'premium_scale': params['Beta Systemic'] / 100 * params['Beta Individual'] / 100 * params['Loading Factor'] / 12,
+        'min_premium': float(params['Minimum Monthly Premium']),
+    }
+
+def macro_modifier(compiled, mecon=1.0, iai=1.0):
+    """
+    The w_econ / w_inno blend w_econ * M_econ + w_inno * I_AI of a compiled version.
+    """
+    return compiled['w_econ'] * mecon + compiled['w_inno'] * iai
+
+def _book_terms(profiles):
+    """
+    Parameter-independent profile terms, computed once per book and shared across versions.
+    """
+    fhc = calculate_fhc(
+        _column(profiles, 'f_role'), _column(profiles, 'f_level'), _column(profiles, 'f_field'),
+        _column(profiles, 'f_school'), calculate_fexp_batch(_column(profiles, 'years_experience'))
+    )
+    if 'f_cr' in profiles:
+        fcr = _column(profiles, 'f_cr')
+    else:
+        fcr = calculate_fcr(_column(profiles, 's_senti'), _column(profiles, 's_fin'), _column(profiles, 's_growth'))
+    terms = {
+        'fhc': fhc,
+        'fcr': fcr,
+        'p_gen': _column(profiles, 'p_gen', 0.0),
+        'p_spec': _column(profiles, 'p_spec', 0.0),
+        'h_base': _column(profiles, 'h_base'),
+        'salary': _column(profiles, 'annual_salary') if 'annual_salary' in profiles else None,
+        'h_base_t': {},
+    }
+    if 'h_target' in profiles:
+        terms['h_target'] = _column(profiles, 'h_target')
+        terms['months'] = _column(profiles, 'transition_month', 0.0)
+    return terms
+
+def _h_base_t(terms, ttv):
+    if 'h_target' not in terms:
+        return terms['h_base']
+    if ttv not in terms['h_base_t']:
+        terms['h_base_t'][ttv] = calculate_h_base_ttv_batch(terms['months'], ttv, terms['h_base'], terms['h_target'])
+    return terms['h_base_t'][ttv]
+
+def _premiums(terms, compiled, mecon, iai):
+    c = compiled
+    v_i = c['v_fcr'] * terms['fcr'] + c['v_base']
+    v_i -= c['v_gen'] * terms['p_gen']
+    v_i -= c['v_spec'] * terms['p_spec']
+    v_i *= terms['fhc']
+    np.clip(v_i, 5.0, 100.0, out=v_i)
+    payout = c['payout'] if terms['salary'] is None else terms['salary'] * c['payout_per_salary']
+    premium = _h_base_t(terms, c['ttv']) * (macro_modifier(c, mecon, iai) * c['premium_scale'])
+    premium = premium * v_i
+    premium *= payout
+    return np.maximum(premium, c['min_premium'])
+
+def price_with_compiled(profiles, compiled, mecon=1.0, iai=1.0):
+    """
+    Monthly premiums of a book (columns as for price_profiles) under one compiled version.
+    Equal to price_profiles(...)['P_monthly'] up to floating-point rounding of the folded constants.
+    """
+    return _premiums(_book_terms(profiles), compiled, mecon, iai)
+
+def diff_premiums(profiles, compiled_a, compiled_b, mecon=1.0, iai=1.0):
+    """
+    Prices a book under two compiled versions, sharing the parameter-independent terms (FHC,
+    FCR, and H_base(k) when both use the same TTV). Returns {'premium_a', 'premium_b', 'change',
+    'relative_change'} arrays and a 'summary' of book totals and the share of policies whose
+    premium rises or falls.
+    """
+    terms = _book_terms(profiles)
+    premium_a = _premiums(terms, compiled_a, mecon, iai)
+    premium_b = _premiums(terms, compiled_b, mecon, iai)
+    change = premium_b - premium_a
+    relative = change / premium_a
+    total_a, total_b = float(premium_a.sum()), float(premium_b.sum())
+    return {
+        'premium_a': premium_a,
+        'premium_b': premium_b,
+        'change': change,
+        'relative_change': relative,
+        'summary': {
+            'policies': len(premium_a),
+            'total_premium_a': total_a,
+            'total_premium_b': total_b,
+            'total_change': total_b - total_a,
+            'relative_total_change': (total_b - total_a) / total_a if total_a else float('nan'),
+            'share_increased': float((change > 0).mean()) if len(change) else 0.0,
+            'share_decreased': float((change < 0).mean()) if len(change) else 0.0,
+            'max_increase': max(float(change.max()), 0.0) if len(change) else 0.0,
+            'max_decrease': max(float(-change.min()), 0.0) if len(change) else 0.0,
+        },
+    }
+
+def _write_json(path, payload):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+class ParameterStore:
+    """
+    Named, hashed parameter-set versions, persisted in `directory` (or in memory only when it
+    is None). Names map to a version hash; a name can only be re-pointed with replace=True.
+    Compiled versions are cached in an LRU of cache_size entries and under directory/compiled/.
+    """
+
+    def __init__(self, directory=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._versions = {}
+        self._names = {}
+        self._compiled = OrderedDict()
+        self._lock = threading.Lock()
+        self.compile_count = 0
+        if directory is not None:
+            os.makedirs(os.path.join(directory, COMPILED_DIR), exist_ok=True)
+            registry = os.path.join(directory, REGISTRY_FILE)
+            if os.path.exists(registry):
+                with open(registry) as f:
+                    saved = json.load(f)
+                self._versions = saved['versions']
+                self._names = saved['names']
+
+    def _save(self):
+        if self.directory is not None:
+            _write_json(os.path.join(self.directory, REGISTRY_FILE), {'names': self._names, 'versions': self._versions})
+
+    def register(self, name, actuarial_params, base=None, replace=False):
+        """
+        Registers `name` for a parameter set, given in full or, with base, as overrides of the
+        base version's parameters. Returns the version hash.
+        """
+        params = dict(self.parameters(base)) if base is not None else {}
+        params.update(actuarial_params)
+        unknown = sorted(set(params) - set(PARAMETER_KEYS))
+        if unknown:
+            raise ValueError(f"Unknown actuarial parameters: {unknown}")
+        compiled = compile_parameter_set(params)
+        version = compiled['hash']
+        with self._lock:
+            if name in self._names and self._names[name] != version and not replace:
+                raise ValueError(f"Parameter set '{name}' already exists with different values; pass replace=True.")
+            self._versions[version] = params
+            self._names[name] = version
+            self._save()
+        return version
+
+    def names(self):
+        return dict(self._names)
+
+    def resolve(self, version):
+        """
+        The version hash for a name or hash.
+        """
+        if version in self._names:
+            return self._names[version]
+        if version in self._versions:
+            return version
+        raise KeyError(f"Unknown parameter set '{version}'.")
+
+    def parameters(self, version):
+        return dict(self._versions[self.resolve(version)])
+
+    def compiled(self, version):
+        """
+        The compiled constants of a version: from the LRU cache, else from disk, else compiled
+        (and written to disk). A compiled file from another COMPILE_VERSION is recompiled.
+        """
+        key = self.resolve(version)
+        with self._lock:
+            if key in self._compiled:
+                self._compiled.move_to_end(key)
+                return self._compiled[key]
+        path = os.path.join(self.directory, COMPILED_DIR, f"{key}.json") if self.directory is not None else None
+        compiled = None
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                compiled = json.load(f)
+            if compiled.get('compile_version') != COMPILE_VERSION:
+                compiled = None
+        if compiled is None:
+            compiled = compile_parameter_set(self._versions[key])
+            self.compile_count += 1
+            if path is not None:
+                _write_json(path, compiled)
+        with self._lock:
+            self._compiled[key] = compiled
+            while len(self._compiled) > self.cache_size:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def price(self, profiles, version, mecon=1.0, iai=1.0):
+        return price_with_compiled(profiles, self.compiled(version), mecon, iai)
+
+    def diff(self, profiles, version_a, version_b, mecon=1.0, iai=1.0):
+        """
+        diff_premiums between two named (or hashed) versions.
+        """
+        return diff_premiums(profiles, self.compiled(version_a), self.compiled(version_b), mecon, iai)
@@ -0,0 +1,284 @@
+"""
+Synthetic policyholder population generator for load-testing the pricing pipeline.
+
+Rows are generated in fixed-size chunks and written as part-NNNNNN files (CSV or Parquet) in
+the input format of utils.bulk_scoring, so each part can be scored with score_file. Chunk i
+always holds rows [i * chunk_size, (i + 1) * chunk_size) and draws from its own generator
+seeded with (seed, i), so a chunk's content depends only on the seed, the chunk index and the
+config. The same file set comes out regardless of worker count, order or resumption.
+
+Categorical columns are sampled from configurable weights over the factor tables. The numeric
+columns are driven by correlated standard normals (a Gaussian copula) mapped through monotone
+marginals:
+  years_experience  round(mean + std * z), clipped to [min, max]
+  annual_salary     median * education multiplier * exp(sigma * z), rounded to 100
+  s_senti, s_fin, s_growth, p_gen, p_spec   logit-normal: logistic(logit(center) + spread * z),
+                    rounded to SCORE_DECIMALS
+
+Usage:
+    python -m utils.population out_dir --rows 100000000 --chunk-size 1000000 --format parquet --workers 8
+    python -m utils.bulk_scoring out_dir/part-000000.parquet scored
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.data_loader import load_synthetic_data
+from utils.bulk_scoring import part_path, write_part
+
+# Output columns, in file order.
+POPULATION_COLUMNS = [
+    'policy_id', 'occupation', 'target_occupation', 'education_level', 'education_field', 'school_tier',
+    'company_type', 'years_experience', 'annual_salary', 's_senti', 's_fin', 's_growth',
+    'p_gen', 'p_spec', 'transition_month',
+]
+
+# Categorical column -> factor table its values are drawn from.
+CATEGORY_TABLES = {
+    'occupation': 'occupations_data',
+    'education_level': 'education_data',
+    'education_field': 'education_field_data',
+    'school_tier': 'school_tier_data',
+    'company_type': 'company_type_data',
+}
+
+# Numeric columns driven by the Gaussian copula, in correlation-matrix order.
+LATENT_COLUMNS = ['years_experience', 'annual_salary', 's_senti', 's_fin', 's_growth', 'p_gen', 'p_spec']
+
+LOGIT_NORMAL_COLUMNS = ['s_senti', 's_fin', 's_growth', 'p_gen', 'p_spec']
+
+# Decimals kept for scores and skill progress (also keeps CSV parts smaller and faster to write).
+SCORE_DECIMALS = 4
+
+DEFAULT_POPULATION_CONFIG = {
+    # Relative weights per category; names not listed get weight 0, and None means uniform.
+    'category_weights': {
+        'occupation': None,
+        'education_level': {'High School': 0.30, 'Associate\'s': 0.10, 'Bachelor\'s': 0.35,
+                            'Master\'s': 0.18, 'PhD': 0.07},
+        'education_field': None,
+        'school_tier': {'Tier 1 (Ivy League/Top Research)': 0.15, 'Tier 2 (Reputable State/Private)': 0.50,
+                        'Tier 3 (Local/Community College)': 0.35},
+        'company_type': {'Big Tech/Innovative Start-up': 0.15, 'Large Established Firm (Non-Tech)': 0.25,
+                         'Mid-size Firm': 0.25, 'Small Business/Local Enterprise': 0.20,
+                         'Government/Non-Profit': 0.15},
+    },
+    'years_experience': {'mean': 12.0, 'std': 9.0, 'min': 0, 'max': 45},
+    'annual_salary': {
+        'median': 75_000.0, 'sigma': 0.35,
+        'education_multipliers': {'High School': 0.75, 'Associate\'s': 0.85, 'Bachelor\'s': 1.00,
+                                  'Master\'s': 1.15, 'PhD': 1.30},
+    },
+    's_senti': {'center': 0.70, 'spread': 0.8},
+    's_fin': {'center': 0.75, 'spread': 0.7},
+    's_growth': {'center': 0.70, 'spread': 0.8},
+    'p_gen': {'center': 0.30, 'spread': 1.2},
+    'p_spec': {'center': 0.20, 'spread': 1.2},
+    # Correlations between the latent normals of LATENT_COLUMNS; unlisted pairs are 0.
+    'correlations': {
+        ('years_experience', 'annual_salary'): 0.5,
+        ('years_experience', 'p_spec'): 0.2,
+        ('s_senti', 's_fin'): 0.4,
+        ('s_senti', 's_growth'): 0.3,
+        ('s_fin', 's_growth'): 0.3,
+        ('p_gen', 'p_spec'): 0.3,
+    },
+    # Share of policyholders in a career transition (target_occupation differs from occupation);
+    # the others get target_occupation = occupation and transition_month 0.
+    'transition_share': 0.25,
+    'max_transition_month': 24,
+}
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+def population_config(overrides=None):
+    """
+    DEFAULT_POPULATION_CONFIG updated with `overrides`; dict-valued entries (per-column settings,
+    category_weights, correlations) are merged key by key rather than replaced.
+    """
+    config = {key: dict(value) if isinstance(value, dict) else value
+              for key, value in DEFAULT_POPULATION_CONFIG.items()}
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            config[key].update(value)
+        else:
+            config[key] = value
+    return config
+
+def _category_probabilities(names, weights, column):
+    if weights is None:
+        return np.full(len(names), 1.0 / len(names))
+    unknown = sorted(set(weights) - set(names))
+    if unknown:
+        raise ValueError(f"Unknown {column} values in population config: {unknown[:5]}")
+    probabilities = np.array([weights.get(name, 0.0) for name in names], dtype=np.float64)
+    if (probabilities < 0).any() or probabilities.sum() <= 0:
+        raise ValueError(f"{column} weights must be non-negative with a positive total.")
+    return probabilities / probabilities.sum()
+
+def _correlation_factor(correlations):
+    """
+    Cholesky factor of the LATENT_COLUMNS correlation matrix built from {(a, b): rho} pairs.
+    """
+    position = {column: i for i, column in enumerate(LATENT_COLUMNS)}
+    matrix = np.eye(len(LATENT_COLUMNS))
+    for (a, b), rho in correlations.items():
+        matrix[position[a], position[b]] = matrix[position[b], position[a]] = rho
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError as exc:
+        raise ValueError("Population correlations do not form a valid correlation matrix.") from exc
+
+def compile_population_config(config=None, data=None):
+    """
+    Validates a config (see population_config) against the factor tables of `data` and
+    precomputes what generate_chunk needs: category names and cumulative probabilities, the
+    correlation factor and per-code salary multipliers. The result is small and picklable.
+    """
+    config = population_config(config)
+    data = data or load_synthetic_data()
+    categories = {}
+    for column, table in CATEGORY_TABLES.items():
+        names = np.array(list(data[table]), dtype=object)
+        probabilities = _category_probabilities(names, config['category_weights'].get(column), column)
+        categories[column] = {'names': names, 'cdf': np.cumsum(probabilities)}
+    multipliers = config['annual_salary'].get('education_multipliers') or {}
+    education_names = categories['education_level']['names']
+    return {
+        'config': config,
+        'categories': categories,
+        'cholesky': _correlation_factor(config['correlations']),
+        'salary_multipliers': np.array([multipliers.get(name, 1.0) for name in education_names], dtype=np.float64),
+    }
+
+def _sample_codes(rng, cdf, size):
+    return np.minimum(np.searchsorted(cdf, rng.random(size) * cdf[-1], side='right'), len(cdf) - 1)
+
+def _logistic(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def generate_chunk(compiled, chunk_index, chunk_size, n_rows, seed=0):
+    """
+    Rows [chunk_index * chunk_size, min((chunk_index + 1) * chunk_size, n_rows)) of the population
+    as a DataFrame with POPULATION_COLUMNS (categories as pandas Categoricals).
+    """
+    start = chunk_index * chunk_size
+    size = max(0, min(chunk_size, n_rows - start))
+    rng = np.random.default_rng([seed, chunk_index])
+    config = compiled['config']
+    categories = compiled['categories']
+
+    codes = {column: _sample_codes(rng, spec['cdf'], size) for column, spec in categories.items()}
+    latent = rng.standard_normal((size, len(LATENT_COLUMNS))) @ compiled['cholesky'].T
+    z = {column: latent[:, i] for i, column in enumerate(LATENT_COLUMNS)}
+
+    experience = config['years_experience']
+    years = np.clip(np.round(experience['mean'] + experience['std'] * z['years_experience']),
+                    experience['min'], experience['max'])
+    salary_config = config['annual_salary']
+    salary = (salary_config['median'] * compiled['salary_multipliers'][codes['education_level']]
+              * np.exp(salary_config['sigma'] * z['annual_salary']))
+    salary = np.round(salary, -2)
+
+    n_occupations = len(categories['occupation']['names'])
+    occupation = codes['occupation']
+    moving = rng.random(size) < config['transition_share'] if n_occupations > 1 else np.zeros(size, dtype=bool)
+    # A uniformly chosen other occupation for those in transition.
+    shift = 1 + rng.integers(0, max(n_occupations - 1, 1), size=size)
+    target = np.where(moving, (occupation + shift) % n_occupations, occupation)
+    months = np.where(moving, rng.integers(0, config['max_transition_month'] + 1, size=size), 0)
+
+    def categorical(column, column_codes):
+        return pd.Categorical.from_codes(column_codes, categories=categories[column]['names'])
+
+    frame = {
+        'policy_id': np.arange(start, start + size, dtype=np.int64),
+        'occupation': categorical('occupation', occupation),
+        'target_occupation': categorical('occupation', target),
+        'education_level': categorical('education_level', codes['education_level']),
+        'education_field': categorical('education_field', codes['education_field']),
+        'school_tier': categorical('school_tier', codes['school_tier']),
+        'company_type': categorical('company_type', codes['company_type']),
+        'years_experience': years,
+        'annual_salary': salary,
+    }
+    for column in LOGIT_NORMAL_COLUMNS:
+        center, spread = config[column]['center'], config[column]['spread']
+        frame[column] = np.round(_logistic(np.log(center / (1 - center)) + spread * z[column]), SCORE_DECIMALS)
+    frame['transition_month'] = months.astype(np.float64)
+    return pd.DataFrame(frame, columns=POPULATION_COLUMNS)
+
+_worker_state = {}
+
+def _init_worker(compiled):
+    _worker_state['compiled'] = compiled
+
+def _write_chunk(output_dir, output_format, chunk_index, chunk_size, n_rows, seed, compiled=None):
+    compiled = compiled or _worker_state['compiled']
+    chunk = generate_chunk(compiled, chunk_index, chunk_size, n_rows, seed)
+    write_part(chunk, output_dir, chunk_index, output_format)
+    return chunk_index, len(chunk)
+
+def generate_population(output_dir, n_rows, chunk_size=DEFAULT_CHUNK_SIZE, output_format='parquet', seed=0,
+                        config=None, data=None, workers=1, resume=False, log=sys.stderr):
+    """
+    Writes an n_rows population as part files into output_dir, one per chunk, with `workers`
+    processes (each holds one chunk at a time). With resume=True, chunks whose part file
+    already exists are skipped; since chunks are reproducible the result is the same as an
+    uninterrupted run. Returns the number of rows written in this run.
+    """
+    if output_format not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported output format '{output_format}'; use 'csv' or 'parquet'.")
+    compiled = compile_population_config(config, data)
+    os.makedirs(output_dir, exist_ok=True)
+    n_chunks = -(-n_rows // chunk_size)
+    pending = [index for index in range(n_chunks)
+               if not (resume and os.path.exists(part_path(output_dir, index, output_format)))]
+
+    total_rows = 0
+    run_start = time.perf_counter()
+    if workers <= 1:
+        results = (_write_chunk(output_dir, output_format, index, chunk_size, n_rows, seed, compiled)
+                   for index in pending)
+        for index, rows in results:
+            total_rows += rows
+            print(f"chunk {index}: {rows} rows", file=log)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(compiled,)) as pool:
+            futures = [pool.submit(_write_chunk, output_dir, output_format, index, chunk_size, n_rows, seed)
+                       for index in pending]
+            for future in futures:
+                index, rows = future.result()
+                total_rows += rows
+                print(f"chunk {index}: {rows} rows", file=log)
+
+    elapsed = time.perf_counter() - run_start
+    print(f"generated {total_rows} rows in {elapsed:.2f}s "
+          f"({total_rows / max(elapsed, 1e-9):,.0f} rows/s)", file=log)
+    return total_rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic policyholder population.")
+    parser.add_argument('output_dir', help="Directory receiving one part file per chunk.")
+    parser.add_argument('--rows', type=int, required=True, help="Number of policyholders.")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per part file.")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='parquet', help="Output file format.")
+    parser.add_argument('--seed', type=int, default=0, help="Population seed.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument('--transition-share', type=float, help="Share of policyholders in a career transition.")
+    parser.add_argument('--resume', action='store_true', help="Skip chunks whose part file already exists.")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.transition_share is not None:
+        config['transition_share'] = args.transition_share
+    generate_population(
+        args.output_dir, args.rows, chunk_size=args.chunk_size, output_format=args.format, seed=args.seed,
+        config=config, workers=args.workers, resume=args.resume
+    )
+
+if __name__ == '__main__':
+    main()
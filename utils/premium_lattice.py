@@ -0,0 +1,184 @@
+import numpy as np
+from utils.batch_pricing import price_profiles
+from utils.factor_tables import build_factor_tables
+from utils.risk_calculator import (
+    calculate_fexp_batch, calculate_fus, calculate_idiosyncratic_risk_batch, calculate_h_base_ttv,
+    calculate_systematic_risk, calculate_payout_amount, calculate_p_systemic,
+    calculate_p_individual_systemic, calculate_p_claim, calculate_expected_loss, calculate_monthly_premium
+)
+
+# Categorical lattice axes: (quote argument, factor table in load_synthetic_data()).
+CATEGORY_AXES = [
+    ('occupation', 'occupations_data'),
+    ('education_level', 'education_data'),
+    ('education_field', 'education_field_data'),
+    ('school_tier', 'school_tier_data'),
+    ('company_type', 'company_type_data'),
+]
+
+# f_exp stops changing after 20 years, so integer years 0..20 cover the experience axis exactly.
+MAX_EXPERIENCE_YEARS = 20
+
+DEFAULT_FUS_POINTS = 21
+
+# Largest v_table build_premium_lattice will allocate unless max_bytes is raised.
+DEFAULT_MAX_LATTICE_BYTES = 256 * 2**20
+
+def lattice_nbytes(data, fus_points=DEFAULT_FUS_POINTS, dtype=np.float32):
+    """
+    Size in bytes of the v_table build_premium_lattice would allocate for these factor tables:
+    distinct f_role values x levels x fields x schools x company types x 21 years x fus_points.
+    """
+    n_roles = len({row['f_role'] for row in data['occupations_data'].values()})
+    cells = n_roles * (MAX_EXPERIENCE_YEARS + 1) * fus_points
+    for _, table in CATEGORY_AXES[1:]:
+        cells *= len(data[table])
+    return cells * np.dtype(dtype).itemsize
+
+def build_premium_lattice(data, actuarial_params=None, fus_points=DEFAULT_FUS_POINTS, dtype=np.float32,
+                          max_bytes=DEFAULT_MAX_LATTICE_BYTES):
+    """
+    Precomputes the rate lattice used by quote_premium:
+      v_table[role, level, field, school, company, experience, FUS] = V_i(t)
+    An occupation enters V_i only through f_role, so occupations sharing an f_role share a row
+    ('role_codes' maps occupation code -> role row). H_base(k) is linear in the transition month,
+    so it is evaluated exactly from the H_base vector at quote time rather than tabulated per
+    (occupation, target) pair. M_econ and I_AI enter H_i linearly and the payout enters the
+    premium linearly, so they are applied exactly at quote time instead of being gridded. The
+    skill axis is FUS itself, which covers every (P_gen, P_spec) pair.
+    Memory is lattice_nbytes(data, fus_points, dtype) (about 10 MB for the built-in tables); a
+    ValueError is raised when that exceeds max_bytes.
+    """
+    nbytes = lattice_nbytes(data, fus_points, dtype)
+    if nbytes > max_bytes:
+        raise ValueError(f"Premium lattice needs {nbytes / 2**20:,.0f} MiB, more than max_bytes="
+                         f"{max_bytes / 2**20:,.0f} MiB; raise max_bytes or reduce fus_points.")
+    params = dict(data['actuarial_parameters'])
+    params.update(actuarial_params or {})
+    tables = build_factor_tables(data)
+    roles, role_codes = np.unique(tables['occupations_data']['factors']['f_role'], return_inverse=True)
+    f_level = tables['education_data']['factors']['f_level']
+    f_field = tables['education_field_data']['factors']['f_field']
+    f_school = tables['school_tier_data']['factors']['f_school']
+    f_cr = tables['company_type_data']['factors']['F_CR']
+    h_base = tables['occupations_data']['factors']['H_base']
+
+    experience_grid = np.arange(MAX_EXPERIENCE_YEARS + 1, dtype=np.float64)
+    fus_min = calculate_fus(1.0, 1.0, params['GAMMA_GEN'], params['GAMMA_SPEC'])
+    fus_grid = np.linspace(fus_min, 1.0, fus_points)
+
+    # FHC over (role, level, field, school, experience), then V_i over the remaining axes.
+    fhc = (roles[:, None, None, None, None] * f_level[None, :, None, None, None]
+           * f_field[None, None, :, None, None] * f_school[None, None, None, :, None]
+           * calculate_fexp_batch(experience_grid)[None, None, None, None, :])
+    v_table = calculate_idiosyncratic_risk_batch(
+        fhc[:, :, :, :, None, :, None],
+        f_cr[None, None, None, None, :, None, None],
+        fus_grid[None, None, None, None, None, None, :],
+        params['W_CR'], params['W_US']
+    ).astype(dtype)
+
+    return {
+        'params': params,
+        'codes': {axis: tables[table]['codes'] for axis, table in CATEGORY_AXES},
+        'role_codes': role_codes.reshape(-1),
+        'v_table': v_table,
+        'h_base': h_base,
+        'fus_min': fus_min,
+        'fus_step': (1.0 - fus_min) / (fus_points - 1),
+        'payout': calculate_payout_amount(params['Annual Salary'], params['Coverage Duration'], params['Coverage Percentage']),
+    }
+
+def _grid_position(value, step, origin, last_index):
+    """Fractional index of value on a regular grid, clamped to the grid bounds."""
+    position = (value - origin) / step if step else 0.0
+    return min(max(position, 0.0), float(last_index))
+
+def _lerp_weights(position, interpolate):
+    """Lower index, upper index and upper weight for a fractional grid position."""
+    if not interpolate:
+        nearest = int(round(position))
+        return nearest, nearest, 0.0
+    lower = int(position)
+    return lower, lower + 1 if position > lower else lower, position - lower
+
+def quote_premium(lattice, occupation, education_level, education_field, school_tier, company_type,
+                  years_experience, p_gen, p_spec, mecon=1.0, iai=1.0, target_occupation=None,
+                  transition_month=0, annual_salary=None, interpolate=True):
+    """
+    Quotes the monthly premium from a lattice built by build_premium_lattice.
+    With interpolate=True the lattice is read with bilinear interpolation over (experience, FUS)
+    and the transition month is used as given; with interpolate=False the nearest grid point
+    (and the nearest whole month) is used. Returns a dict with 'V_i', 'H_i' and 'P_monthly'.
+    """
+    params = lattice['params']
+    codes = lattice['codes']
+    occupation_code = codes['occupation'][occupation]
+    cell = lattice['v_table'][
+        lattice['role_codes'][occupation_code],
+        codes['education_level'][education_level],
+        codes['education_field'][education_field],
+        codes['school_tier'][school_tier],
+        codes['company_type'][company_type],
+    ]
+
+    n_exp, n_fus = cell.shape
+    fus = calculate_fus(p_gen, p_spec, params['GAMMA_GEN'], params['GAMMA_SPEC'])
+    e0, e1, we = _lerp_weights(_grid_position(years_experience, 1.0, 0.0, n_exp - 1), interpolate)
+    f0, f1, wf = _lerp_weights(_grid_position(fus, lattice['fus_step'], lattice['fus_min'], n_fus - 1), interpolate)
+    v_i = float(
+        (1 - we) * ((1 - wf) * cell[e0, f0] + wf * cell[e0, f1])
+        + we * ((1 - wf) * cell[e1, f0] + wf * cell[e1, f1])
+    )
+
+    target_code = occupation_code if target_occupation is None else codes['occupation'][target_occupation]
+    month = max(float(transition_month), 0.0) if interpolate else float(max(round(transition_month), 0))
+    h_base_t = calculate_h_base_ttv(month, params['TTV_DEFAULT'], lattice['h_base'][occupation_code],
+                                    lattice['h_base'][target_code])
+    h_i = calculate_systematic_risk(h_base_t, mecon, iai, params['W_ECON'], params['W_INNO'])
+
+    if annual_salary is None:
+        payout = lattice['payout']
+    else:
+        payout = calculate_payout_amount(annual_salary, params['Coverage Duration'], params['Coverage Percentage'])
+    p_claim = calculate_p_claim(
+        calculate_p_systemic(h_i, params['Beta Systemic']),
+        calculate_p_individual_systemic(v_i, params['Beta Individual'])
+    )
+    premium = calculate_monthly_premium(
+        calculate_expected_loss(p_claim, payout), params['Loading Factor'], params['Minimum Monthly Premium']
+    )
+    return {'V_i': v_i, 'H_i': h_i, 'P_monthly': premium}
+
+def lattice_error_estimate(lattice, data, n_samples=10_000, seed=0, interpolate=True):
+    """
+    Empirical accuracy check of quote_premium against the exact premium chain on n_samples random
+    off-grid profiles. Returns the largest absolute errors of V_i and P_monthly seen in the sample;
+    this is an estimate, not a guaranteed bound, and larger errors can occur off the sample.
+    """
+    params = lattice['params']
+    rng = np.random.default_rng(seed)
+    names = {axis: list(lattice['codes'][axis]) for axis, _ in CATEGORY_AXES}
+    max_v_error = 0.0
+    max_premium_error = 0.0
+    for _ in range(n_samples):
+        profile = {axis: names[axis][rng.integers(len(names[axis]))] for axis in names}
+        target = names['occupation'][rng.integers(len(names['occupation']))]
+        years, p_gen, p_spec = rng.uniform(0, 40), rng.uniform(0, 1), rng.uniform(0, 1)
+        mecon, iai = rng.uniform(0.8, 1.2, 2)
+        month = rng.uniform(0, 2 * params['TTV_DEFAULT'])
+        quote = quote_premium(lattice, years_experience=years, p_gen=p_gen, p_spec=p_spec, mecon=mecon, iai=iai,
+                              target_occupation=target, transition_month=month, interpolate=interpolate, **profile)
+        exact = price_profiles({
+            'f_role': [data['occupations_data'][profile['occupation']]['f_role']],
+            'f_level': [data['education_data'][profile['education_level']]['f_level']],
+            'f_field': [data['education_field_data'][profile['education_field']]['f_field']],
+            'f_school': [data['school_tier_data'][profile['school_tier']]['f_school']],
+            'f_cr': [data['company_type_data'][profile['company_type']]['F_CR']],
+            'years_experience': [years], 'p_gen': [p_gen], 'p_spec': [p_spec],
+            'h_base': [data['occupations_data'][profile['occupation']]['H_base']],
+            'h_target': [data['occupations_data'][target]['H_base']], 'transition_month': [month],
+        }, params, mecon, iai)
+        max_v_error = max(max_v_error, abs(quote['V_i'] - exact['V_i'][0]))
+        max_premium_error = max(max_premium_error, abs(quote['P_monthly'] - exact['P_monthly'][0]))
+    return {'max_v_error': float(max_v_error), 'max_premium_error': float(max_premium_error)}
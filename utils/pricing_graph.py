@@ -0,0 +1,155 @@
+"""
+Incremental evaluation of the pricing model as an explicit dependency graph.
+
+Every stage of the premium chain is a node with named inputs. Setting an input marks only its
+downstream nodes dirty, and evaluate() recomputes only dirty nodes needed for the requested
+outputs. Inputs may be scalars (one profile) or arrays (a batch):
+
+    graph = PricingGraph.from_profiles(book, actuarial_params, mecon=1.0, iai=1.0)
+    graph.evaluate()                 # full chain once
+    graph.set(M_econ=1.15)
+    graph.evaluate()                 # only H_i, P_systemic, P_claim, E_loss, P_monthly rerun
+    graph.last_recomputed            # ['H_i', 'P_systemic', 'P_claim', 'E_loss', 'P_monthly']
+
+Any node can also be set directly, which pins it to the given value (e.g. 'FCR' from a company
+table instead of the three company scores) until unpin() is called.
+"""
+from graphlib import TopologicalSorter
+import numpy as np
+from utils.batch_pricing import RESULT_COLUMNS
+from utils.risk_calculator import (
+    calculate_fexp_batch, calculate_fhc, calculate_fcr, calculate_fus,
+    calculate_idiosyncratic_risk_batch, calculate_h_base_ttv_batch, calculate_systematic_risk,
+    calculate_payout_amount, calculate_p_systemic, calculate_p_individual_systemic,
+    calculate_p_claim, calculate_expected_loss, calculate_monthly_premium_batch
+)
+
+def _same(value):
+    return value
+
+# node -> (function, input names). Inputs that are not nodes are leaves: profile columns,
+# the scenario values 'M_econ' and 'I_AI', and actuarial_params keys.
+PRICING_NODES = {
+    'f_exp': (calculate_fexp_batch, ['years_experience']),
+    'FHC': (calculate_fhc, ['f_role', 'f_level', 'f_field', 'f_school', 'f_exp']),
+    'FCR': (calculate_fcr, ['s_senti', 's_fin', 's_growth']),
+    'FUS': (calculate_fus, ['p_gen', 'p_spec', 'GAMMA_GEN', 'GAMMA_SPEC']),
+    'V_i': (calculate_idiosyncratic_risk_batch, ['FHC', 'FCR', 'FUS', 'W_CR', 'W_US']),
+    'h_target': (_same, ['h_base']), # no transition unless h_target is set
+    'H_base_t': (calculate_h_base_ttv_batch, ['transition_month', 'TTV_DEFAULT', 'h_base', 'h_target']),
+    'H_i': (calculate_systematic_risk, ['H_base_t', 'M_econ', 'I_AI', 'W_ECON', 'W_INNO']),
+    'annual_salary': (_same, ['Annual Salary']),
+    'L_payout': (calculate_payout_amount, ['annual_salary', 'Coverage Duration', 'Coverage Percentage']),
+    'P_systemic': (calculate_p_systemic, ['H_i', 'Beta Systemic']),
+    'P_individual': (calculate_p_individual_systemic, ['V_i', 'Beta Individual']),
+    'P_claim': (calculate_p_claim, ['P_systemic', 'P_individual']),
+    'E_loss': (calculate_expected_loss, ['P_claim', 'L_payout']),
+    'P_monthly': (calculate_monthly_premium_batch, ['E_loss', 'Loading Factor', 'Minimum Monthly Premium']),
+}
+
+# Leaf defaults, matching price_profiles.
+DEFAULT_INPUTS = {'p_gen': 0.0, 'p_spec': 0.0, 'transition_month': 0.0, 'M_econ': 1.0, 'I_AI': 1.0}
+
+# price_profiles column names that set a node rather than a leaf.
+PROFILE_ALIASES = {'f_cr': 'FCR'}
+
+class PricingGraph:
+    """
+    Pricing DAG with cached node values, dirty tracking and pinned overrides.
+    """
+
+    def __init__(self, nodes=PRICING_NODES):
+        self.nodes = nodes
+        self.order = list(TopologicalSorter({name: inputs for name, (_, inputs) in nodes.items()}).static_order())
+        self.order = [name for name in self.order if name in nodes]
+        self.dependents = {}
+        for name, (_, inputs) in nodes.items():
+            for source in inputs:
+                self.dependents.setdefault(source, []).append(name)
+        self.values = dict(DEFAULT_INPUTS)
+        self.pinned = set()
+        self.dirty = set(nodes)
+        self.last_recomputed = []
+
+    @classmethod
+    def from_profiles(cls, profiles, actuarial_params, mecon=1.0, iai=1.0):
+        """
+        Graph loaded with price_profiles-style columns, the actuarial parameters and a scenario.
+        """
+        graph = cls()
+        graph.set(**actuarial_params)
+        graph.set(M_econ=mecon, I_AI=iai)
+        graph.set(**{
+            PROFILE_ALIASES.get(column, column): np.asarray(values, dtype=np.float64)
+            for column, values in profiles.items()
+        })
+        return graph
+
+    def _mark_dirty(self, source):
+        stack = list(self.dependents.get(source, []))
+        while stack:
+            name = stack.pop()
+            if name in self.dirty or name in self.pinned:
+                continue
+            self.dirty.add(name)
+            stack.extend(self.dependents.get(name, []))
+
+    def set(self, **values):
+        """
+        Sets leaves and/or pins nodes. Scalars equal to the current value are not treated as
+        changes; arrays always are (they may have been modified in place).
+        """
+        for name, value in values.items():
+            if np.ndim(value) == 0:
+                value = float(value)
+                current = self.values.get(name)
+                if isinstance(current, float) and current == value and (name not in self.nodes or name in self.pinned):
+                    continue
+            if name in self.nodes:
+                self.pinned.add(name)
+                self.dirty.discard(name)
+            self.values[name] = value
+            self._mark_dirty(name)
+
+    def unpin(self, *names):
+        """
+        Returns pinned nodes to being computed from their inputs.
+        """
+        for name in names:
+            if name in self.pinned:
+                self.pinned.discard(name)
+                self.dirty.add(name)
+                self._mark_dirty(name)
+
+    def _ancestors(self, outputs):
+        needed = set()
+        stack = list(outputs)
+        while stack:
+            name = stack.pop()
+            if name in needed or name not in self.nodes:
+                continue
+            needed.add(name)
+            if name not in self.pinned:
+                stack.extend(self.nodes[name][1])
+        return needed
+
+    def evaluate(self, outputs=RESULT_COLUMNS):
+        """
+        Recomputes the dirty nodes that `outputs` depend on, in topological order, and returns
+        {name: value} for the outputs. last_recomputed lists the nodes that were rerun.
+        """
+        needed = self._ancestors(outputs)
+        missing = sorted({
+            source for name in needed if name not in self.pinned
+            for source in self.nodes[name][1] if source not in self.nodes and source not in self.values
+        })
+        if missing:
+            raise KeyError(f"Missing pricing inputs: {missing}")
+        self.last_recomputed = []
+        for name in self.order:
+            if name in needed and name in self.dirty:
+                function, inputs = self.nodes[name]
+                self.values[name] = function(*(self.values[source] for source in inputs))
+                self.dirty.discard(name)
+                self.last_recomputed.append(name)
+        return {name: self.values[name] for name in outputs}
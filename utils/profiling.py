@@ -0,0 +1,185 @@
+"""
+Opt-in per-stage timing instrumentation for the pricing chain and chart building.
+
+Functions in risk_calculator and visualization_utils are tagged with @profiled(stage).
+Nothing is recorded unless a profile is active on the current thread; while no thread is
+profiling, the cost is one global check per call:
+
+    with profiling() as profile:
+        ... price, build DataFrames, plot ...
+    print(profile.flame_summary())
+    profile.to_json('profile.json')
+"""
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Stage names used by the instrumented functions, in pipeline order.
+STAGES = [
+    'FHC', 'FCR', 'FUS', 'V_i', 'H_i', 'payout', 'P_claim', 'premium',
+    'DataFrame construction', 'figure creation',
+]
+
+_local = threading.local()
+_lock = threading.Lock()
+
+# Number of threads with an active profile; lets the decorators skip the thread-local lookup.
+_active_profiles = 0
+
+class StageProfile:
+    """
+    Call counts and inclusive timings per stage path collected during one profile.
+    A path is the ';'-joined stack of nested stages, e.g. 'figure creation;DataFrame construction'.
+    """
+
+    def __init__(self):
+        self.paths = {} # path -> [calls, inclusive seconds]
+        self.stack = []
+
+    def record(self, path, elapsed):
+        entry = self.paths.get(path)
+        if entry is None:
+            self.paths[path] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def self_times(self):
+        """
+        Self time per path: inclusive time minus the inclusive time of its direct children.
+        """
+        self_seconds = {path: total for path, (_, total) in self.paths.items()}
+        for path, (_, total) in self.paths.items():
+            parent, _, _ = path.rpartition(';')
+            if parent in self_seconds:
+                self_seconds[parent] -= total
+        return self_seconds
+
+    def summary(self):
+        """
+        Per-stage totals: {stage: {'calls', 'total_s', 'self_s'}}, aggregated over all paths.
+        total_s only counts the outermost occurrence of a stage, so nesting is not double counted.
+        """
+        stages = {}
+        self_seconds = self.self_times()
+        for path, (calls, total) in self.paths.items():
+            frames = path.split(';')
+            stage = frames[-1]
+            entry = stages.setdefault(stage, {'calls': 0, 'total_s': 0.0, 'self_s': 0.0})
+            entry['calls'] += calls
+            entry['self_s'] += self_seconds[path]
+            if stage not in frames[:-1]:
+                entry['total_s'] += total
+        return stages
+
+    def to_dict(self):
+        self_seconds = self.self_times()
+        return {
+            'stages': self.summary(),
+            'paths': {
+                path: {'calls': calls, 'total_s': total, 'self_s': self_seconds[path]}
+                for path, (calls, total) in self.paths.items()
+            },
+        }
+
+    def to_json(self, path=None):
+        """
+        Returns the profile as a JSON string, also writing it to `path` when given.
+        """
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def flame_summary(self):
+        """
+        Text flame summary in folded-stack format ('stage;child self_microseconds' per line),
+        readable as-is and accepted by flamegraph.pl / speedscope.
+        """
+        self_seconds = self.self_times()
+        lines = [
+            f"{path} {max(self_seconds[path], 0.0) * 1e6:.0f}"
+            for path in sorted(self.paths, key=lambda p: -self_seconds[p])
+        ]
+        return '\n'.join(lines)
+
+def _set_profile(profile):
+    """
+    Installs `profile` (or None) as the current thread's profile and returns the previous one.
+    """
+    global _active_profiles
+    with _lock:
+        previous = getattr(_local, 'profile', None)
+        _active_profiles += (profile is not None) - (previous is not None)
+        _local.profile = profile
+    return previous
+
+def start_profiling():
+    """
+    Starts collecting stage timings on the current thread and returns the new StageProfile.
+    """
+    profile = StageProfile()
+    _set_profile(profile)
+    return profile
+
+def stop_profiling():
+    """
+    Stops collecting on the current thread and returns the profile that was active, if any.
+    """
+    return _set_profile(None)
+
+@contextmanager
+def profiling():
+    """
+    Context manager that profiles the enclosed block on the current thread.
+    """
+    profile = StageProfile()
+    previous = _set_profile(profile)
+    try:
+        yield profile
+    finally:
+        _set_profile(previous)
+
+@contextmanager
+def profile_stage(stage):
+    """
+    Times the enclosed block as `stage` when a profile is active; a no-op otherwise.
+    """
+    profile = getattr(_local, 'profile', None) if _active_profiles else None
+    if profile is None:
+        yield
+        return
+    profile.stack.append(stage)
+    path = ';'.join(profile.stack)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(path, time.perf_counter() - start)
+        profile.stack.pop()
+
+def profiled(stage):
+    """
+    Decorator that times every call of the function as `stage` while a profile is active.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _active_profiles:
+                return function(*args, **kwargs)
+            profile = getattr(_local, 'profile', None)
+            if profile is None:
+                return function(*args, **kwargs)
+            profile.stack.append(stage)
+            path = ';'.join(profile.stack)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.record(path, time.perf_counter() - start)
+                profile.stack.pop()
+        return wrapper
+    return decorator
@@ -0,0 +1,163 @@
+"""
+Multi-year premium projection: every profile priced month by month along paths of the economic
+climate (M_econ) and AI innovation index (I_AI), with skill progress and the career transition
+advancing over the same timeline.
+
+Month t of the projection (t = 0 is today) prices each profile with
+    P_gen(t) = min(p_gen + p_gen_rate * t, 1),   P_spec(t) = min(p_spec + p_spec_rate * t, 1),
+    k(t) = transition_month + t                  (only for profiles with an 'h_target'),
+and M_econ / I_AI taken from month t of each path. Everything except the macro modifier
+m(p, t) = W_ECON * M_econ + W_INNO * I_AI depends only on (profile, month), so
+    E_loss(p, r, t) = m(p, t) * e(r, t),   e = H_base(k(t)) * P_ind(t) * beta_s / 100 * L_payout,
+and book expected losses are a matrix product. Only the P_min floor of the premium needs the
+full (paths x profiles x months) tensor, which is evaluated in row chunks of at most max_cells.
+
+    mecon = simulate_macro_paths(1000, 120, seed=1)
+    iai = simulate_macro_paths(1000, 120, start=1.0, drift=0.003, seed=2)
+    projection = project_premiums(profiles, params, mecon, iai)
+    summary = projection_summary(projection)
+"""
+import numpy as np
+from utils.batch_pricing import PROFILE_COLUMNS, _column
+from utils.risk_calculator import (
+    calculate_fexp_batch, calculate_fhc, calculate_fcr, calculate_fus, calculate_idiosyncratic_risk_batch,
+    calculate_h_base_ttv_batch, calculate_payout_amount
+)
+
+# Optional profile columns: monthly increase of P_gen and P_spec.
+RATE_COLUMNS = ['p_gen_rate', 'p_spec_rate']
+
+# Upper bound on (path x profile x month) premium cells held in memory per chunk.
+DEFAULT_MAX_CELLS = 1 << 22
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+def simulate_macro_paths(n_paths, n_months, start=1.0, mean=1.0, reversion=0.05, volatility=0.02,
+                         drift=0.0, seed=0):
+    """
+    Simulated index paths (e.g. M_econ or I_AI), shape (n_paths, n_months), as a mean-reverting
+    process in log space: x(t+1) = x(t) + reversion * (log(mean) + drift * t - x(t)) + volatility * eps(t),
+    with x(0) = log(start). drift lets the long-run level trend, e.g. for rising AI innovation.
+    """
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_paths, n_months - 1)) * volatility
+    log_paths = np.empty((n_paths, n_months))
+    log_paths[:, 0] = np.log(start)
+    for t in range(n_months - 1):
+        target = np.log(mean) + drift * t
+        log_paths[:, t + 1] = log_paths[:, t] + reversion * (target - log_paths[:, t]) + shocks[:, t]
+    return np.exp(log_paths)
+
+def _as_paths(mecon_paths, iai_paths):
+    """
+    Broadcasts the two path inputs (scalars, one path of n_months, or (n_paths, n_months)) to a
+    common (n_paths, n_months) shape.
+    """
+    mecon = np.atleast_2d(np.asarray(mecon_paths, dtype=np.float64))
+    iai = np.atleast_2d(np.asarray(iai_paths, dtype=np.float64))
+    shape = np.broadcast_shapes(mecon.shape, iai.shape)
+    return np.broadcast_to(mecon, shape), np.broadcast_to(iai, shape)
+
+def _profile_chunk(profiles, start, stop):
+    columns = [name for name in PROFILE_COLUMNS + RATE_COLUMNS if name in profiles]
+    return {name: np.asarray(profiles[name], dtype=np.float64)[start:stop] for name in columns}
+
+def _monthly_loss_factors(chunk, actuarial_params, months):
+    """
+    e(r, t): the annual expected loss of each profile at each month divided by the macro modifier.
+    """
+    params = actuarial_params
+    fhc = calculate_fhc(_column(chunk, 'f_role'), _column(chunk, 'f_level'), _column(chunk, 'f_field'),
+                        _column(chunk, 'f_school'), calculate_fexp_batch(_column(chunk, 'years_experience')))
+    if 'f_cr' in chunk:
+        fcr = _column(chunk, 'f_cr')
+    else:
+        fcr = calculate_fcr(_column(chunk, 's_senti'), _column(chunk, 's_fin'), _column(chunk, 's_growth'))
+    n_rows = len(fhc)
+    zero = np.zeros(n_rows)
+    p_gen = np.minimum(chunk.get('p_gen', zero)[:, None] + chunk.get('p_gen_rate', zero)[:, None] * months, 1.0)
+    p_spec = np.minimum(chunk.get('p_spec', zero)[:, None] + chunk.get('p_spec_rate', zero)[:, None] * months, 1.0)
+    fus = calculate_fus(p_gen, p_spec, params['GAMMA_GEN'], params['GAMMA_SPEC'])
+    v_i = calculate_idiosyncratic_risk_batch(fhc[:, None], fcr[:, None], fus,
+                                             params['W_CR'], params['W_US'])
+    if 'h_target' in chunk:
+        h_base_t = calculate_h_base_ttv_batch(
+            chunk.get('transition_month', zero)[:, None] + months, params['TTV_DEFAULT'],
+            chunk['h_base'][:, None], chunk['h_target'][:, None]
+        )
+    else:
+        h_base_t = np.broadcast_to(chunk['h_base'][:, None], (n_rows, len(months)))
+    payout = np.broadcast_to(calculate_payout_amount(
+        _column(chunk, 'annual_salary', float(params['Annual Salary'])),
+        params['Coverage Duration'], params['Coverage Percentage']
+    ), n_rows)
+    scale = payout[:, None] * (params['Beta Systemic'] / 100) * (params['Beta Individual'] / 100)
+    return h_base_t * v_i * scale
+
+def project_premiums(profiles, actuarial_params, mecon_paths, iai_paths, per_profile=False,
+                     max_cells=DEFAULT_MAX_CELLS):
+    """
+    Projects a book of profiles (as for price_profiles, plus optional RATE_COLUMNS) month by month
+    along every pair of macro paths. mecon_paths and iai_paths are (n_paths, n_months) arrays, one
+    path, or scalars, broadcast against each other.
+    Returns a dict of book totals, each (n_paths, n_months):
+      'premium' (monthly premiums), 'expected_loss' (E_loss / 12 per month),
+      'cumulative_premium', 'cumulative_expected_loss';
+    plus 'months', and with per_profile=True the path means per profile, each (n_rows, n_months):
+      'profile_premium', 'profile_cumulative_expected_loss'.
+    Every month matches price_profiles on the advanced profiles to floating-point rounding.
+    """
+    params = actuarial_params
+    mecon, iai = _as_paths(mecon_paths, iai_paths)
+    n_paths, n_months = mecon.shape
+    months = np.arange(n_months, dtype=np.float64)
+    modifier = params['W_ECON'] * mecon + params['W_INNO'] * iai
+    mean_modifier = modifier.mean(axis=0)
+    premium_factor = params['Loading Factor'] / 12
+    min_premium = params['Minimum Monthly Premium']
+
+    n_rows = len(profiles['h_base'])
+    chunk_rows = max(1, max_cells // (n_paths * n_months))
+    annual_loss = np.zeros((n_paths, n_months))
+    premium = np.zeros((n_paths, n_months))
+    if per_profile:
+        profile_premium = np.empty((n_rows, n_months))
+        profile_loss = np.empty((n_rows, n_months))
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        factors = _monthly_loss_factors(_profile_chunk(profiles, start, stop), params, months)
+        annual_loss += modifier * factors.sum(axis=0)
+        # (paths, rows, months) premiums before and after the P_min floor.
+        cells = modifier[:, None, :] * (factors * premium_factor)[None, :, :]
+        np.maximum(cells, min_premium, out=cells)
+        premium += cells.sum(axis=1)
+        if per_profile:
+            profile_premium[start:stop] = cells.mean(axis=0)
+            profile_loss[start:stop] = np.cumsum(factors * mean_modifier / 12, axis=1)
+
+    expected_loss = annual_loss / 12
+    result = {
+        'months': np.arange(n_months),
+        'premium': premium,
+        'expected_loss': expected_loss,
+        'cumulative_premium': np.cumsum(premium, axis=1),
+        'cumulative_expected_loss': np.cumsum(expected_loss, axis=1),
+    }
+    if per_profile:
+        result['profile_premium'] = profile_premium
+        result['profile_cumulative_expected_loss'] = profile_loss
+    return result
+
+def projection_summary(projection, quantiles=DEFAULT_QUANTILES):
+    """
+    Month-by-month DataFrame of the book curves across paths: the mean and the given quantiles of
+    'premium' and 'cumulative_expected_loss', e.g. for a fan chart.
+    """
+    import pandas as pd
+    summary = {'Month': projection['months']}
+    for key, label in (('premium', 'Monthly Premium'), ('cumulative_expected_loss', 'Cumulative Expected Loss')):
+        curves = projection[key]
+        summary[f"Mean {label}"] = curves.mean(axis=0)
+        for q, values in zip(quantiles, np.quantile(curves, quantiles, axis=0)):
+            summary[f"Q{q * 100:g} {label}"] = values
+    return pd.DataFrame(summary)
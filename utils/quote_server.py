@@ -0,0 +1,321 @@
+"""
+Local HTTP/JSON quote service with asyncio micro-batching.
+
+Concurrent quote requests are queued and collected for at most `max_wait_ms` (or until
+`max_batch_size` are waiting); each window is priced as one vectorized price_profiles batch and
+every caller gets its own result. The factor tables are loaded once at startup and kept in memory.
+
+    python -m utils.quote_server --port 8600 --max-batch-size 1024 --max-wait-ms 2
+
+Endpoints:
+    POST /quote    one quote request object -> {'V_i', 'H_i', 'P_monthly'}
+    POST /quotes   list of quote request objects -> list of results (priced in batches of at most
+                   max_batch_size)
+    GET  /metrics  throughput, batch size and latency statistics
+    GET  /health   {'status': 'ok'}
+
+A quote request is a JSON object with the category names 'occupation', 'education_level',
+'education_field', 'school_tier' and 'company_type' (keys of the load_synthetic_data() tables),
+the number 'years_experience', and optionally 'target_occupation' and the numbers in
+NUMERIC_FIELDS ('p_gen', 'p_spec', 'transition_month', 'annual_salary', 'mecon', 'iai').
+Numbers must be finite; malformed requests get a 400 response.
+Load-test with benchmarks/quote_load.py.
+"""
+import argparse
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import deque
+import numpy as np
+from utils.data_loader import load_synthetic_data
+from utils.factor_tables import build_factor_tables
+from utils.batch_pricing import price_profiles
+
+# Numeric request fields and their defaults (None: required; annual_salary defaults to the parameters).
+NUMERIC_FIELDS = {
+    'years_experience': None, 'p_gen': 0.0, 'p_spec': 0.0, 'transition_month': 0.0,
+    'annual_salary': None, 'mecon': 1.0, 'iai': 1.0,
+}
+
+# Columns of the encoded request matrix, in order.
+ENCODED_COLUMNS = [
+    'f_role', 'f_level', 'f_field', 'f_school', 'f_cr', 'h_base', 'h_target',
+    'years_experience', 'p_gen', 'p_spec', 'transition_month', 'annual_salary', 'mecon', 'iai',
+]
+
+DEFAULT_MAX_BATCH_SIZE = 1024
+DEFAULT_MAX_WAIT_MS = 2.0
+LATENCY_WINDOW = 10_000
+
+class QuoteService:
+    """
+    Micro-batching quote engine: warm factor tables, a request queue and the batching loop.
+    """
+
+    def __init__(self, data=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        data = data or load_synthetic_data()
+        self.params = data['actuarial_parameters']
+        self.tables = build_factor_tables(data)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self.quotes = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW) # seconds, most recent quotes
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._record_lock = threading.Lock() # pricing records from executor threads
+
+    def _factor(self, request, field, table, factor):
+        value = request.get(field)
+        if value is None:
+            raise ValueError(f"Missing required field: {field}")
+        if not isinstance(value, str):
+            raise ValueError(f"Field {field} must be a category name, got {value!r}")
+        code = self.tables[table]['codes'].get(value)
+        if code is None:
+            raise ValueError(f"Unknown {field}: {value!r}")
+        return self.tables[table]['factors'][factor][code]
+
+    def encode(self, request):
+        """
+        Validates one quote request and returns its row of ENCODED_COLUMNS.
+        Raises ValueError for missing fields, non-finite numbers, and category fields that are not
+        known names (including non-string values such as lists).
+        """
+        if not isinstance(request, dict):
+            raise ValueError("A quote request must be a JSON object.")
+        numbers = {}
+        for field, default in NUMERIC_FIELDS.items():
+            value = request.get(field, default)
+            if value is None and field == 'annual_salary':
+                value = self.params['Annual Salary']
+            if value is None:
+                raise ValueError(f"Missing required field: {field}")
+            try:
+                numbers[field] = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Field {field} must be a number, got {value!r}")
+            if not math.isfinite(numbers[field]):
+                raise ValueError(f"Field {field} must be finite, got {value!r}")
+        h_base = self._factor(request, 'occupation', 'occupations_data', 'H_base')
+        if request.get('target_occupation') is None:
+            h_target = h_base
+        else:
+            h_target = self._factor(request, 'target_occupation', 'occupations_data', 'H_base')
+        return (
+            self._factor(request, 'occupation', 'occupations_data', 'f_role'),
+            self._factor(request, 'education_level', 'education_data', 'f_level'),
+            self._factor(request, 'education_field', 'education_field_data', 'f_field'),
+            self._factor(request, 'school_tier', 'school_tier_data', 'f_school'),
+            self._factor(request, 'company_type', 'company_type_data', 'F_CR'),
+            h_base, h_target,
+            numbers['years_experience'], numbers['p_gen'], numbers['p_spec'], numbers['transition_month'],
+            numbers['annual_salary'], numbers['mecon'], numbers['iai'],
+        )
+
+    def price_rows(self, rows):
+        """
+        Prices encoded rows in one vectorized pass; returns one result dict per row.
+        """
+        matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(ENCODED_COLUMNS))
+        columns = dict(zip(ENCODED_COLUMNS, matrix.T))
+        mecon, iai = columns.pop('mecon'), columns.pop('iai')
+        result = price_profiles(columns, self.params, mecon, iai)
+        return [
+            {'V_i': v_i, 'H_i': h_i, 'P_monthly': premium}
+            for v_i, h_i, premium in zip(result['V_i'].tolist(), result['H_i'].tolist(), result['P_monthly'].tolist())
+        ]
+
+    async def quote(self, request):
+        """
+        Queues one request for the next batch window and waits for its result.
+        """
+        row = self.encode(request)
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future, time.perf_counter()))
+        return await future
+
+    def quote_many(self, requests):
+        """
+        Prices a list of requests directly, in batches of at most max_batch_size. Every request
+        is validated before any is priced. Blocking; the server runs it in the default executor.
+        """
+        start = time.perf_counter()
+        rows = [self.encode(request) for request in requests]
+        results = []
+        for offset in range(0, len(rows), self.max_batch_size):
+            batch = self.price_rows(rows[offset:offset + self.max_batch_size])
+            results.extend(batch)
+            self._record(len(batch), [time.perf_counter() - start] * len(batch))
+        return results
+
+    def _record(self, n_quotes, latencies):
+        with self._record_lock:
+            self.quotes += n_quotes
+            self.batches += 1
+            self.batch_sizes.append(n_quotes)
+            self.latencies.extend(latencies)
+
+    async def run_batcher(self):
+        """
+        Batching loop: waits for a first request, collects more until the batch is full or
+        max_wait has passed since that first request, then prices the window in the default
+        executor while the next window collects.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if self.queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(None, self.price_rows, [row for row, _, _ in batch])
+            except Exception as error:
+                self.errors += len(batch)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            finished = time.perf_counter()
+            for (_, future, queued), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._record(len(batch), [finished - queued for _, _, queued in batch])
+
+    def metrics(self):
+        """
+        Service counters plus latency percentiles and batch sizes over the most recent quotes.
+        """
+        uptime = time.perf_counter() - self.started
+        with self._record_lock:
+            latencies = np.array(self.latencies) * 1000
+            batch_sizes = np.array(self.batch_sizes)
+        return {
+            'uptime_s': uptime,
+            'quotes': self.quotes,
+            'batches': self.batches,
+            'errors': self.errors,
+            'quotes_per_s': self.quotes / uptime if uptime > 0 else 0.0,
+            'mean_batch_size': float(batch_sizes.mean()) if len(batch_sizes) else 0.0,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                'p90': float(np.percentile(latencies, 90)) if len(latencies) else 0.0,
+                'p99': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+                'max': float(latencies.max()) if len(latencies) else 0.0,
+            },
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+        }
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+async def _respond(service, method, path, body):
+    """
+    Routes one HTTP request; returns (status, JSON-serializable payload).
+    """
+    if path == '/health':
+        return 200, {'status': 'ok'}
+    if path == '/metrics':
+        return 200, service.metrics()
+    if path not in ('/quote', '/quotes'):
+        return 404, {'error': f"No route {path}"}
+    if method != 'POST':
+        return 405, {'error': f"{path} expects POST"}
+    try:
+        request = json.loads(body or b'null')
+        if path == '/quote':
+            return 200, await service.quote(request)
+        if not isinstance(request, list):
+            raise ValueError("/quotes expects a JSON list of quote requests.")
+        # Off the event loop, so a large list does not stall the batcher and other connections.
+        return 200, await asyncio.get_running_loop().run_in_executor(None, service.quote_many, request)
+    except ValueError as error: # includes json.JSONDecodeError
+        return 400, {'error': str(error)}
+
+async def _handle_connection(service, reader, writer):
+    """
+    Minimal HTTP/1.1 handling with keep-alive: one request at a time per connection.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            body = await reader.readexactly(length) if length else b''
+            try:
+                status, payload = await _respond(service, method, path.split('?', 1)[0], body)
+            except Exception as error:
+                status, payload = 500, {'error': str(error)}
+            data = json.dumps(payload).encode()
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                .encode('latin-1') + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host='127.0.0.1', port=8600, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                data=None, ready=None):
+    """
+    Runs the quote service until cancelled. `ready`, if given, is an asyncio.Event set once
+    the server is listening.
+    """
+    service = QuoteService(data, max_batch_size, max_wait_ms)
+    batcher = asyncio.create_task(service.run_batcher())
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(service, reader, writer), host, port
+    )
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher.cancel()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve premium quotes over local HTTP/JSON with micro-batching.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Largest number of quotes priced in one batch.")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Longest time the first request of a batch waits for others.")
+    args = parser.parse_args(argv)
+    print(f"Serving quotes on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,30 @@
 
 import numpy as np
+from utils.profiling import profiled
+
+# The formula functions below are plain arithmetic and accept NumPy arrays as
+# well as scalars. The four functions that branch or clamp (f_exp, V_i(t),
+# H_base(k) and P_monthly) have *_batch array versions; their scalar forms are
+# thin wrappers so both paths always give identical results. Stage tags feed the
+# opt-in timings in utils/profiling.py; only the *_batch forms are tagged so scalar
+# calls are not counted twice.
+
+@profiled('FHC')
+def calculate_fexp_batch(years_experience):
+    """
+    Vectorized Experience Factor (f_exp) over an array of years of experience.
+    f_exp = 1 - (0.015 * min(Yrs, 20))
+    """
+    return 1 - (0.015 * np.minimum(years_experience, 20))
 
 def calculate_fexp(years_experience):
     """
     Calculates the Experience Factor (f_exp).
     f_exp = 1 - (0.015 * min(Yrs, 20))
     """
-    return 1 - (0.015 * min(years_experience, 20))
+    return float(calculate_fexp_batch(years_experience))
 
+@profiled('FHC')
 def calculate_fhc(role_multiplier, edu_level_factor, edu_field_factor, school_tier_factor, fexp_value):
     """
     Calculates the Human Capital Factor (FHC).
@@ -15,7 +32,12 @@ def calculate_fhc(role_multiplier, edu_level_factor, edu_field_factor, school_ti
     """
     return role_multiplier * edu_level_factor * edu_field_factor * school_tier_factor * fexp_value
 
-def calculate_fcr(sentiment_score, financial_health_score, growth_ai_adoption_score, w1=0.33, w2=0.33, w3=0.34):
+# Default weights (w_1, w_2, w_3) of S_senti, S_fin and S_growth in F_CR.
+FCR_WEIGHTS = (0.33, 0.33, 0.34)
+
+@profiled('FCR')
+def calculate_fcr(sentiment_score, financial_health_score, growth_ai_adoption_score,
+                  w1=FCR_WEIGHTS[0], w2=FCR_WEIGHTS[1], w3=FCR_WEIGHTS[2]):
     """
     Calculates the Company Risk Factor (F_CR).
     F_CR = w_1 * S_senti + w_2 * S_fin + w_3 * S_growth
@@ -23,6 +45,7 @@ def calculate_fcr(sentiment_score, financial_health_score, growth_ai_adoption_sc
     """
     return (w1 * sentiment_score + w2 * financial_health_score + w3 * growth_ai_adoption_score)
 
+@profiled('FUS')
 def calculate_fus(p_gen, p_spec, gamma_gen, gamma_spec):
     """
     Calculates the Upskilling Factor (F_US).
@@ -30,26 +53,46 @@ def calculate_fus(p_gen, p_spec, gamma_gen, gamma_spec):
     """
     return 1 - (gamma_gen * p_gen + gamma_spec * p_spec)
 
+@profiled('V_i')
+def calculate_idiosyncratic_risk_batch(fhc, fcr, fus, w_cr, w_us):
+    """
+    Vectorized Idiosyncratic Risk (V_i(t)) over arrays of factors.
+    V_raw = FHC * (w_CR * FCR + w_US * FUS)
+    V_i(t) = min(100.0, max(5.0, V_raw * 50.0))
+    """
+    v_raw = fhc * (w_cr * fcr + w_us * fus)
+    return np.minimum(100.0, np.maximum(5.0, v_raw * 50.0))
+
 def calculate_idiosyncratic_risk(fhc, fcr, fus, w_cr, w_us):
     """
     Calculates the Idiosyncratic Risk (V_i(t)).
     V_raw = FHC * (w_CR * FCR + w_US * FUS)
     V_i(t) = min(100.0, max(5.0, V_raw * 50.0))
     """
-    v_raw = fhc * (w_cr * fcr + w_us * fus)
-    return min(100.0, max(5.0, v_raw * 50.0))
+    return float(calculate_idiosyncratic_risk_batch(fhc, fcr, fus, w_cr, w_us))
+
+@profiled('H_i')
+def calculate_h_base_ttv_batch(k, ttv, h_current, h_target):
+    """
+    Vectorized Base Occupational Hazard with TTV Modifier (H_base(k)).
+    H_base(k) = (1 - k/TTV) * H_current + (k/TTV) * H_target
+    Rows with TTV == 0 or k >= TTV take H_target, as in the scalar version.
+    """
+    k = np.asarray(k, dtype=float)
+    ttv = np.asarray(ttv, dtype=float)
+    complete = (ttv == 0) | (k >= ttv)
+    ratio = k / np.where(ttv == 0, 1.0, ttv) # Avoid division by zero
+    blended = (1 - ratio) * h_current + ratio * h_target
+    return np.where(complete, h_target, blended)
 
 def calculate_h_base_ttv(k, ttv, h_current, h_target):
     """
     Calculates the Base Occupational Hazard with Transition Time-to-Value (TTV) Modifier (H_base(k)).
     H_base(k) = (1 - k/TTV) * H_current + (k/TTV) * H_target
     """
-    if ttv == 0: # Avoid division by zero
-        return h_target
-    if k >= ttv: # If transition is complete or beyond TTV
-        return h_target
-    return (1 - k / ttv) * h_current + (k / ttv) * h_target
+    return float(calculate_h_base_ttv_batch(k, ttv, h_current, h_target))
 
+@profiled('H_i')
 def calculate_systematic_risk(h_base_t, mecon, iai, w_econ, w_inno):
     """
     Calculates the Systematic Risk (H_i).
@@ -57,6 +100,7 @@ def calculate_systematic_risk(h_base_t, mecon, iai, w_econ, w_inno):
     """
     return h_base_t * (w_econ * mecon + w_inno * iai)
 
+@profiled('payout')
 def calculate_payout_amount(annual_salary, coverage_duration, coverage_percentage):
     """
     Calculates the Total Payout Amount (L_payout).
@@ -64,6 +108,7 @@ def calculate_payout_amount(annual_salary, coverage_duration, coverage_percentag
     """
     return (annual_salary / 12) * coverage_duration * coverage_percentage
 
+@profiled('P_claim')
 def calculate_p_systemic(h_i, beta_systemic):
     """
     Calculates the Probability of a Systemic Event (P_systemic).
@@ -71,6 +116,7 @@ def calculate_p_systemic(h_i, beta_systemic):
     """
     return (h_i / 100) * beta_systemic
 
+@profiled('P_claim')
 def calculate_p_individual_systemic(v_i_t, beta_individual):
     """
     Calculates the Conditional Probability of Job Loss Given a Systemic Event (P_individual|systemic).
@@ -78,6 +124,7 @@ def calculate_p_individual_systemic(v_i_t, beta_individual):
     """
     return (v_i_t / 100) * beta_individual
 
+@profiled('P_claim')
 def calculate_p_claim(p_systemic, p_individual_systemic):
     """
     Calculates the Annual Claim Probability (P_claim).
@@ -85,6 +132,7 @@ def calculate_p_claim(p_systemic, p_individual_systemic):
     """
     return p_systemic * p_individual_systemic
 
+@profiled('premium')
 def calculate_expected_loss(p_claim, lpayout):
     """
     Calculates the Annual Expected Loss (E[Loss]).
@@ -92,9 +140,17 @@ def calculate_expected_loss(p_claim, lpayout):
     """
     return p_claim * lpayout
 
+@profiled('premium')
+def calculate_monthly_premium_batch(expected_loss, loading_factor, min_premium):
+    """
+    Vectorized Final Monthly Premium (P_monthly) over an array of expected losses.
+    P_monthly = max((E[Loss] * lambda) / 12, P_min)
+    """
+    return np.maximum((expected_loss * loading_factor) / 12, min_premium)
+
 def calculate_monthly_premium(expected_loss, loading_factor, min_premium):
     """
     Calculates the Final Monthly Premium (P_monthly).
     P_monthly = max((E[Loss] * lambda) / 12, P_min)
     """
-    return max((expected_loss * loading_factor) / 12, min_premium)
+    return float(calculate_monthly_premium_batch(expected_loss, loading_factor, min_premium))
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+from utils.batch_pricing import price_profiles
+
+# Inputs whose premium sensitivities are reported. M_econ and I_AI are the scenario arguments,
+# p_gen and p_spec are profile columns, and the rest are actuarial_params keys.
+SENSITIVITY_PARAMETERS = [
+    'M_econ', 'I_AI', 'W_CR', 'W_US', 'W_ECON', 'W_INNO', 'GAMMA_GEN', 'GAMMA_SPEC',
+    'Beta Systemic', 'Beta Individual', 'Loading Factor', 'p_gen', 'p_spec',
+]
+
+PROFILE_PARAMETERS = ('p_gen', 'p_spec')
+
+def _clamp_gradient(raw, lower, upper, slope):
+    """
+    Right derivative of clip(raw, lower, upper) given slope = d(raw)/dθ.
+    Strictly inside the bounds the slope passes through; on a bound it passes only if increasing
+    θ moves raw back inside; beyond a bound the derivative is zero.
+    """
+    leaves_lower = (raw > lower) | ((raw == lower) & (slope > 0))
+    leaves_upper = (raw < upper) | ((raw == upper) & (slope < 0))
+    return np.where(leaves_lower & leaves_upper, slope, 0.0)
+
+def premium_sensitivities(profiles, actuarial_params, mecon=1.0, iai=1.0):
+    """
+    Analytic partial derivatives of P_monthly with respect to SENSITIVITY_PARAMETERS,
+    for a batch of profiles in one vectorized pass (profiles as for price_profiles).
+    The V_i(t) clamp to [5, 100] and the P_min floor are differentiated as right derivatives:
+    rows pinned at a bound get zero, and rows exactly on a bound get the slope of the branch
+    that an increase of the parameter moves into.
+    Returns a dict {parameter: array of dP_monthly/dparameter}.
+    """
+    params = actuarial_params
+    chain = price_profiles(profiles, params, mecon, iai, intermediates=True)
+    fhc, fcr, fus = chain['FHC'], chain['FCR'], chain['FUS']
+    h_base_t, h_i, v_i = chain['H_base_t'], chain['H_i'], chain['V_i']
+    p_systemic, p_individual, payout = chain['P_systemic'], chain['P_individual'], chain['L_payout']
+    p_gen = np.asarray(profiles['p_gen'], dtype=np.float64) if 'p_gen' in profiles else 0.0
+    p_spec = np.asarray(profiles['p_spec'], dtype=np.float64) if 'p_spec' in profiles else 0.0
+    loading = params['Loading Factor']
+    beta_systemic, beta_individual = params['Beta Systemic'], params['Beta Individual']
+
+    # Chain-rule pieces of E[Loss] = (H_i/100 * beta_sys) * (V_i/100 * beta_ind) * L_payout.
+    de_dh = beta_systemic / 100 * p_individual * payout
+    de_dv = p_systemic * beta_individual / 100 * payout
+    v_scaled = fhc * (params['W_CR'] * fcr + params['W_US'] * fus) * 50.0
+
+    def through_v(dv_raw):
+        return de_dv * _clamp_gradient(v_scaled, 5.0, 100.0, 50.0 * dv_raw)
+
+    dloss = {
+        'M_econ': de_dh * h_base_t * params['W_ECON'],
+        'I_AI': de_dh * h_base_t * params['W_INNO'],
+        'W_ECON': de_dh * h_base_t * mecon,
+        'W_INNO': de_dh * h_base_t * iai,
+        'W_CR': through_v(fhc * fcr),
+        'W_US': through_v(fhc * fus),
+        'GAMMA_GEN': through_v(-fhc * params['W_US'] * p_gen),
+        'GAMMA_SPEC': through_v(-fhc * params['W_US'] * p_spec),
+        'p_gen': through_v(-fhc * params['W_US'] * params['GAMMA_GEN']),
+        'p_spec': through_v(-fhc * params['W_US'] * params['GAMMA_SPEC']),
+        'Beta Systemic': h_i / 100 * p_individual * payout,
+        'Beta Individual': p_systemic * v_i / 100 * payout,
+    }
+
+    # P_monthly = max(E[Loss] * loading / 12, P_min); the floor is tested on the unfloored premium.
+    slopes = {name: loading / 12 * d for name, d in dloss.items()}
+    slopes['Loading Factor'] = chain['E_loss'] / 12
+    unfloored = chain['E_loss'] * loading / 12
+    n_rows = len(unfloored)
+    return {
+        name: np.broadcast_to(
+            _clamp_gradient(unfloored, params['Minimum Monthly Premium'], np.inf, slopes[name]), n_rows
+        ).copy()
+        for name in SENSITIVITY_PARAMETERS
+    }
+
+def _bumped_premium(profiles, actuarial_params, mecon, iai, parameter, delta):
+    """
+    P_monthly with one parameter shifted by delta (scalar or per-row array).
+    """
+    params = dict(actuarial_params)
+    if parameter == 'M_econ':
+        mecon = mecon + delta
+    elif parameter == 'I_AI':
+        iai = iai + delta
+    elif parameter in PROFILE_PARAMETERS:
+        base = np.asarray(profiles[parameter], dtype=np.float64) if parameter in profiles else 0.0
+        profiles = dict(profiles.items())
+        profiles[parameter] = base + delta
+    else:
+        params[parameter] = params[parameter] + delta
+    return price_profiles(profiles, params, mecon, iai)['P_monthly']
+
+def finite_difference_sensitivities(profiles, actuarial_params, mecon=1.0, iai=1.0,
+                                    parameters=None, step=1e-6, central=False):
+    """
+    Batched finite-difference derivatives of P_monthly: one vectorized repricing of the whole
+    batch per bumped parameter (two with central=True). Forward differences match the right
+    derivatives of premium_sensitivities at the clamps; use this for inputs without an analytic form.
+    Returns a dict {parameter: array}.
+    """
+    parameters = parameters or SENSITIVITY_PARAMETERS
+    base = None if central else price_profiles(profiles, actuarial_params, mecon, iai)['P_monthly']
+    result = {}
+    for parameter in parameters:
+        up = _bumped_premium(profiles, actuarial_params, mecon, iai, parameter, step)
+        if central:
+            down = _bumped_premium(profiles, actuarial_params, mecon, iai, parameter, -step)
+            result[parameter] = (up - down) / (2 * step)
+        else:
+            result[parameter] = (up - base) / step
+    return result
+
+def _parameter_value(profiles, actuarial_params, mecon, iai, parameter):
+    if parameter == 'M_econ':
+        return np.asarray(mecon, dtype=np.float64)
+    if parameter == 'I_AI':
+        return np.asarray(iai, dtype=np.float64)
+    if parameter in PROFILE_PARAMETERS:
+        return np.asarray(profiles[parameter], dtype=np.float64) if parameter in profiles else np.float64(0.0)
+    return np.float64(actuarial_params[parameter])
+
+def tornado_data(profiles, actuarial_params, mecon=1.0, iai=1.0, bump=0.10, parameters=None):
+    """
+    Tornado-chart data: the mean P_monthly over the batch when each parameter is moved down and
+    up by `bump` (relative, e.g. 0.10 = +/-10%), holding the others at their base values.
+    Returns a DataFrame with columns 'Parameter', 'Low', 'High', 'Base', 'Swing', sorted by
+    swing, largest first.
+    """
+    parameters = parameters or SENSITIVITY_PARAMETERS
+    base = float(price_profiles(profiles, actuarial_params, mecon, iai)['P_monthly'].mean())
+    rows = []
+    for parameter in parameters:
+        value = _parameter_value(profiles, actuarial_params, mecon, iai, parameter)
+        low = float(_bumped_premium(profiles, actuarial_params, mecon, iai, parameter, -bump * value).mean())
+        high = float(_bumped_premium(profiles, actuarial_params, mecon, iai, parameter, bump * value).mean())
+        rows.append({'Parameter': parameter, 'Low': low, 'High': high, 'Base': base, 'Swing': abs(high - low)})
+    return pd.DataFrame(rows).sort_values('Swing', ascending=False, ignore_index=True)
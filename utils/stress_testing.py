@@ -0,0 +1,175 @@
+"""
+Scenario stress testing: the premium chain over a grid of (M_econ, I_AI, loading factor)
+scenarios for every policyholder, written to memory-mapped result cubes on disk.
+
+Each metric is stored as a raw (n_scenarios, n_rows) array, scenario-major, next to a
+metadata.json describing the grid, so one scenario is a contiguous zero-copy slice:
+
+    grid = scenario_grid(np.linspace(0.8, 1.2, 5), np.linspace(0.8, 1.2, 5), [1.3, 1.5, 1.7])
+    run_stress_test(profiles, params, grid, 'stress_out', groups={'occupation': occupations})
+    results = open_stress_results('stress_out')
+    k = scenario_index(results, 1.2, 1.1, 1.5)
+    premiums = results['cubes']['P_monthly'][k]      # memmap view, nothing loaded up front
+    by_occupation = group_summary(results, 'P_monthly', k, 'occupation')
+"""
+import json
+import os
+import numpy as np
+import pandas as pd
+from utils.batch_pricing import price_profiles
+from utils.cohort_aggregation import encode_groups
+from utils.risk_calculator import (
+    calculate_systematic_risk, calculate_p_systemic, calculate_p_claim,
+    calculate_expected_loss, calculate_monthly_premium_batch
+)
+
+# Scenario axes, in grid order (the last axis varies fastest).
+SCENARIO_AXES = ['M_econ', 'I_AI', 'Loading Factor']
+
+# Metrics that vary by scenario and can be written as cubes.
+SCENARIO_COLUMNS = ['H_i', 'P_claim', 'E_loss', 'P_monthly']
+
+METADATA_FILE = 'metadata.json'
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+def scenario_grid(mecon_values, iai_values, loading_values):
+    """
+    Full Cartesian grid of scenarios as a dict of flat float64 arrays keyed by SCENARIO_AXES.
+    Scenario k = (i * len(iai_values) + j) * len(loading_values) + l.
+    """
+    axes = [np.asarray(values, dtype=np.float64).ravel() for values in (mecon_values, iai_values, loading_values)]
+    mesh = np.meshgrid(*axes, indexing='ij')
+    return {axis: values.ravel() for axis, values in zip(SCENARIO_AXES, mesh)}
+
+def cube_path(out_dir, metric):
+    return os.path.join(out_dir, f"{metric}.bin")
+
+def group_path(out_dir, name):
+    return os.path.join(out_dir, f"group_{name}.npy")
+
+def run_stress_test(profiles, actuarial_params, grid, out_dir, metrics=('P_monthly',), groups=None,
+                    dtype=np.float32, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Evaluates every profile under every scenario of `grid` (from scenario_grid) and writes one
+    memory-mapped (n_scenarios, n_rows) cube per metric into out_dir, plus metadata.json.
+    profiles are as for price_profiles; groups is an optional {name: array of labels per row}
+    (e.g. occupation names) stored alongside for group_summary; rows with a missing label
+    (None / NaN) are grouped under cohort_aggregation.MISSING_LABEL.
+
+    The scenario-independent part of the chain (V_i, H_base(t), payout) is computed once per
+    chunk of rows; each scenario then only reruns calculate_systematic_risk through
+    calculate_monthly_premium. Results match price_profiles exactly (up to `dtype`).
+    Returns the metadata dict.
+    """
+    unknown = [metric for metric in metrics if metric not in SCENARIO_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown stress-test metrics: {unknown}. Choose from {SCENARIO_COLUMNS}.")
+    os.makedirs(out_dir, exist_ok=True)
+    params = actuarial_params
+    scenarios = {axis: np.asarray(grid[axis], dtype=np.float64) for axis in SCENARIO_AXES}
+    n_scenarios = len(scenarios['M_econ'])
+    n_rows = len(profiles['h_base'])
+
+    metadata = {
+        'n_rows': n_rows,
+        'n_scenarios': n_scenarios,
+        'dtype': np.dtype(dtype).str,
+        'metrics': list(metrics),
+        'scenarios': {axis: values.tolist() for axis, values in scenarios.items()},
+        'groups': {},
+        'actuarial_parameters': {key: float(value) for key, value in params.items()},
+        'complete': False,
+    }
+    for name, labels in (groups or {}).items():
+        codes, names = encode_groups({name: labels})
+        np.save(group_path(out_dir, name), codes.astype(np.int32))
+        metadata['groups'][name] = [str(label) for label in names]
+    _write_metadata(out_dir, metadata)
+
+    cubes = {
+        metric: np.memmap(cube_path(out_dir, metric), dtype=dtype, mode='w+', shape=(n_scenarios, n_rows))
+        for metric in metrics
+    }
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        chunk = {column: np.asarray(values)[start:stop] for column, values in profiles.items()}
+        base = price_profiles(chunk, params, intermediates=True)
+        for k in range(n_scenarios):
+            h_i = calculate_systematic_risk(
+                base['H_base_t'], scenarios['M_econ'][k], scenarios['I_AI'][k], params['W_ECON'], params['W_INNO']
+            )
+            p_claim = calculate_p_claim(calculate_p_systemic(h_i, params['Beta Systemic']), base['P_individual'])
+            expected_loss = calculate_expected_loss(p_claim, base['L_payout'])
+            values = {'H_i': h_i, 'P_claim': p_claim, 'E_loss': expected_loss}
+            if 'P_monthly' in cubes:
+                values['P_monthly'] = calculate_monthly_premium_batch(
+                    expected_loss, scenarios['Loading Factor'][k], params['Minimum Monthly Premium']
+                )
+            for metric, cube in cubes.items():
+                cube[k, start:stop] = values[metric]
+    for cube in cubes.values():
+        cube.flush()
+
+    metadata['complete'] = True
+    _write_metadata(out_dir, metadata)
+    return metadata
+
+def _write_metadata(out_dir, metadata):
+    path = os.path.join(out_dir, METADATA_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def open_stress_results(out_dir):
+    """
+    Opens the cubes written by run_stress_test read-only, without loading them:
+      {'metadata': dict, 'cubes': {metric: memmap (n_scenarios, n_rows)}, 'groups': {name: memmap codes}}
+    Raises ValueError if the run did not finish.
+    """
+    with open(os.path.join(out_dir, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    if not metadata['complete']:
+        raise ValueError(f"Stress test in {out_dir} is incomplete; rerun run_stress_test.")
+    shape = (metadata['n_scenarios'], metadata['n_rows'])
+    return {
+        'metadata': metadata,
+        'cubes': {
+            metric: np.memmap(cube_path(out_dir, metric), dtype=np.dtype(metadata['dtype']), mode='r', shape=shape)
+            for metric in metadata['metrics']
+        },
+        'groups': {name: np.load(group_path(out_dir, name), mmap_mode='r') for name in metadata['groups']},
+    }
+
+def scenario_index(results, mecon, iai, loading_factor):
+    """
+    Index of the scenario with the given (M_econ, I_AI, loading factor) values.
+    """
+    scenarios = results['metadata']['scenarios']
+    match = (np.isclose(scenarios['M_econ'], mecon)
+             & np.isclose(scenarios['I_AI'], iai)
+             & np.isclose(scenarios['Loading Factor'], loading_factor))
+    if not match.any():
+        raise KeyError(f"No scenario with M_econ={mecon}, I_AI={iai}, Loading Factor={loading_factor}.")
+    return int(np.argmax(match))
+
+def group_summary(results, metric, scenario, group):
+    """
+    Count, mean, min and max of `metric` per group label under one scenario, reading only that
+    scenario's slice of the cube. Returns a DataFrame indexed by group label.
+    """
+    values = np.asarray(results['cubes'][metric][scenario], dtype=np.float64)
+    codes = results['groups'][group]
+    labels = results['metadata']['groups'][group]
+    n_groups = len(labels)
+    counts = np.bincount(codes, minlength=n_groups)
+    totals = np.bincount(codes, weights=values, minlength=n_groups)
+    minima = np.full(n_groups, np.inf)
+    maxima = np.full(n_groups, -np.inf)
+    np.minimum.at(minima, codes, values)
+    np.maximum.at(maxima, codes, values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = totals / counts
+    return pd.DataFrame(
+        {'Count': counts, 'Mean': means, 'Min': minima, 'Max': maxima},
+        index=pd.Index(labels, name=group)
+    )
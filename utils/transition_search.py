@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from utils.curves import premium_from_risks
+from utils.risk_calculator import (
+    calculate_fus, calculate_idiosyncratic_risk_batch, calculate_h_base_ttv_batch,
+    calculate_systematic_risk, calculate_payout_amount
+)
+
+def _running_best(values):
+    """
+    Running minimum of values and, for each position, the earliest index attaining it.
+    """
+    running = np.minimum.accumulate(values)
+    previous = np.concatenate([[np.inf], running[:-1]])
+    positions = np.arange(len(values))
+    source = np.maximum.accumulate(np.where(values < previous, positions, 0))
+    return running, source
+
+def search_transitions(fhc, fcr, current_h_base, targets, p_gen, p_spec, actuarial_params,
+                       mecon=1.0, iai=1.0, annual_salary=None, max_months=None, skill_budget=1.0,
+                       skill_step=0.05, months_per_skill_unit=None, ttv=None):
+    """
+    Searches every (target occupation, transition month, general/specific skill mix) combination
+    and returns the Pareto frontier of premium reduction against transition time.
+
+    targets is a dict {career: H_base}; include the current occupation to allow staying put.
+    ttv is the Time-to-Value period, either one value or a dict {career: TTV} (defaults to
+    actuarial_params['TTV_DEFAULT']). Skill progress can rise from (p_gen, p_spec) in skill_step
+    increments, adding at most skill_budget in total. When months_per_skill_unit = (gen, spec) is
+    given, a skill mix takes that many months per 1.0 of added progress, and a plan's time is the
+    longer of its transition month and its training time. max_months caps the time horizon.
+
+    The premium is max(c * H_i * V_i, P_min) with H_i depending only on (target, month) and V_i
+    only on the skill mix, so instead of evaluating the full product space the search takes the
+    best target per month and the best skill mix per time budget separately, each in one
+    vectorized pass, and combines them.
+
+    Returns a DataFrame with one row per frontier point, sorted by 'Transition Time (Months)'.
+    'Target Career' is None for plans that only upskill (transition month 0).
+    """
+    params = actuarial_params
+    names = list(targets)
+    h_target = np.array([targets[name] for name in names], dtype=np.float64)
+    if ttv is None:
+        ttv = params['TTV_DEFAULT']
+    if isinstance(ttv, dict):
+        ttv_by_target = np.array([ttv[name] for name in names], dtype=np.float64)
+    else:
+        ttv_by_target = np.full(len(names), float(ttv))
+    if max_months is None:
+        max_months = int(ttv_by_target.max())
+    months = np.arange(max_months + 1, dtype=np.float64)
+
+    salary = params['Annual Salary'] if annual_salary is None else annual_salary
+    payout = calculate_payout_amount(salary, params['Coverage Duration'], params['Coverage Percentage'])
+    premium_terms = (params['Beta Systemic'], params['Beta Individual'], payout,
+                     params['Loading Factor'], params['Minimum Monthly Premium'])
+
+    # Systematic side: best target for each month, then the best plan finishing within each time budget.
+    h_base = calculate_h_base_ttv_batch(months[None, :], ttv_by_target[:, None], current_h_base, h_target[:, None])
+    h_i = calculate_systematic_risk(h_base, mecon, iai, params['W_ECON'], params['W_INNO'])
+    best_target = np.argmin(h_i, axis=0)
+    h_best, h_month = _running_best(h_i[best_target, np.arange(len(months))])
+
+    # Idiosyncratic side: every skill mix within the budget, best V_i within each time budget.
+    gen_levels = np.minimum(p_gen + np.arange(0, 1 - p_gen + skill_step / 2, skill_step), 1.0)
+    spec_levels = np.minimum(p_spec + np.arange(0, 1 - p_spec + skill_step / 2, skill_step), 1.0)
+    gen_grid, spec_grid = (grid.ravel() for grid in np.meshgrid(gen_levels, spec_levels, indexing='ij'))
+    within_budget = (gen_grid - p_gen) + (spec_grid - p_spec) <= skill_budget + 1e-12
+    gen_grid, spec_grid = gen_grid[within_budget], spec_grid[within_budget]
+    if months_per_skill_unit is None:
+        skill_time = np.zeros(len(gen_grid))
+    else:
+        skill_time = (gen_grid - p_gen) * months_per_skill_unit[0] + (spec_grid - p_spec) * months_per_skill_unit[1]
+    fus = calculate_fus(gen_grid, spec_grid, params['GAMMA_GEN'], params['GAMMA_SPEC'])
+    v_i = calculate_idiosyncratic_risk_batch(fhc, fcr, fus, params['W_CR'], params['W_US'])
+    by_time = np.argsort(skill_time, kind='stable')
+    v_best, v_source = _running_best(v_i[by_time])
+    # Latest skill option that fits in each time budget (-1: none fits, impossible since 0 added is free).
+    fits = np.searchsorted(skill_time[by_time], months + 1e-9, side='right') - 1
+    v_option = by_time[v_source[fits]]
+
+    premium = premium_from_risks(h_best, v_best[fits], premium_terms)
+    current_premium = premium_from_risks(
+        calculate_systematic_risk(current_h_base, mecon, iai, params['W_ECON'], params['W_INNO']),
+        calculate_idiosyncratic_risk_batch(
+            fhc, fcr, calculate_fus(p_gen, p_spec, params['GAMMA_GEN'], params['GAMMA_SPEC']),
+            params['W_CR'], params['W_US']
+        ),
+        premium_terms
+    )
+
+    # A time budget is on the frontier only if it strictly beats every shorter budget.
+    frontier = np.nonzero(premium < np.concatenate([[np.inf], np.minimum.accumulate(premium)[:-1]]))[0]
+    month_of_plan = h_month[frontier]
+    plan_time = np.maximum(month_of_plan, skill_time[v_option[frontier]])
+    return pd.DataFrame({
+        'Transition Time (Months)': plan_time,
+        'Target Career': [names[best_target[k]] if k > 0 else None for k in month_of_plan],
+        'Transition Month': month_of_plan,
+        'General Skill Progress': gen_grid[v_option[frontier]],
+        'Firm-Specific Skill Progress': spec_grid[v_option[frontier]],
+        'Systematic Risk': h_best[frontier],
+        'Idiosyncratic Risk': v_best[fits][frontier],
+        'Monthly Premium': premium[frontier],
+        'Premium Reduction': current_premium - premium[frontier],
+    })
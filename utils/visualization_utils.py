@@ -1,19 +1,36 @@
 
-import plotly.express as px
-import pandas as pd
-import streamlit as st
+from utils.profiling import profiled, profile_stage
+from utils.chart_data import downsample_frame, render_mode, binned_histogram, DEFAULT_HISTOGRAM_BINS
 
+# plotly.express and pandas are imported inside the plot functions: they dominate the import
+# time of this module, and the app only needs them once a chart is actually drawn.
+
+@profiled('figure creation')
 def plot_risk_over_transition(df_transition_data):
     """
     Generates a Plotly line chart showing how Systematic Risk and Monthly Premium
     evolve over the TTV period during a career transition.
-    df_transition_data should have columns: 'Months Elapsed', 'Systematic Risk', 'Monthly Premium'.
+    df_transition_data should have columns: 'Months Elapsed', 'Systematic Risk', 'Monthly Premium',
+    and optionally 'Target Career' to overlay one pair of curves per target (see utils.curves.transition_curve).
+    Curves longer than chart_data.MAX_POINTS_PER_TRACE are downsampled, and large figures use WebGL.
     """
-    fig = px.line(df_transition_data, x='Months Elapsed', y=['Systematic Risk', 'Monthly Premium'],
-                  title='Systematic Risk & Monthly Premium Over Transition Period',
-                  labels={'value': 'Score / Premium ($)', 'variable': 'Metric'},
-                  
-                  color_discrete_sequence=px.colors.qualitative.Set1)
+    import plotly.express as px
+    metrics = ['Systematic Risk', 'Monthly Premium']
+    group = 'Target Career' if 'Target Career' in df_transition_data else None
+    df_transition_data = downsample_frame(df_transition_data, 'Months Elapsed', metrics, group)
+    mode = render_mode(len(df_transition_data) * len(metrics))
+    if group is not None:
+        df_long = df_transition_data.melt(id_vars=['Target Career', 'Months Elapsed'],
+                                          value_vars=['Systematic Risk', 'Monthly Premium'], var_name='Metric')
+        fig = px.line(df_long, x='Months Elapsed', y='value', color='Target Career', line_dash='Metric',
+                      title='Systematic Risk & Monthly Premium Over Transition Period',
+                      labels={'value': 'Score / Premium ($)'}, render_mode=mode)
+    else:
+        fig = px.line(df_transition_data, x='Months Elapsed', y=['Systematic Risk', 'Monthly Premium'],
+                      title='Systematic Risk & Monthly Premium Over Transition Period',
+                      labels={'value': 'Score / Premium ($)', 'variable': 'Metric'}, render_mode=mode,
+
+                      color_discrete_sequence=px.colors.qualitative.Set1)
     fig.update_layout(hovermode="x unified")
     fig.update_layout(legend=dict(
         orientation="h",
@@ -24,25 +41,44 @@ def plot_risk_over_transition(df_transition_data):
     ))
     return fig
 
+@profiled('figure creation')
 def plot_idiosyncratic_risk_by_skills(df_skill_data):
     """
     Generates a Plotly line chart showing the impact of skill acquisition
     on Idiosyncratic Risk and Monthly Premium.
-    df_skill_data should have columns: 'Skill Progress', 'Idiosyncratic Risk', 'Monthly Premium'.
+    df_skill_data should have columns: 'Skill Progress', 'Idiosyncratic Risk', 'Monthly Premium',
+    and optionally 'Firm-Specific Skill Progress' to overlay one pair of curves per skill mix
+    (see utils.curves.skill_curve).
+    Curves longer than chart_data.MAX_POINTS_PER_TRACE are downsampled, and large figures use WebGL.
     """
-    fig = px.line(df_skill_data, x='Skill Progress', y=['Idiosyncratic Risk', 'Monthly Premium'],
-                  title='Impact of Skill Acquisition on Idiosyncratic Risk & Premium',
-                  labels={'value': 'Score / Premium ($)', 'variable': 'Metric'},
-                  )
+    import plotly.express as px
+    metrics = ['Idiosyncratic Risk', 'Monthly Premium']
+    group = 'Firm-Specific Skill Progress' if 'Firm-Specific Skill Progress' in df_skill_data else None
+    df_skill_data = downsample_frame(df_skill_data, 'Skill Progress', metrics, group)
+    mode = render_mode(len(df_skill_data) * len(metrics))
+    if group is not None:
+        df_long = df_skill_data.melt(id_vars=['Firm-Specific Skill Progress', 'Skill Progress'],
+                                     value_vars=['Idiosyncratic Risk', 'Monthly Premium'], var_name='Metric')
+        fig = px.line(df_long, x='Skill Progress', y='value', color='Firm-Specific Skill Progress', line_dash='Metric',
+                      title='Impact of Skill Acquisition on Idiosyncratic Risk & Premium',
+                      labels={'value': 'Score / Premium ($)'}, render_mode=mode)
+    else:
+        fig = px.line(df_skill_data, x='Skill Progress', y=['Idiosyncratic Risk', 'Monthly Premium'],
+                      title='Impact of Skill Acquisition on Idiosyncratic Risk & Premium',
+                      labels={'value': 'Score / Premium ($)', 'variable': 'Metric'}, render_mode=mode,
+                      )
     fig.update_layout(hovermode="x unified")
     return fig
 
+@profiled('figure creation')
 def plot_risk_breakdown(current_scores, simulated_scores):
     """
     Generates a bar chart comparing current and simulated risk components
     (e.g., Idiosyncratic Risk, Systematic Risk).
     current_scores and simulated_scores are dictionaries like {'Idiosyncratic Risk': value, 'Systematic Risk': value}.
     """
+    import pandas as pd
+    import plotly.express as px
     data = {
         'Risk Type': ['Idiosyncratic Risk', 'Systematic Risk', 'Monthly Premium'] * 2,
         'Value': [
@@ -55,9 +91,29 @@ def plot_risk_breakdown(current_scores, simulated_scores):
         ],
         'Scenario': ['Current'] * 3 + ['Simulated'] * 3
     }
-    df = pd.DataFrame(data)
+    with profile_stage('DataFrame construction'):
+        df = pd.DataFrame(data)
     fig = px.bar(df, x='Risk Type', y='Value', color='Scenario', barmode='group',
                  title='Comparison: Current vs. Simulated Risk & Premium',
                  labels={'Value': 'Score / Premium ($)', 'Risk Type': 'Risk Component'},
                  )
     return fig
+
+@profiled('figure creation')
+def plot_premium_distribution(premiums, groups=None, bins=DEFAULT_HISTOGRAM_BINS, value_range=None):
+    """
+    Generates a histogram of monthly premiums (e.g. over a cohort), optionally one overlaid
+    histogram per group label. Values are binned server-side with chart_data.binned_histogram,
+    so the figure holds bin counts rather than one point per policyholder.
+    """
+    import plotly.express as px
+    with profile_stage('DataFrame construction'):
+        df_bins = binned_histogram(premiums, bins=bins, value_range=value_range, groups=groups)
+    fig = px.bar(df_bins, x='Bin Center', y='Count', color='Group' if groups is not None else None,
+                 barmode='overlay', opacity=0.7 if groups is not None else 1.0,
+                 title='Distribution of Monthly Premiums',
+                 labels={'Bin Center': 'Monthly Premium ($)', 'Count': 'Policyholders'},
+                 hover_data={'Bin Start': ':.2f', 'Bin End': ':.2f'})
+    fig.update_traces(width=float(df_bins['Bin End'].iloc[0] - df_bins['Bin Start'].iloc[0]))
+    fig.update_layout(bargap=0)
+    return fig